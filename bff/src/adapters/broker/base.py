@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 from bff.src.adapters.broker.types import SendableMessage
 
@@ -18,6 +19,10 @@ class IBroker(ABC):
     async def publish(self, message: SendableMessage, subject: str, **kwargs):
         """ Publish message to subject."""
 
+    @abstractmethod
+    async def publish_batch(self, messages: Sequence[tuple[SendableMessage, str]], **kwargs):
+        """ Publish (message, subject) pairs at once. """
+
     @classmethod
     async def disconnected_cb(cls):
         """ Callback on disconnecting. """
@@ -15,7 +15,7 @@ class BaseCmd:
     """
     Base dataclass for C(r)UD commands.
 
-    Implements Create, Update, Delete properties with correct command subjects.
+    Implements Create, Update, Delete, BulkCreate, BulkUpdate properties with correct command subjects.
     """
 
     service_name: str
@@ -33,6 +33,14 @@ class BaseCmd:
     def delete(self) -> str:
         return f"cmd.{self.service_name}.Delete{self.entity_name}"
 
+    @property
+    def bulk_create(self) -> str:
+        return f"cmd.{self.service_name}.BulkCreate{self.entity_name}"
+
+    @property
+    def bulk_update(self) -> str:
+        return f"cmd.{self.service_name}.BulkUpdate{self.entity_name}"
+
 
 @dataclass(frozen=True, slots=True)
 class ProjectCmd(Singleton, BaseCmd):
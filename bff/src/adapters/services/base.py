@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Literal, Generic, TypeVar
+from typing import Literal, Generic, TypeVar, AsyncIterator, Mapping, Sequence
 from uuid import UUID
 
 import httpx
@@ -11,15 +11,22 @@ from pydantic import BaseModel
 from bff.src.adapters.broker import cmd
 from bff.src.adapters.broker.base import IBroker
 from bff.src.adapters.broker.nats import Streams
-from bff.src.config.logging import request_id_var
+from bff.src.adapters.services.clients import service_clients
+from bff.src.config.logging import logger, request_id_var
 from bff.src.config.settings import settings
 from bff.src.domain.company import Company, CompaniesSearch
 from bff.src.domain.document import DocumentsSearch, DocumentOut
 from bff.src.domain.notification import NotificationsSearch, NotificationOut
+from bff.src.domain.base import get_list_adapter
+from bff.src.domain.pagination import Page, RawPage, NEXT_CURSOR_HEADER
+from bff.src.domain.streaming import NDJSON_MEDIA_TYPE
 from bff.src.domain.project import ProjectsSearchParams, ProjectOut
 from bff.src.domain.remark import RemarksSearch, RemarkOut
 from bff.src.domain.remark_doc import RemarkDocsSearch, RemarkDocOut
-from bff.src.domain.s3 import S3DownloadResponse, S3UploadResponse
+from bff.src.domain.s3 import FileDownload, S3DownloadResponse, S3UploadResponse
+from bff.src.domain.s3 import S3DocumentDownloadResponse, S3DocumentUploadResponse
+from bff.src.domain.s3 import S3MultipartUploadRequest, S3MultipartUploadResponse
+from bff.src.domain.s3 import S3PartUrlsRequest, S3PartUrlsResponse, S3UploadedPart
 from bff.src.domain.section import DefaultSectionsSearch, DefaultSectionOut
 from bff.src.domain.section import SectionsSearch, SectionOut
 from bff.src.domain.user import UsersSearch, User
@@ -48,6 +55,7 @@ class IServiceAdapter(ABC):
             json: dict | list = None,
             headers: dict = None,
             cookies: dict = None,
+            stream: bool = False,
     ) -> httpx.Response:
         """
         Basic wrapper for service calls.
@@ -60,6 +68,7 @@ class IServiceAdapter(ABC):
         :param json: A JSON serializable object to include in the body of the request.
         :param headers: Dictionary of HTTP headers to include in the request.
         :param cookies: Dictionary of Cookie items to include in the request.
+        :param stream: Don't read response body. Caller must close response after reading it.
         :return: response
         """
 
@@ -85,7 +94,15 @@ class IGenericReadServiceAdapter(
         ...
 
     @abstractmethod
-    async def list(self, **kwargs) -> list[OUT_SCHEMA]:
+    async def list(self, **kwargs) -> Page[OUT_SCHEMA]:
+        ...
+
+    @abstractmethod
+    async def list_raw(self, **kwargs) -> RawPage:
+        ...
+
+    @abstractmethod
+    async def stream(self, **kwargs) -> AsyncIterator[bytes]:
         ...
 
 
@@ -114,6 +131,18 @@ class IGenericWriteServiceAdapter(
     async def delete(self, entity_id: UUID) -> PubAck:
         ...
 
+    @abstractmethod
+    async def bulk_create(self, entities: Sequence[CREATE_SCHEMA]) -> PubAck:
+        ...
+
+    @abstractmethod
+    async def bulk_update(self, updates: Mapping[UUID, UPDATE_SCHEMA]) -> PubAck:
+        ...
+
+    @abstractmethod
+    async def bulk_delete(self, entity_ids: Sequence[UUID]) -> list[PubAck]:
+        ...
+
 
 class BaseServiceAdapter(IServiceAdapter):
     async def _make_request(
@@ -126,6 +155,7 @@ class BaseServiceAdapter(IServiceAdapter):
             json: dict | list = None,
             headers: dict = None,
             cookies: dict = None,
+            stream: bool = False,
     ) -> httpx.Response:
         """ Real implementation of cross service calls. """
 
@@ -134,18 +164,21 @@ class BaseServiceAdapter(IServiceAdapter):
             **(headers or {}),
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method,
-                f"{self.url}/{endpoint}",
-                params=params,
-                content=content,
-                data=data,
-                json=json,
-                headers=request_headers,
-                cookies=cookies,
-            )
-            response.raise_for_status()
+        client = service_clients.get(self.url)
+        request = client.build_request(
+            method,
+            f"{self.url}/{endpoint}",
+            params=params,
+            content=content,
+            data=data,
+            json=json,
+            headers=request_headers,
+            cookies=cookies,
+        )
+        response = await client.send(request, stream=stream)
+        if stream and response.is_error:
+            await response.aread()  # error body is needed for raising and releases connection
+        response.raise_for_status()
 
         return response
 
@@ -177,15 +210,80 @@ class GenericServiceReadAdapter(
             self,
             search_params: SEARCH_PARAMS,
             **kwargs
-    ) -> list[OUT_SCHEMA]:
-        """ Get list of entities filtered by search_params. """
+    ) -> Page[OUT_SCHEMA]:
+        """
+        Get page of entities filtered by search_params.
+
+        Cursor of the next page is taken from upstream X-Next-Cursor header.
+        """
+
+        response = await self._request_page(search_params, **kwargs)
+        return Page(
+            get_list_adapter(self.out_schema).validate_json(response.content),
+            next_cursor=response.headers.get(NEXT_CURSOR_HEADER),
+        )
+
+    async def list_raw(
+            self,
+            search_params: SEARCH_PARAMS,
+            **kwargs
+    ) -> RawPage:
+        """
+        Get page of entities filtered by search_params as upstream JSON.
+
+        Upstream service is trusted, so its response body is neither parsed nor validated.
+        """
+
+        response = await self._request_page(search_params, **kwargs)
+        return RawPage(
+            content=response.content,
+            next_cursor=response.headers.get(NEXT_CURSOR_HEADER),
+        )
+
+    async def _request_page(
+            self,
+            search_params: SEARCH_PARAMS,
+            **kwargs
+    ) -> httpx.Response:
+        try:
+            return await self._make_request(
+                self.entity_prefix,
+                params=search_params.model_dump(exclude_none=True),
+                **kwargs
+            )
+        except HTTPStatusError as e:
+            if e.response.status_code == 422:  # invalid limit or cursor
+                raise HTTPException(status_code=422, detail=e.response.json().get("detail"))
+            raise e
+
+    async def stream(
+            self,
+            search_params: SEARCH_PARAMS,
+            **kwargs
+    ) -> AsyncIterator[bytes]:
+        """
+        Get all entities filtered by search_params as NDJSON stream.
+
+        Upstream response is passed through chunk by chunk without buffering and validation.
+        Request is sent (and its errors are raised) before iteration starts.
+        """
 
         response = await self._make_request(
             self.entity_prefix,
-            params=search_params.model_dump(exclude_none=True),
+            params=search_params.model_dump(exclude_none=True, exclude={"limit", "cursor"}),
+            headers={"Accept": NDJSON_MEDIA_TYPE},
+            stream=True,
             **kwargs
         )
-        return [self.out_schema.model_validate(p) for p in response.json()]
+        return self._iter_response(response)
+
+    @staticmethod
+    async def _iter_response(response: httpx.Response) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in response.aiter_bytes():
+                yield chunk
+        finally:
+            await response.aclose()
 
 
 class GenericServiceWriteAdapter(
@@ -219,6 +317,58 @@ class GenericServiceWriteAdapter(
             stream=Streams.CMD
         )
 
+    async def bulk_create(self, entities: Sequence[CREATE_SCHEMA]) -> PubAck:
+        """ Create entities by single command, they are inserted in one DB transaction. """
+        return await self.broker.publish(
+            [entity.model_dump(mode="json") for entity in entities],
+            self.commands.bulk_create,  # type: ignore
+            headers={"correlation_id": request_id_var.get()},
+            stream=Streams.CMD
+        )
+
+    async def bulk_update(self, updates: Mapping[UUID, UPDATE_SCHEMA]) -> PubAck:
+        """ Update entities by single command, they are updated in one DB transaction. """
+        msg = [
+            {
+                "id": str(entity_id),
+                "data": data.model_dump()
+            }
+            for entity_id, data in updates.items()
+        ]
+        return await self.broker.publish(
+            msg,
+            self.commands.bulk_update,  # type: ignore
+            headers={"correlation_id": request_id_var.get()},
+            stream=Streams.CMD
+        )
+
+    async def bulk_delete(self, entity_ids: Sequence[UUID]) -> list[PubAck]:
+        """
+        Delete entities by delete command per entity, commands are published as one batch.
+
+        If some commands aren't published, 503 error lists ids of their entities,
+        the other entities are deleted anyway.
+        """
+        results = await self.broker.publish_batch(
+            [(str(entity_id), self.commands.delete) for entity_id in entity_ids],  # type: ignore
+            headers={"correlation_id": request_id_var.get()},
+            stream=Streams.CMD
+        )
+
+        failed_ids = [
+            str(entity_id)
+            for entity_id, result in zip(entity_ids, results)
+            if isinstance(result, BaseException)
+        ]
+        if failed_ids:
+            errors = {repr(result) for result in results if isinstance(result, BaseException)}
+            logger.error("Failed to publish delete commands", failed_ids=failed_ids, errors=sorted(errors))
+            raise HTTPException(
+                status_code=503,
+                detail={"message": "Failed to publish delete commands", "failed_ids": failed_ids},
+            )
+        return results
+
 
 class IProjectsReadServiceAdapter(IGenericReadServiceAdapter, ABC):
     def __init__(self):
@@ -355,12 +505,61 @@ class IDocumentsReadServiceAdapter(IGenericReadServiceAdapter, ABC):
             out_schema=DocumentOut
         )
 
+    @abstractmethod
+    async def download(self, document_id: UUID, range_header: str | None = None, **kwargs) -> FileDownload:
+        ...
+
     @abstractmethod
     async def get_download_url(self, document_id: UUID, **kwargs) -> S3DownloadResponse:
         ...
 
     @abstractmethod
-    async def get_upload_url(self, document_id: UUID, **kwargs) -> S3UploadResponse:
+    async def get_download_urls(self, document_ids: list[UUID], **kwargs) -> list[S3DocumentDownloadResponse]:
+        ...
+
+    @abstractmethod
+    async def get_upload_url(self, document_id: UUID, md5: str | None = None, **kwargs) -> S3UploadResponse:
+        ...
+
+    @abstractmethod
+    async def get_upload_urls(self, document_ids: list[UUID], **kwargs) -> list[S3DocumentUploadResponse]:
+        ...
+
+    @abstractmethod
+    async def create_multipart_upload(
+            self,
+            document_id: UUID,
+            data: S3MultipartUploadRequest,
+            **kwargs
+    ) -> S3MultipartUploadResponse:
+        ...
+
+    @abstractmethod
+    async def get_upload_part_urls(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            data: S3PartUrlsRequest,
+            **kwargs
+    ) -> S3PartUrlsResponse:
+        ...
+
+    @abstractmethod
+    async def list_uploaded_parts(self, document_id: UUID, upload_id: str, **kwargs) -> list[S3UploadedPart]:
+        ...
+
+    @abstractmethod
+    async def complete_multipart_upload(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            parts: list[S3UploadedPart],
+            **kwargs
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def abort_multipart_upload(self, document_id: UUID, upload_id: str, **kwargs) -> None:
         ...
 
 
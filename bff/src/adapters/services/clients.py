@@ -0,0 +1,82 @@
+import importlib.util
+
+import httpx
+
+from bff.src.config.logging import logger
+from bff.src.config.settings import settings
+
+
+def is_http2_available() -> bool:
+    """ HTTP/2 support of httpx requires optional "h2" package. """
+    return importlib.util.find_spec("h2") is not None
+
+
+class ServiceClients:
+    """
+    Registry of pooled http clients for cross service calls.
+
+    Every upstream service (identified by its base url) gets its own long-lived
+    httpx.AsyncClient with keep-alive connections, so service adapters
+    don't pay TCP connect and pool setup on every request.
+
+    Clients are created lazily on first use or in advance with .open(),
+    application lifespan is responsible for closing them.
+
+    Examples:
+        client = service_clients.get(settings.projects_read_service_url)
+        response = await client.get(f"{settings.projects_read_service_url}/projects")
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    @property
+    def upstreams(self) -> tuple[str, ...]:
+        return tuple(self._clients)
+
+    def get(self, service_url: str) -> httpx.AsyncClient:
+        """ Get client of specified upstream service. """
+
+        client = self._clients.get(service_url)
+        if client is None or client.is_closed:
+            client = self._make_client()
+            self._clients[service_url] = client
+        return client
+
+    def open(self, *service_urls: str) -> None:
+        """ Create clients of specified upstream services in advance. """
+
+        for service_url in service_urls:
+            self.get(service_url)
+        logger.info(
+            f"HTTP clients opened for {len(service_urls)} upstream services",
+            http2=self._http2,
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+        )
+
+    async def close(self) -> None:
+        """ Close all clients and release their connections. """
+
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+        logger.info(f"HTTP clients closed for {len(clients)} upstream services")
+
+    @property
+    def _http2(self) -> bool:
+        return bool(settings.http2) and is_http2_available()
+
+    def _make_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self._http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            timeout=settings.http_timeout,
+        )
+
+
+service_clients = ServiceClients()
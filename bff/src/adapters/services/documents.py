@@ -1,18 +1,59 @@
 from uuid import UUID
 
+import httpx
+from fastapi import HTTPException
+from httpx import HTTPStatusError
+
 from bff.src.adapters.broker.cmd import DocumentCmd
 from bff.src.adapters.broker.nats import Streams
 from bff.src.adapters.services.base import GenericServiceReadAdapter, GenericServiceWriteAdapter
 from bff.src.adapters.services.base import IDocumentsReadServiceAdapter, IDocumentsWriteServiceAdapter
 from bff.src.config.logging import request_id_var
 from bff.src.domain.document import DocumentsSearch, DocumentOut, DocumentIn, DocumentUpdate
-from bff.src.domain.s3 import S3DownloadResponse, S3UploadResponse
+from bff.src.domain.base import get_list_adapter
+from bff.src.domain.s3 import FileDownload, S3DownloadResponse, S3UploadResponse
+from bff.src.domain.s3 import S3DocumentDownloadResponse, S3DocumentUploadResponse
+from bff.src.domain.s3 import S3MultipartUploadRequest, S3MultipartUploadResponse
+from bff.src.domain.s3 import S3PartUrlsRequest, S3PartUrlsResponse, S3UploadedPart
+
+
+DOWNLOAD_HEADERS = ("Accept-Ranges", "Content-Disposition", "Content-Length", "Content-Range", "Content-Type")
 
 
 class DocumentsReadServiceAdapter(
     IDocumentsReadServiceAdapter,
     GenericServiceReadAdapter[DocumentsSearch, DocumentOut]
 ):
+    async def download(self, document_id: UUID, range_header: str | None = None, **kwargs) -> FileDownload:
+        """
+        Download file through documents service.
+
+        Range header is passed to service and file is passed through to client chunk by chunk without buffering.
+        """
+
+        try:
+            response = await self._make_request(
+                f"{self.entity_prefix}/{document_id}/download",
+                headers={"Range": range_header} if range_header else None,
+                stream=True,
+                **kwargs
+            )
+        except HTTPStatusError as e:
+            if e.response.status_code in (404, 416):
+                raise HTTPException(
+                    status_code=e.response.status_code,
+                    detail=e.response.json().get("detail"),
+                    headers={"Content-Range": e.response.headers["Content-Range"]}
+                    if "Content-Range" in e.response.headers else None,
+                )
+            raise e
+
+        return FileDownload(
+            status_code=response.status_code,
+            headers={header: response.headers[header] for header in DOWNLOAD_HEADERS if header in response.headers},
+            stream=self._iter_response(response),
+        )
+
     async def get_download_url(self, document_id: UUID, **kwargs) -> S3DownloadResponse:
         response = await self._make_request(
             f"{self.entity_prefix}/{document_id}/get-download-url",
@@ -20,13 +61,100 @@ class DocumentsReadServiceAdapter(
         )
         return S3DownloadResponse.model_validate(response.json())
 
-    async def get_upload_url(self, document_id: UUID, **kwargs) -> S3UploadResponse:
-        response = await self._make_request(
-            f"{self.entity_prefix}/{document_id}/get-upload-url",
+    async def get_download_urls(self, document_ids: list[UUID], **kwargs) -> list[S3DocumentDownloadResponse]:
+        response = await self._request_urls("get-download-urls", document_ids, **kwargs)
+        return get_list_adapter(S3DocumentDownloadResponse).validate_json(response.content)
+
+    async def get_upload_url(self, document_id: UUID, md5: str | None = None, **kwargs) -> S3UploadResponse:
+        response = await self._request_upload(
+            f"{document_id}/get-upload-url",
+            params={"md5": md5} if md5 else None,
             **kwargs
         )
         return S3UploadResponse.model_validate(response.json())
 
+    async def get_upload_urls(self, document_ids: list[UUID], **kwargs) -> list[S3DocumentUploadResponse]:
+        response = await self._request_urls("get-upload-urls", document_ids, **kwargs)
+        return get_list_adapter(S3DocumentUploadResponse).validate_json(response.content)
+
+    async def create_multipart_upload(
+            self,
+            document_id: UUID,
+            data: S3MultipartUploadRequest,
+            **kwargs
+    ) -> S3MultipartUploadResponse:
+        response = await self._request_upload(
+            f"{document_id}/multipart-upload",
+            method="POST",
+            json=data.model_dump(exclude_none=True),
+            **kwargs
+        )
+        return S3MultipartUploadResponse.model_validate_json(response.content)
+
+    async def get_upload_part_urls(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            data: S3PartUrlsRequest,
+            **kwargs
+    ) -> S3PartUrlsResponse:
+        response = await self._request_upload(
+            f"{document_id}/multipart-upload/{upload_id}/part-urls",
+            method="POST",
+            json=data.model_dump(),
+            **kwargs
+        )
+        return S3PartUrlsResponse.model_validate_json(response.content)
+
+    async def list_uploaded_parts(self, document_id: UUID, upload_id: str, **kwargs) -> list[S3UploadedPart]:
+        response = await self._request_upload(f"{document_id}/multipart-upload/{upload_id}/parts", **kwargs)
+        return get_list_adapter(S3UploadedPart).validate_json(response.content)
+
+    async def complete_multipart_upload(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            parts: list[S3UploadedPart],
+            **kwargs
+    ) -> None:
+        await self._request_upload(
+            f"{document_id}/multipart-upload/{upload_id}/complete",
+            method="POST",
+            json={"parts": [part.model_dump() for part in parts]},
+            **kwargs
+        )
+
+    async def abort_multipart_upload(self, document_id: UUID, upload_id: str, **kwargs) -> None:
+        await self._request_upload(f"{document_id}/multipart-upload/{upload_id}", method="DELETE", **kwargs)
+
+    async def _request_upload(self, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Request upload endpoint of service, missing documents and uploads,
+        already uploaded files and invalid parts are client errors.
+        """
+
+        try:
+            return await self._make_request(f"{self.entity_prefix}/{endpoint}", **kwargs)
+        except HTTPStatusError as e:
+            if e.response.status_code in (404, 409, 422):
+                raise HTTPException(status_code=e.response.status_code, detail=e.response.json().get("detail"))
+            raise e
+
+    async def _request_urls(self, endpoint: str, document_ids: list[UUID], **kwargs) -> httpx.Response:
+        """ Get presigned urls of many documents by single request, missing documents are skipped by service. """
+
+        try:
+            return await self._make_request(
+                f"{self.entity_prefix}/{endpoint}",
+                method="POST",
+                json={"document_ids": [str(document_id) for document_id in document_ids]},
+                **kwargs
+            )
+        except HTTPStatusError as e:
+            if e.response.status_code == 422:  # too many documents
+                raise HTTPException(status_code=422, detail=e.response.json().get("detail"))
+            raise e
+
 
 class DocumentsWriteServiceAdapter(
     IDocumentsWriteServiceAdapter,
@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from bff.src.adapters.broker.nats import NatsJS
+from bff.src.adapters.services.clients import service_clients
 from bff.src.config.settings import settings
 from bff.src.entrypoints.router import router
 from bff.src.middleware import logging_middleware
@@ -12,9 +13,17 @@ from bff.src.middleware import logging_middleware
 async def lifespan(application: FastAPI):
     broker_adapter = NatsJS()
     await broker_adapter.connect()
+    service_clients.open(
+        settings.projects_read_service_url,
+        settings.identity_read_service_url,
+        settings.reviewer_read_service_url,
+        settings.documents_read_service_url,
+        settings.notifications_read_service_url,
+    )
 
     yield
 
+    await service_clients.close()
     await broker_adapter.disconnect()
 
 
@@ -14,6 +14,14 @@ class Settings(BaseSettings):
     debug: int = os.getenv("DEBUG", 0)
     local: int = os.getenv("LOCAL", 0)
     is_test: int = os.getenv("IS_TEST", 0)
+    # records below log_level are discarded before their payloads are built
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    # share of high-volume INFO events (request records) which are logged
+    log_sample_rate: float = os.getenv("LOG_SAMPLE_RATE", 1.0)
+    # log records are written by a background thread, records logged while its queue is full
+    # are handled by log_drop_policy: "new" drops them, "old" drops the oldest queued records, "block" waits
+    log_queue_size: int = os.getenv("LOG_QUEUE_SIZE", 10_000)
+    log_drop_policy: str = os.getenv("LOG_DROP_POLICY", "new")
 
     service_host: str = os.getenv("SERVICE_HOST")
     service_port: int = os.getenv("SERVICE_PORT")
@@ -25,8 +33,27 @@ class Settings(BaseSettings):
     documents_read_service_url: str = os.getenv("DOCUMENTS_READ_SERVICE_URL")
     notifications_read_service_url: str = os.getenv("NOTIFICATIONS_READ_SERVICE_URL")
 
+    # pool settings of http clients for cross service calls (one pool per upstream service)
+    http_max_connections: int = os.getenv("HTTP_MAX_CONNECTIONS", 100)
+    http_max_keepalive_connections: int = os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+    http_keepalive_expiry: float = os.getenv("HTTP_KEEPALIVE_EXPIRY", 30.0)
+    http_timeout: float = os.getenv("HTTP_TIMEOUT", 5.0)
+    # used only if "h2" package is installed
+    http2: int = os.getenv("HTTP2", 1)
+
+    # max amount of JetStream publishes awaiting their acks in a single batch
+    nats_max_pending_acks: int = os.getenv("NATS_MAX_PENDING_ACKS", 256)
+    # max amount of cached serializers of published message types
+    nats_type_adapters_cache_size: int = os.getenv("NATS_TYPE_ADAPTERS_CACHE_SIZE", 256)
+    # max amount of entities in a single bulk command, whole command must fit into NATS max_payload
+    bulk_max_size: int = os.getenv("BULK_MAX_SIZE", 500)
+
     # full path to the /get-user endpoint of identity service
     auth_service_url: str = os.getenv("AUTH_SERVICE_URL")
+    # in-process cache of authenticated users, entries never outlive token's exp
+    # set auth_cache_ttl to 0 to disable caching
+    auth_cache_ttl: float = os.getenv("AUTH_CACHE_TTL", 60.0)
+    auth_cache_max_size: int = os.getenv("AUTH_CACHE_MAX_SIZE", 10_000)
     # keycloak setting are needed only in debug mode for auth with swagger
     kc_external_base_url: str = os.getenv("KC_EXTERNAL_BASE_URL")
     kc_realm: str = os.getenv("KC_REALM")
@@ -3,6 +3,7 @@ from fastapi import Depends, HTTPException
 
 from bff.src.adapters.broker import cmd
 from bff.src.adapters.broker.nats import NatsJS
+from bff.src.adapters.services.clients import service_clients
 from bff.src.adapters.services.documents import DocumentsReadServiceAdapter, DocumentsWriteServiceAdapter
 from bff.src.adapters.services.identity import CompaniesReadServiceAdapter, CompaniesWriteServiceAdapter
 from bff.src.adapters.services.identity import UsersReadServiceAdapter, UsersWriteServiceAdapter
@@ -14,21 +15,30 @@ from bff.src.adapters.services.reviewer import RemarkDocsReadServiceAdapter, Rem
 from bff.src.adapters.services.reviewer import RemarksReadServiceAdapter, RemarksWriteServiceAdapter
 from bff.src.config.settings import settings
 from bff.src.domain.user import User
-from bff.src.service.auth import oauth2_scheme
+from bff.src.service.auth import oauth2_scheme, user_cache
 
 
-async def get_user(token: str = Depends(oauth2_scheme)):
-    """ Real dependency for authenticating of user by identity service. """
+async def get_user(token: str = Depends(oauth2_scheme)) -> User:
+    """
+    Real dependency for authenticating of user by identity service.
+
+    Users are cached by token, so burst of requests of a single user costs one identity call.
+    """
+    return await user_cache.get_or_load(token, lambda: fetch_user(token))
+
+
+async def fetch_user(token: str) -> User:
+    """ Authenticate user of specified token by identity service. """
 
     # TODO maybe it should be refactor for using IdentityService class,
     #  not straight call with request
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                settings.auth_service_url,
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            response.raise_for_status()
+        client = service_clients.get(settings.identity_read_service_url)
+        response = await client.get(
+            settings.auth_service_url,
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        response.raise_for_status()
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 401:
             raise HTTPException(
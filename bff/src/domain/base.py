@@ -1,4 +1,6 @@
-from pydantic import model_validator
+from functools import cache
+
+from pydantic import BaseModel, TypeAdapter, model_validator
 
 
 class BaseValidationMixin:
@@ -13,4 +15,9 @@ class BaseValidationMixin:
         if not provided_fields:
             raise ValueError("At least one field must be provided")
 
-        return values
\ No newline at end of file
+        return values
+
+@cache
+def get_list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """ TypeAdapter of list[schema]. Building it is expensive, so it's created once per schema. """
+    return TypeAdapter(list[schema])
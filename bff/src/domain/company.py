@@ -4,6 +4,7 @@ from datetime import datetime
 from pydantic import BaseModel, ConfigDict
 
 from bff.src.domain.base import BaseValidationMixin
+from bff.src.domain.pagination import PaginationParams
 
 
 class CompanyBase(BaseModel):
@@ -20,7 +21,7 @@ class Company(CompanyBase):
     updated_at: datetime | None
 
 
-class CompaniesSearch(BaseModel):
+class CompaniesSearch(PaginationParams):
     name: str | None = None
     phone: str | None = None
     email: str | None = None
@@ -5,6 +5,7 @@ from pydantic import BaseModel, ConfigDict
 
 from bff.src.domain.base import BaseValidationMixin
 from bff.src.enums import NotificationType, NotificationStatus, NotificationPriority
+from bff.src.domain.pagination import PaginationParams
 
 
 class NotificationIn(BaseModel):
@@ -24,7 +25,7 @@ class NotificationOut(NotificationIn):
     status: NotificationStatus | None
 
 
-class NotificationsSearch(BaseModel):
+class NotificationsSearch(PaginationParams):
     id: UUID | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
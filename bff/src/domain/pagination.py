@@ -0,0 +1,46 @@
+from typing import TypeVar, Iterable, NamedTuple
+
+from fastapi import Response
+from pydantic import BaseModel, Field
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+ENTITY = TypeVar("ENTITY")
+
+
+class PaginationParams(BaseModel):
+    """
+    Keyset pagination params of list endpoints.
+
+    Cursor is opaque for BFF, it's taken from X-Next-Cursor header of previous page
+    and validated by upstream service as well as limit's maximum.
+    """
+
+    limit: int | None = Field(default=None, ge=1)
+    cursor: str | None = None
+
+
+class Page(list[ENTITY]):
+    """ List of entities with cursor of the next page (None if it's the last page). """
+
+    def __init__(self, entities: Iterable[ENTITY] = (), next_cursor: str | None = None):
+        super().__init__(entities)
+        self.next_cursor = next_cursor
+
+
+class RawPage(NamedTuple):
+    """ Page of entities serialized by upstream service. """
+
+    content: bytes
+    next_cursor: str | None = None
+
+
+def page_response(page: RawPage) -> Response:
+    """
+    JSON response passing upstream page through as is.
+
+    FastAPI doesn't validate and serialize returned Response by response_model.
+    """
+
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+    return Response(page.content, media_type="application/json", headers=headers)
@@ -5,6 +5,7 @@ from pydantic import BaseModel, ConfigDict
 
 from bff.src.domain.base import BaseValidationMixin
 from bff.src.enums import ProjectType
+from bff.src.domain.pagination import PaginationParams
 
 
 class ProjectIn(BaseModel):
@@ -25,7 +26,7 @@ class ProjectOut(ProjectIn):
     updated_at: datetime | None
 
 
-class ProjectsSearchParams(BaseModel):
+class ProjectsSearchParams(PaginationParams):
     id: UUID | None = None
     code: str | None = None
     name: str | None = None
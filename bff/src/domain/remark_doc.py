@@ -4,6 +4,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
 from bff.src.domain.base import BaseValidationMixin
+from bff.src.domain.pagination import PaginationParams
 
 
 class RemarkDocIn(BaseModel):
@@ -22,7 +23,7 @@ class RemarkDocOut(RemarkDocIn):
     updated_at: datetime | None
 
 
-class RemarkDocsSearch(BaseModel):
+class RemarkDocsSearch(PaginationParams):
     id: UUID | None = None
     version: int | None = None
     md5: str | None = None
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, AnyHttpUrl
+from typing import AsyncIterator, NamedTuple
+from uuid import UUID
+
+from pydantic import BaseModel, AnyHttpUrl, Field
 
 
 class S3DownloadResponse(BaseModel):
@@ -10,3 +13,60 @@ class S3DownloadResponse(BaseModel):
 class S3UploadResponse(BaseModel):
     url: AnyHttpUrl
     expires_in: int
+    # must be sent with file to upload url
+    headers: dict[str, str] = {}
+
+
+class S3UrlsRequest(BaseModel):
+    document_ids: list[UUID] = Field(min_length=1)
+
+
+class S3DocumentDownloadResponse(S3DownloadResponse):
+    document_id: UUID
+
+
+class S3DocumentUploadResponse(S3UploadResponse):
+    document_id: UUID
+
+
+class S3MultipartUploadRequest(BaseModel):
+    file_size: int = Field(gt=0)
+    # preferred part size, may be changed by S3 limits
+    part_size: int | None = Field(None, gt=0)
+
+
+class S3MultipartUploadResponse(BaseModel):
+    upload_id: str
+    part_size: int
+    parts_count: int
+
+
+class S3PartUrlsRequest(BaseModel):
+    part_numbers: list[int] = Field(min_length=1)
+
+
+class S3PartUrl(BaseModel):
+    part_number: int
+    url: AnyHttpUrl
+
+
+class S3PartUrlsResponse(BaseModel):
+    urls: list[S3PartUrl]
+    expires_in: int
+
+
+class S3UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+    size: int | None = None
+
+
+class S3CompleteMultipartUploadRequest(BaseModel):
+    parts: list[S3UploadedPart] = Field(min_length=1)
+
+
+class FileDownload(NamedTuple):
+    status_code: int
+    # Content-Length, Content-Range etc. of upstream response
+    headers: dict[str, str]
+    stream: AsyncIterator[bytes]
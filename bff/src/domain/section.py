@@ -5,6 +5,7 @@ from pydantic import BaseModel, ConfigDict
 
 from bff.src.domain.base import BaseValidationMixin
 from bff.src.enums import ProjectType
+from bff.src.domain.pagination import PaginationParams
 
 
 class SectionIn(BaseModel):
@@ -24,7 +25,7 @@ class SectionOut(SectionIn):
     updated_at: datetime | None
 
 
-class SectionsSearch(BaseModel):
+class SectionsSearch(PaginationParams):
     id: UUID | None = None
     name: str | None = None
     abbreviation: str | None = None
@@ -57,7 +58,7 @@ class DefaultSectionOut(DefaultSectionIn):
     updated_at: datetime | None
 
 
-class DefaultSectionsSearch(BaseModel):
+class DefaultSectionsSearch(PaginationParams):
     id: UUID | None = None
     project_type: ProjectType | None = None
     name: str | None = None
@@ -0,0 +1,8 @@
+from fastapi import Request
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """ Client asked for streaming list response by Accept header. """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
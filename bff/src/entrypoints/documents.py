@@ -1,11 +1,19 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
 from bff.src.adapters.services.documents import DocumentsReadServiceAdapter, DocumentsWriteServiceAdapter
+from bff.src.config.settings import settings
 from bff.src.dependencies import get_documents_read_adapter, get_documents_write_adapter
 from bff.src.domain.document import DocumentIn, DocumentOut, DocumentsSearch, DocumentUpdate
-from bff.src.domain.s3 import S3DownloadResponse, S3UploadResponse
+from bff.src.domain.s3 import S3DownloadResponse, S3UploadResponse, S3UrlsRequest
+from bff.src.domain.s3 import S3DocumentDownloadResponse, S3DocumentUploadResponse
+from bff.src.domain.s3 import S3MultipartUploadRequest, S3MultipartUploadResponse
+from bff.src.domain.s3 import S3PartUrlsRequest, S3PartUrlsResponse
+from bff.src.domain.s3 import S3CompleteMultipartUploadRequest, S3UploadedPart
+from bff.src.domain.pagination import page_response
+from bff.src.domain.streaming import NDJSON_MEDIA_TYPE, accepts_ndjson
 
 router = APIRouter(tags=["Documents"])
 
@@ -23,19 +31,51 @@ async def create_document(
     - Document creates in DB and mark as "uploaded=false, md5=NULL";
     - Client make GET request to **/documents/{document_id}**
       To get full document metadata with calculated fields including document_id;
-    - Client make GET request to **/documents/{document_id}/get-upload-url** and get presigned url for S3 uploading;
-    - Client make PUT request to presigned url with file content as octet-stream;
+    - Client make GET request to **/documents/{document_id}/get-upload-url** and get presigned url for S3 uploading,
+      optionally with md5 of the file, so S3 rejects corrupted uploads;
+    - Client make PUT request to presigned url with file content as octet-stream and returned headers;
     - After uploading is completed, client make request to **/documents/{document_id}/uploaded**;
     - BFF send command to documents service to sync document metadata with uploaded file;
       - Documents service read this message;
       - Verify that file exists;
-      - Get its md5;
+      - Get its md5 from S3 ETag (file is re-read only if ETag isn't md5, e.g. for KMS encrypted buckets);
       - Set md5 and mark document as uploaded in DB.
     - If document is not marked as uploaded for presigned url expiring time - responsible user should be notified.
     """
     await adapter.create(data)
 
 
+@router.post("/documents/bulk", status_code=202)
+async def bulk_create_documents(
+        data: list[DocumentIn] = Body(max_length=settings.bulk_max_size),
+        adapter: DocumentsWriteServiceAdapter = Depends(get_documents_write_adapter)
+):
+    """ Create new documents by single command. """
+    await adapter.bulk_create(data)
+
+
+@router.patch("/documents/bulk", status_code=202)
+async def bulk_update_documents(
+        data: dict[UUID, DocumentUpdate] = Body(max_length=settings.bulk_max_size),
+        adapter: DocumentsWriteServiceAdapter = Depends(get_documents_write_adapter)
+):
+    """ Update specified documents by single command, body maps document ids to their updates. """
+    await adapter.bulk_update(data)
+
+
+@router.delete("/documents/bulk", status_code=202)
+async def bulk_delete_documents(
+        data: list[UUID] = Body(max_length=settings.bulk_max_size),
+        adapter: DocumentsWriteServiceAdapter = Depends(get_documents_write_adapter)
+):
+    """
+    Delete specified documents, e.g. selected in UI.
+
+    Delete commands are published at once, each document is deleted separately like by **/documents/{document_id}**.
+    """
+    await adapter.bulk_delete(data)
+
+
 @router.get("/documents/{document_id}", response_model=DocumentOut)
 async def get_document(
         document_id: UUID,
@@ -47,11 +87,41 @@ async def get_document(
 
 @router.get("/documents", response_model=list[DocumentOut])
 async def get_documents_list(
+        request: Request,
         filter_data: DocumentsSearch = Depends(),
         adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
 ):
-    """Get all documents by provided fields."""
-    return await adapter.list(filter_data)
+    """
+    Get all documents by provided fields.
+
+    Streams all documents (ignoring pagination) as NDJSON if requested with "Accept: application/x-ndjson".
+    """
+
+    if accepts_ndjson(request):
+        return StreamingResponse(await adapter.stream(filter_data), media_type=NDJSON_MEDIA_TYPE)
+
+    return page_response(await adapter.list_raw(filter_data))
+
+
+@router.get("/documents/{document_id}/download", response_class=StreamingResponse)
+async def download(
+        document_id: UUID,
+        request: Request,
+        adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
+):
+    """
+    Download specified file through BFF.
+
+    Single range requests are supported ("Range: bytes=0-1023"), so downloads may be resumed or parallelized.
+    Presigned URL of **get-download-url** is preferred for downloads directly from S3.
+    """
+
+    file_download = await adapter.download(document_id, request.headers.get("range"))
+    return StreamingResponse(
+        file_download.stream,
+        status_code=file_download.status_code,
+        headers=file_download.headers,
+    )
 
 
 @router.get("/documents/{document_id}/get-download-url", response_model=S3DownloadResponse)
@@ -63,13 +133,117 @@ async def get_download_url(
     return await adapter.get_download_url(document_id)
 
 
+@router.post("/documents/get-download-urls", response_model=list[S3DocumentDownloadResponse])
+async def get_download_urls(
+        data: S3UrlsRequest,
+        adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
+):
+    """
+    Get download URLs for specified files by single request.
+
+    Missing and not uploaded documents are skipped.
+    """
+    return await adapter.get_download_urls(data.document_ids)
+
+
 @router.get("/documents/{document_id}/get-upload-url", response_model=S3UploadResponse)
 async def get_upload_url(
         document_id: UUID,
+        md5: str | None = Query(None, pattern=r"^[0-9a-f]{32}$"),
+        adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
+):
+    """
+    Get upload URL for specified file.
+
+    If MD5 of the file is provided, S3 verifies uploaded file by it,
+    returned headers must be sent with the file.
+    File of document can be uploaded only once, 409 is returned for already uploaded documents.
+    """
+    return await adapter.get_upload_url(document_id, md5=md5)
+
+
+@router.post("/documents/get-upload-urls", response_model=list[S3DocumentUploadResponse])
+async def get_upload_urls(
+        data: S3UrlsRequest,
+        adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
+):
+    """
+    Get upload URLs for specified files by single request.
+
+    Missing and already uploaded documents are skipped.
+    """
+    return await adapter.get_upload_urls(data.document_ids)
+
+
+@router.post("/documents/{document_id}/multipart-upload", response_model=S3MultipartUploadResponse)
+async def create_multipart_upload(
+        document_id: UUID,
+        data: S3MultipartUploadRequest,
+        adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
+):
+    """
+    Start multipart upload of specified file, used for large files instead of **get-upload-url**.
+
+    **Flow of multipart upload:**
+    - Client send file size and optionally preferred part size, and get upload id and negotiated part size;
+    - Client get presigned urls of parts from **part-urls** (by batches for many parts);
+    - Client make PUT requests with parts content to presigned urls in parallel and keep ETag headers of responses;
+    - After failure client may get already uploaded parts from **parts** and upload only the rest of them;
+    - Client complete upload by **complete** with ETags of all parts;
+    - Client make request to **/documents/{document_id}/uploaded** as after usual upload.
+
+    Not completed uploads are aborted by documents service after a day.
+    File of document can be uploaded only once, 409 is returned for already uploaded documents.
+    """
+    return await adapter.create_multipart_upload(document_id, data)
+
+
+@router.post(
+    "/documents/{document_id}/multipart-upload/{upload_id}/part-urls",
+    response_model=S3PartUrlsResponse
+)
+async def get_upload_part_urls(
+        document_id: UUID,
+        upload_id: str,
+        data: S3PartUrlsRequest,
+        adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
+):
+    """ Get upload URLs of specified parts. """
+    return await adapter.get_upload_part_urls(document_id, upload_id, data)
+
+
+@router.get(
+    "/documents/{document_id}/multipart-upload/{upload_id}/parts",
+    response_model=list[S3UploadedPart]
+)
+async def list_uploaded_parts(
+        document_id: UUID,
+        upload_id: str,
+        adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
+):
+    """ Get already uploaded parts to resume upload. """
+    return await adapter.list_uploaded_parts(document_id, upload_id)
+
+
+@router.post("/documents/{document_id}/multipart-upload/{upload_id}/complete", status_code=204)
+async def complete_multipart_upload(
+        document_id: UUID,
+        upload_id: str,
+        data: S3CompleteMultipartUploadRequest,
+        adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
+):
+    """ Assemble file from uploaded parts. """
+    await adapter.complete_multipart_upload(document_id, upload_id, data.parts)
+
+
+@router.delete("/documents/{document_id}/multipart-upload/{upload_id}", status_code=204)
+async def abort_multipart_upload(
+        document_id: UUID,
+        upload_id: str,
         adapter: DocumentsReadServiceAdapter = Depends(get_documents_read_adapter)
 ):
-    """ Get upload URL for specified file. """
-    return await adapter.get_upload_url(document_id)
+    """ Abort multipart upload and delete its uploaded parts. """
+    await adapter.abort_multipart_upload(document_id, upload_id)
 
 
 @router.post("/documents/{document_id}/uploaded", status_code=202)
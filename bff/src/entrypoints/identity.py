@@ -8,6 +8,7 @@ from bff.src.dependencies import get_companies_read_adapter, get_companies_write
 from bff.src.dependencies import get_users_read_adapter, get_users_write_adapter
 from bff.src.domain.company import Company, CompaniesSearch, CompaniesUpdate, CompanyBase
 from bff.src.domain.user import User, UsersSearch, UserUpdate
+from bff.src.domain.pagination import page_response
 
 router = APIRouter(tags=["Identity"])
 
@@ -27,7 +28,7 @@ async def get_users_list(
         adapter: UsersReadServiceAdapter = Depends(get_users_read_adapter)
 ):
     """Get all users by provided fields."""
-    return await adapter.list(filter_data)
+    return page_response(await adapter.list_raw(filter_data))
 
 
 @router.patch("/users/{user_id}", status_code=202)
@@ -73,7 +74,7 @@ async def get_companies_list(
         adapter: CompaniesReadServiceAdapter = Depends(get_companies_read_adapter)
 ):
     """Get all companies by provided fields."""
-    return await adapter.list(filter_data)
+    return page_response(await adapter.list_raw(filter_data))
 
 
 @router.patch("/companies/{company_id}", status_code=202)
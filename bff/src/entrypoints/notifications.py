@@ -6,6 +6,7 @@ from bff.src.adapters.services.notifications import NotificationsReadServiceAdap
 from bff.src.dependencies import get_notifications_read_adapter, get_notifications_write_adapter
 from bff.src.domain.notification import NotificationIn, NotificationUpdate
 from bff.src.domain.notification import NotificationOut, NotificationsSearch
+from bff.src.domain.pagination import page_response
 
 router = APIRouter(tags=["Notifications"])
 
@@ -34,7 +35,7 @@ async def get_notifications_list(
         adapter: NotificationsReadServiceAdapter = Depends(get_notifications_read_adapter)
 ):
     """Get all notifications by provided fields."""
-    return await adapter.list(filter_data)
+    return page_response(await adapter.list_raw(filter_data))
 
 
 @router.patch("/notification/{notification_id}", status_code=202)
@@ -1,10 +1,11 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends
 
 from bff.src.adapters.services.projects import DefaultSectionsReadServiceAdapter, DefaultSectionsWriteServiceAdapter
 from bff.src.adapters.services.projects import ProjectsReadServiceAdapter, ProjectsWriteServiceAdapter
 from bff.src.adapters.services.projects import SectionsReadServiceAdapter, SectionsWriteServiceAdapter
+from bff.src.config.settings import settings
 from bff.src.dependencies import get_default_sections_read_adapter, get_default_sections_write_adapter
 from bff.src.dependencies import get_projects_read_adapter, get_projects_write_adapter
 from bff.src.dependencies import get_sections_read_adapter, get_sections_write_adapter
@@ -14,6 +15,7 @@ from bff.src.domain.section import DefaultSectionIn, DefaultSectionUpdate
 from bff.src.domain.section import DefaultSectionOut, DefaultSectionsSearch
 from bff.src.domain.section import SectionIn, SectionUpdate
 from bff.src.domain.section import SectionOut, SectionsSearch
+from bff.src.domain.pagination import page_response
 
 router = APIRouter(tags=["Projects"])
 
@@ -27,6 +29,24 @@ async def create_project(
     await adapter.create(data)
 
 
+@router.post("/project/bulk", status_code=202)
+async def bulk_create_projects(
+        data: list[ProjectIn] = Body(max_length=settings.bulk_max_size),
+        adapter: ProjectsWriteServiceAdapter = Depends(get_projects_write_adapter)
+):
+    """ Create new projects by single command. """
+    await adapter.bulk_create(data)
+
+
+@router.patch("/project/bulk", status_code=202)
+async def bulk_update_projects(
+        data: dict[UUID, ProjectUpdate] = Body(max_length=settings.bulk_max_size),
+        adapter: ProjectsWriteServiceAdapter = Depends(get_projects_write_adapter)
+):
+    """ Update specified projects by single command, body maps project ids to their updates. """
+    await adapter.bulk_update(data)
+
+
 @router.get("/project/{project_id}", response_model=ProjectOut)
 async def get_project(
         project_id: UUID,
@@ -42,7 +62,7 @@ async def get_projects_list(
         adapter: ProjectsReadServiceAdapter = Depends(get_projects_read_adapter)
 ):
     """Get all projects by provided fields."""
-    return await adapter.list(filter_data)
+    return page_response(await adapter.list_raw(filter_data))
 
 
 @router.patch("/project/{project_id}", status_code=202)
@@ -73,6 +93,24 @@ async def create_default_section(
     await adapter.create(data)
 
 
+@router.post("/default-section/bulk", status_code=202)
+async def bulk_create_default_sections(
+        data: list[DefaultSectionIn] = Body(max_length=settings.bulk_max_size),
+        adapter: DefaultSectionsWriteServiceAdapter = Depends(get_default_sections_write_adapter)
+):
+    """ Create new default sections by single command. """
+    await adapter.bulk_create(data)
+
+
+@router.patch("/default-section/bulk", status_code=202)
+async def bulk_update_default_sections(
+        data: dict[UUID, DefaultSectionUpdate] = Body(max_length=settings.bulk_max_size),
+        adapter: DefaultSectionsWriteServiceAdapter = Depends(get_default_sections_write_adapter)
+):
+    """ Update specified default sections by single command, body maps default section ids to their updates. """
+    await adapter.bulk_update(data)
+
+
 @router.get("/default-section/{default_section_id}", response_model=DefaultSectionOut)
 async def get_default_section(
         default_section_id: UUID,
@@ -88,7 +126,7 @@ async def get_default_sections_list(
         adapter: DefaultSectionsReadServiceAdapter = Depends(get_default_sections_read_adapter)
 ):
     """Get all default sections by provided fields."""
-    return await adapter.list(filter_data)
+    return page_response(await adapter.list_raw(filter_data))
 
 
 @router.patch("/default-section/{default_section_id}", status_code=202)
@@ -119,6 +157,24 @@ async def create_section(
     await adapter.create(data)
 
 
+@router.post("/section/bulk", status_code=202)
+async def bulk_create_sections(
+        data: list[SectionIn] = Body(max_length=settings.bulk_max_size),
+        adapter: SectionsWriteServiceAdapter = Depends(get_sections_write_adapter)
+):
+    """ Create new sections by single command. """
+    await adapter.bulk_create(data)
+
+
+@router.patch("/section/bulk", status_code=202)
+async def bulk_update_sections(
+        data: dict[UUID, SectionUpdate] = Body(max_length=settings.bulk_max_size),
+        adapter: SectionsWriteServiceAdapter = Depends(get_sections_write_adapter)
+):
+    """ Update specified sections by single command, body maps section ids to their updates. """
+    await adapter.bulk_update(data)
+
+
 @router.get("/section/{section_id}", response_model=SectionOut)
 async def get_section(
         section_id: UUID,
@@ -134,7 +190,7 @@ async def get_sections_list(
         adapter: SectionsReadServiceAdapter = Depends(get_sections_read_adapter)
 ):
     """Get all sections by provided fields."""
-    return await adapter.list(filter_data)
+    return page_response(await adapter.list_raw(filter_data))
 
 
 @router.patch("/section/{section_id}", status_code=202)
@@ -1,13 +1,17 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Request
+from fastapi.responses import StreamingResponse
 
 from bff.src.adapters.services.reviewer import RemarkDocsReadServiceAdapter, RemarkDocsWriteServiceAdapter
 from bff.src.adapters.services.reviewer import RemarksReadServiceAdapter, RemarksWriteServiceAdapter
+from bff.src.config.settings import settings
 from bff.src.dependencies import get_remark_docs_read_adapter, get_remark_docs_write_adapter
 from bff.src.dependencies import get_remarks_read_adapter, get_remarks_write_adapter
 from bff.src.domain.remark import RemarkIn, RemarksSearch, RemarkOut, RemarkUpdate
 from bff.src.domain.remark_doc import RemarkDocIn, RemarkDocsSearch, RemarkDocOut, RemarkDocUpdate
+from bff.src.domain.pagination import page_response
+from bff.src.domain.streaming import NDJSON_MEDIA_TYPE, accepts_ndjson
 
 router = APIRouter(tags=["Reviewer"])
 
@@ -21,6 +25,24 @@ async def create_remark(
     await adapter.create(data)
 
 
+@router.post("/remarks/bulk", status_code=202)
+async def bulk_create_remarks(
+        data: list[RemarkIn] = Body(max_length=settings.bulk_max_size),
+        adapter: RemarksWriteServiceAdapter = Depends(get_remarks_write_adapter)
+):
+    """ Create new remarks by single command. """
+    await adapter.bulk_create(data)
+
+
+@router.patch("/remarks/bulk", status_code=202)
+async def bulk_update_remarks(
+        data: dict[UUID, RemarkUpdate] = Body(max_length=settings.bulk_max_size),
+        adapter: RemarksWriteServiceAdapter = Depends(get_remarks_write_adapter)
+):
+    """ Update specified remarks by single command, body maps remark ids to their updates. """
+    await adapter.bulk_update(data)
+
+
 @router.get("/remarks/{remark_id}", response_model=RemarkOut)
 async def get_remark(
         remark_id: UUID,
@@ -32,11 +54,20 @@ async def get_remark(
 
 @router.get("/remarks", response_model=list[RemarkOut])
 async def get_remarks_list(
+        request: Request,
         filter_data: RemarksSearch = Depends(),
         adapter: RemarksReadServiceAdapter = Depends(get_remarks_read_adapter),
 ):
-    """Get all remarks by provided fields."""
-    return await adapter.list(filter_data)
+    """
+    Get all remarks by provided fields.
+
+    Streams all remarks (ignoring pagination) as NDJSON if requested with "Accept: application/x-ndjson".
+    """
+
+    if accepts_ndjson(request):
+        return StreamingResponse(await adapter.stream(filter_data), media_type=NDJSON_MEDIA_TYPE)
+
+    return page_response(await adapter.list_raw(filter_data))
 
 
 @router.patch("/remarks/{remark_id}", status_code=202)
@@ -67,6 +98,24 @@ async def create_remark_doc(
     await adapter.create(data)
 
 
+@router.post("/remark-docs/bulk", status_code=202)
+async def bulk_create_remark_docs(
+        data: list[RemarkDocIn] = Body(max_length=settings.bulk_max_size),
+        adapter: RemarkDocsWriteServiceAdapter = Depends(get_remark_docs_write_adapter)
+):
+    """ Create new remark docs by single command. """
+    await adapter.bulk_create(data)
+
+
+@router.patch("/remark-docs/bulk", status_code=202)
+async def bulk_update_remark_docs(
+        data: dict[UUID, RemarkDocUpdate] = Body(max_length=settings.bulk_max_size),
+        adapter: RemarkDocsWriteServiceAdapter = Depends(get_remark_docs_write_adapter)
+):
+    """ Update specified remark docs by single command, body maps remark doc ids to their updates. """
+    await adapter.bulk_update(data)
+
+
 @router.get("/remark-docs/{remark_doc_id}", response_model=RemarkDocOut)
 async def get_remark_doc(
         remark_doc_id: UUID,
@@ -78,11 +127,20 @@ async def get_remark_doc(
 
 @router.get("/remark-docs", response_model=list[RemarkDocOut])
 async def get_remark_docs_list(
+        request: Request,
         filter_data: RemarkDocsSearch = Depends(),
         adapter: RemarkDocsReadServiceAdapter = Depends(get_remark_docs_read_adapter)
 ):
-    """Get all remark_docs by provided fields."""
-    return await adapter.list(filter_data)
+    """
+    Get all remark_docs by provided fields.
+
+    Streams all remark_docs (ignoring pagination) as NDJSON if requested with "Accept: application/x-ndjson".
+    """
+
+    if accepts_ndjson(request):
+        return StreamingResponse(await adapter.stream(filter_data), media_type=NDJSON_MEDIA_TYPE)
+
+    return page_response(await adapter.list_raw(filter_data))
 
 
 @router.patch("/remark-docs/{remark_doc_id}", status_code=202)
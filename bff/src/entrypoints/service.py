@@ -4,6 +4,7 @@ from fastapi.responses import Response
 from bff.src.config.settings import settings
 from bff.src.dependencies import get_user
 from bff.src.domain.user import User
+from bff.src.service.auth import user_cache
 
 router = APIRouter(tags=["Service"])
 
@@ -13,6 +14,12 @@ async def healthcheck():
     return Response(status_code=200)
 
 
+@router.get("/auth-cache", dependencies=[Depends(get_user)])
+async def auth_cache_stats() -> dict[str, int]:
+    """ Hit/miss metrics of authenticated users cache, available to authenticated users only. """
+    return user_cache.stats
+
+
 if settings.debug:
     @router.get("/check-authentication")
     async def check_authentication(user: User = Depends(get_user)):
@@ -1,14 +1,13 @@
-import logging
 import time
 import traceback
 import uuid
+from functools import cache
 from typing import Callable
 
 from fastapi import Request
 
-from bff.src.config.logging import user_ip_var, request_id_var
-
-logger = logging.getLogger(__name__)
+from bff.src.config.logging import user_ip_var, request_id_var, logger
+from bff.src.config.settings import settings
 
 
 async def logging_middleware(
@@ -26,21 +25,25 @@ async def logging_middleware(
     user_ip_var.set(user_ip)
 
     start_time = time.time()
-    query_params = f"?{request.query_params}" if request.query_params else ""
+
+    # request line and URL are formatted at most once and only if request records are logged
+    @cache
+    def request_line() -> str:
+        query_params = f"?{request.query_params}" if request.query_params else ""
+        return f"{request.method} {request.url.path}{query_params}"
+
+    @cache
+    def url() -> str:
+        return str(request.url)
 
     # Log request start
     logger.info(
-        f"Request {request.method} {request.url.path}{query_params} started",
-        extra={
-            "extra_fields": {
-                "request_id": request_id,
-                "user_ip": user_ip,
-                "method": request.method,
-                "url": str(request.url),
-                "user_agent": request.headers.get("user-agent"),
-                "endpoint": request.url.path,
-            }
-        }
+        lambda: f"Request {request_line()} started",
+        sample_rate=settings.log_sample_rate,
+        method=request.method,
+        url=url,
+        user_agent=lambda: request.headers.get("user-agent"),
+        endpoint=lambda: request.url.path,
     )
 
     try:
@@ -49,18 +52,13 @@ async def logging_middleware(
 
         # Log request completion
         logger.info(
-            f"Request {request.method} {request.url.path}{query_params} completed",
-            extra={
-                "extra_fields": {
-                    "request_id": request_id,
-                    "user_ip": user_ip,
-                    "method": request.method,
-                    "url": str(request.url),
-                    "status_code": response.status_code,
-                    "process_time_ms": round(process_time * 1000, 2),
-                    "response_size": response.headers.get("content-length", 0),
-                }
-            }
+            lambda: f"Request {request_line()} completed",
+            sample_rate=settings.log_sample_rate,
+            method=request.method,
+            url=url,
+            status_code=response.status_code,
+            process_time_ms=round(process_time * 1000, 2),
+            response_size=lambda: response.headers.get("content-length", 0),
         )
 
         # Add request ID to response headers
@@ -71,19 +69,12 @@ async def logging_middleware(
         process_time = time.time() - start_time
         logger.error(
             "Request failed",
-            extra={
-                "extra_fields": {
-                    "request_id": request_id,
-                    "user_ip": user_ip,
-                    "method": request.method,
-                    "url": str(request.url),
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc(),
-                    "process_time_ms": round(process_time * 1000, 2),
-                }
-            },
-            exc_info=True
+            method=request.method,
+            url=url,
+            error_type=type(e).__name__,
+            error_message=str(e),
+            traceback=traceback.format_exc,
+            process_time_ms=round(process_time * 1000, 2),
         )
         raise
 
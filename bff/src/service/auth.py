@@ -1,6 +1,15 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
 from fastapi.security import OAuth2AuthorizationCodeBearer
 
 from bff.src.config.settings import settings
+from bff.src.domain.user import User
 
 oauth2_scheme = OAuth2AuthorizationCodeBearer(
     authorizationUrl=settings.kc_auth_url,
@@ -9,3 +18,119 @@ oauth2_scheme = OAuth2AuthorizationCodeBearer(
         "openid": "OpenID Connect",
     }
 )
+
+
+def get_token_expiration(token: str) -> float | None:
+    """
+    Get "exp" claim (unix timestamp) of JWT without its verification.
+
+    Token is verified by identity service, here it's used only to limit caching time.
+    """
+
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload))["exp"]
+        return float(exp)
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class UserCache:
+    """
+    In-process TTL + LRU cache of authenticated users keyed by token hash.
+
+    - entries expire after ttl seconds, but never later than token's exp;
+    - amount of entries is limited by max_size, least recently used are evicted first;
+    - concurrent misses of the same token share single loader call.
+
+    Only successful loads are cached, so invalid tokens are always
+    checked by identity service.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+    async def get_or_load(
+            self,
+            token: str,
+            loader: Callable[[], Awaitable[User]]
+    ) -> User:
+        """ Get user of specified token from cache or load it with loader. """
+
+        if self.ttl <= 0 or self.max_size <= 0:
+            return await loader()
+
+        key = hashlib.sha256(token.encode()).hexdigest()
+        user = self._get(key)
+        if user is not None:
+            self.hits += 1
+            return user
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(loader())
+            self._in_flight[key] = task
+            task.add_done_callback(
+                lambda t: self._on_loaded(key, token, t)
+            )
+
+        # shield loader from cancellation of a single waiting request
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get(self, key: str) -> User | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return user
+
+    def _on_loaded(self, key: str, token: str, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        ttl = self.ttl
+        if (exp := get_token_expiration(token)) is not None:
+            ttl = min(ttl, exp - time.time())
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+user_cache = UserCache(
+    ttl=settings.auth_cache_ttl,
+    max_size=settings.auth_cache_max_size,
+)
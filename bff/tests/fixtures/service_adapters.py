@@ -28,8 +28,11 @@ class FakeBaseServiceAdapter(
             json: dict | list = None,
             headers: dict = None,
             cookies: dict = None,
+            stream: bool = False,
             # test options:
             response_entity: dict = None,
+            response_content: bytes = None,
+            response_headers: dict = None,
             raise_error: httpx.codes = None
     ) -> httpx.Response:
         """
@@ -52,8 +55,9 @@ class FakeBaseServiceAdapter(
         )
         mock_response = httpx.Response(
             status_code=httpx.codes.OK,
-            headers=request_headers,
+            headers={**request_headers, **(response_headers or {})},
             json=response_entity,
+            content=response_content,
             request=mock_request
         )
         if raise_error:
@@ -86,10 +90,51 @@ class FakeDocumentsReadServiceAdapter(
 ):
     """ Fake documents read service adapter implementation. """
 
+    async def download(self, document_id: UUID, range_header: str | None = None, **kwargs) -> s3.FileDownload:
+        raise NotImplementedError()
+
     async def get_download_url(self, document_id: UUID, **kwargs) -> s3.S3DownloadResponse:
         raise NotImplementedError()
 
-    async def get_upload_url(self, document_id: UUID, **kwargs) -> s3.S3UploadResponse:
+    async def get_download_urls(self, document_ids: list[UUID], **kwargs) -> list[s3.S3DocumentDownloadResponse]:
+        raise NotImplementedError()
+
+    async def get_upload_url(self, document_id: UUID, md5: str | None = None, **kwargs) -> s3.S3UploadResponse:
+        raise NotImplementedError()
+
+    async def get_upload_urls(self, document_ids: list[UUID], **kwargs) -> list[s3.S3DocumentUploadResponse]:
+        raise NotImplementedError()
+
+    async def create_multipart_upload(
+            self,
+            document_id: UUID,
+            data: s3.S3MultipartUploadRequest,
+            **kwargs
+    ) -> s3.S3MultipartUploadResponse:
+        raise NotImplementedError()
+
+    async def get_upload_part_urls(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            data: s3.S3PartUrlsRequest,
+            **kwargs
+    ) -> s3.S3PartUrlsResponse:
+        raise NotImplementedError()
+
+    async def list_uploaded_parts(self, document_id: UUID, upload_id: str, **kwargs) -> list[s3.S3UploadedPart]:
+        raise NotImplementedError()
+
+    async def complete_multipart_upload(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            parts: list[s3.S3UploadedPart],
+            **kwargs
+    ) -> None:
+        raise NotImplementedError()
+
+    async def abort_multipart_upload(self, document_id: UUID, upload_id: str, **kwargs) -> None:
         raise NotImplementedError()
 
 
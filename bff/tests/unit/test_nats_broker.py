@@ -0,0 +1,128 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from nats.js import api
+
+from bff.src.adapters.broker import cmd
+from bff.src.adapters.broker.nats import NatsJS, Streams, get_type_adapter
+from bff.src.adapters.services.documents import DocumentsWriteServiceAdapter
+from bff.src.config.settings import settings
+from bff.src.domain.document import DocumentOut
+from bff.tests.fixtures.factories import DocumentFactory
+
+
+class FakeJetStream:
+    """ JetStream context with delayed acks and without network calls. """
+
+    def __init__(self, delay: float = 0.01, fail_subject: str | None = None, fail_payload: bytes | None = None):
+        self.delay = delay
+        self.fail_subject = fail_subject
+        self.fail_payload = fail_payload
+        self.published = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def publish(self, subject: str, payload: bytes, stream: str | None = None, **kwargs) -> api.PubAck:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if subject == self.fail_subject or payload == self.fail_payload:
+                raise TimeoutError
+            self.published.append((subject, payload))
+            return api.PubAck(stream=stream, seq=len(self.published))
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def broker(monkeypatch) -> NatsJS:
+    broker = NatsJS()
+    monkeypatch.setattr(broker, "js", FakeJetStream())
+    return broker
+
+
+def make_messages(amount: int) -> list[tuple[DocumentOut, str]]:
+    return [(DocumentFactory.build(), f"cmd.documents.{uuid.uuid4()}") for _ in range(amount)]
+
+
+async def test_type_adapter_is_cached(broker):
+    get_type_adapter.cache_clear()
+
+    for message, subject in make_messages(3):
+        await broker.publish(message, subject, stream=Streams.CMD)
+
+    assert get_type_adapter.cache_info().misses == 1
+    assert get_type_adapter.cache_info().hits == 2
+
+
+
+async def test_publish_batch(broker):
+    messages = make_messages(10)
+
+    acks = await broker.publish_batch(messages, stream=Streams.CMD)
+
+    assert all(isinstance(ack, api.PubAck) for ack in acks)
+    assert len(acks) == 10
+    assert broker.js.max_in_flight == 10
+    assert sorted(subject for subject, _ in broker.js.published) == sorted(subject for _, subject in messages)
+
+
+async def test_publish_batch_is_limited(broker, monkeypatch):
+    monkeypatch.setattr(settings, "nats_max_pending_acks", 3)
+
+    await broker.publish_batch(make_messages(10), stream=Streams.CMD)
+
+    assert broker.js.max_in_flight == 3
+    assert len(broker.js.published) == 10
+
+
+async def test_publish_batch_error(broker):
+    messages = make_messages(3)
+    broker.js.fail_subject = messages[1][1]
+
+    results = await broker.publish_batch(messages, stream=Streams.CMD)
+
+    assert isinstance(results[0], api.PubAck)
+    assert isinstance(results[1], TimeoutError)
+    assert isinstance(results[2], api.PubAck)
+    assert len(broker.js.published) == 2
+
+
+async def test_publish_batch_invalid_subject(broker):
+    messages = make_messages(2) + [(DocumentFactory.build(), "invalid.subject")]
+
+    with pytest.raises(ValueError):
+        await broker.publish_batch(messages, stream=Streams.CMD)
+
+    assert broker.js.published == []
+
+
+async def test_bulk_delete(broker):
+    adapter = DocumentsWriteServiceAdapter(broker, cmd.DocumentCmd(service_name="documents", entity_name="Document"))
+    document_ids = [uuid.uuid4() for _ in range(5)]
+
+    acks = await adapter.bulk_delete(document_ids)
+
+    assert len(acks) == 5
+    # commands are published together, not one round trip after another
+    assert broker.js.max_in_flight == 5
+    assert {subject for subject, _ in broker.js.published} == {adapter.commands.delete}
+    assert sorted(payload for _, payload in broker.js.published) == sorted(
+        get_type_adapter(str).dump_json(str(document_id)) for document_id in document_ids
+    )
+
+
+async def test_bulk_delete_error(broker):
+    adapter = DocumentsWriteServiceAdapter(broker, cmd.DocumentCmd(service_name="documents", entity_name="Document"))
+    document_ids = [uuid.uuid4() for _ in range(3)]
+    broker.js.fail_payload = get_type_adapter(str).dump_json(str(document_ids[1]))
+
+    with pytest.raises(HTTPException) as e:
+        await adapter.bulk_delete(document_ids)
+
+    assert e.value.status_code == 503
+    assert e.value.detail["failed_ids"] == [str(document_ids[1])]
+    assert len(broker.js.published) == 2
@@ -5,6 +5,8 @@ import pytest
 from fastapi import HTTPException
 from httpx import HTTPStatusError
 
+from bff.src.domain.base import get_list_adapter
+from bff.src.domain.pagination import NEXT_CURSOR_HEADER
 from bff.tests.fixtures import service_adapters
 from bff.tests.fixtures.factories import ENTITY_FACTORIES
 
@@ -64,6 +66,59 @@ class BaseTestReadServiceAdapter:
         )
 
         assert awaitable_entities == response_entities
+        assert response_entities.next_cursor is None
+
+    async def test_list_next_cursor(self):
+        factory = ENTITY_FACTORIES.get(self.service_adapter.out_schema)
+        awaitable_entities = factory.batch(2)
+        search_params = self.service_adapter.search_params(limit=2)
+
+        response_entities = await self.service_adapter.list(
+            search_params,
+            response_entity=[e.model_dump(mode="json") for e in awaitable_entities],
+            response_headers={NEXT_CURSOR_HEADER: "next-page-cursor"},
+        )
+
+        assert awaitable_entities == response_entities
+        assert response_entities.next_cursor == "next-page-cursor"
+
+    async def test_list_raw(self):
+        factory = ENTITY_FACTORIES.get(self.service_adapter.out_schema)
+        content = get_list_adapter(self.service_adapter.out_schema).dump_json(factory.batch(2))
+
+        page = await self.service_adapter.list_raw(
+            self.service_adapter.search_params(limit=2),
+            response_content=content,
+            response_headers={NEXT_CURSOR_HEADER: "next-page-cursor"},
+        )
+
+        assert page.content == content
+        assert page.next_cursor == "next-page-cursor"
+
+    async def test_list_invalid_pagination(self):
+        search_params = self.service_adapter.search_params(cursor="invalid-cursor")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await self.service_adapter.list(
+                search_params,
+                response_entity={"detail": "Invalid cursor"},
+                raise_error=httpx.codes.UNPROCESSABLE_ENTITY,
+            )
+
+        assert exc_info.value.status_code == httpx.codes.UNPROCESSABLE_ENTITY
+
+    async def test_stream(self):
+        factory = ENTITY_FACTORIES.get(self.service_adapter.out_schema)
+        awaitable_entities = factory.batch(2)
+        content = b"".join(e.model_dump_json().encode() + b"\n" for e in awaitable_entities)
+
+        chunks = await self.service_adapter.stream(
+            self.service_adapter.search_params(),
+            response_content=content,
+        )
+        response_content = b"".join([chunk async for chunk in chunks])
+
+        assert response_content == content
 
 
 class TestCompaniesReadServiceAdapter(BaseTestReadServiceAdapter):
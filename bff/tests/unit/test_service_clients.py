@@ -0,0 +1,42 @@
+import httpx
+import pytest
+
+from bff.src.adapters.services.clients import ServiceClients
+
+
+@pytest.fixture
+async def clients():
+    service_clients = ServiceClients()
+    yield service_clients
+    await service_clients.close()
+
+
+async def test_same_client_for_same_upstream(clients):
+    assert clients.get("http://projects") is clients.get("http://projects")
+
+
+async def test_different_clients_for_different_upstreams(clients):
+    clients.open("http://projects", "http://documents")
+
+    assert clients.upstreams == ("http://projects", "http://documents")
+    assert clients.get("http://projects") is not clients.get("http://documents")
+
+
+async def test_close_releases_all_clients(clients):
+    client = clients.get("http://projects")
+
+    await clients.close()
+
+    assert client.is_closed
+    assert clients.upstreams == ()
+
+
+async def test_closed_client_is_recreated(clients):
+    client = clients.get("http://projects")
+    await client.aclose()
+
+    new_client = clients.get("http://projects")
+
+    assert new_client is not client
+    assert isinstance(new_client, httpx.AsyncClient)
+    assert not new_client.is_closed
@@ -0,0 +1,135 @@
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from bff.src.service.auth import UserCache, get_token_expiration
+from bff.tests.fixtures.factories import UserFactory
+
+
+def make_token(exp: float | None = None) -> str:
+    """ Unsigned JWT-like token with specified exp claim. """
+
+    payload = {"sub": "user"} if exp is None else {"sub": "user", "exp": exp}
+    encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=")
+    return f"header.{encoded.decode()}.signature"
+
+
+class FakeLoader:
+    """ Identity call replacement counting its calls. """
+
+    def __init__(self, delay: float = 0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.user = UserFactory.build()
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.user
+
+
+def test_get_token_expiration():
+    exp = time.time() + 100
+
+    assert get_token_expiration(make_token(exp)) == exp
+    assert get_token_expiration(make_token()) is None
+    assert get_token_expiration("not-a-jwt") is None
+
+
+async def test_cache_hit():
+    cache = UserCache(ttl=60, max_size=10)
+    loader = FakeLoader()
+    token = make_token(time.time() + 300)
+
+    first = await cache.get_or_load(token, loader)
+    second = await cache.get_or_load(token, loader)
+
+    assert first == second == loader.user
+    assert loader.calls == 1
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+async def test_concurrent_misses_share_single_call():
+    cache = UserCache(ttl=60, max_size=10)
+    loader = FakeLoader(delay=0.01)
+    token = make_token(time.time() + 300)
+
+    users = await asyncio.gather(
+        *[cache.get_or_load(token, loader) for _ in range(100)]
+    )
+
+    assert loader.calls == 1
+    assert all(user == loader.user for user in users)
+    assert cache.stats["coalesced"] == 99
+
+
+async def test_entry_never_outlives_token():
+    cache = UserCache(ttl=60, max_size=10)
+    loader = FakeLoader()
+    expired_token = make_token(time.time() - 1)
+
+    await cache.get_or_load(expired_token, loader)
+    await cache.get_or_load(expired_token, loader)
+
+    assert loader.calls == 2
+    assert cache.stats["size"] == 0
+
+
+async def test_entry_expires_after_ttl():
+    cache = UserCache(ttl=0.01, max_size=10)
+    loader = FakeLoader()
+    token = make_token(time.time() + 300)
+
+    await cache.get_or_load(token, loader)
+    await asyncio.sleep(0.02)
+    await cache.get_or_load(token, loader)
+
+    assert loader.calls == 2
+
+
+async def test_least_recently_used_entry_is_evicted():
+    cache = UserCache(ttl=60, max_size=2)
+    loader = FakeLoader()
+    tokens = [make_token(time.time() + 300 + i) for i in range(3)]
+
+    await cache.get_or_load(tokens[0], loader)
+    await cache.get_or_load(tokens[1], loader)
+    await cache.get_or_load(tokens[0], loader)  # tokens[1] becomes least recently used
+    await cache.get_or_load(tokens[2], loader)
+    await cache.get_or_load(tokens[0], loader)
+    await cache.get_or_load(tokens[1], loader)
+
+    assert loader.calls == 4
+    assert cache.stats["size"] == 2
+
+
+async def test_errors_are_not_cached():
+    cache = UserCache(ttl=60, max_size=10)
+    loader = FakeLoader(error=HTTPException(status_code=401))
+    token = make_token(time.time() + 300)
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await cache.get_or_load(token, loader)
+
+    assert loader.calls == 2
+    assert cache.stats["size"] == 0
+
+
+async def test_disabled_cache():
+    cache = UserCache(ttl=0, max_size=10)
+    loader = FakeLoader()
+    token = make_token(time.time() + 300)
+
+    await cache.get_or_load(token, loader)
+    await cache.get_or_load(token, loader)
+
+    assert loader.calls == 2
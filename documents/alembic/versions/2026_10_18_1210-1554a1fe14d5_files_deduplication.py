@@ -0,0 +1,58 @@
+"""files deduplication
+
+Revision ID: 1554a1fe14d5
+Revises: 9e64c61dd4eb
+Create Date: 2026-10-18 12:10:04.517238
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1554a1fe14d5'
+down_revision: Union[str, Sequence[str], None] = '9e64c61dd4eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('files',
+    sa.Column('md5', sa.String(length=32), nullable=False),
+    sa.Column('key', sa.String(), nullable=False, comment='S3 key of the file'),
+    sa.Column('ref_count', sa.Integer(), nullable=False, comment='Amount of documents referencing the file'),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('md5')
+    )
+    op.create_index(op.f('ix_files_created_at'), 'files', ['created_at'], unique=False)
+    op.create_index(op.f('ix_files_id'), 'files', ['id'], unique=False)
+
+    op.add_column('documents', sa.Column(
+        'file_key', sa.String(), nullable=True,
+        comment='S3 key of document file, shared by documents with the same content'
+    ))
+    # every synced document has its own file so far
+    op.execute("UPDATE documents SET file_key = id::text WHERE uploaded")
+    op.execute(
+        "INSERT INTO files (id, md5, key, ref_count) "
+        "SELECT gen_random_uuid(), md5, id::text, 1 FROM documents WHERE md5 IS NOT NULL"
+    )
+
+    op.drop_constraint('documents_md5_key', 'documents', type_='unique')
+    op.create_index(op.f('ix_documents_md5'), 'documents', ['md5'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_documents_md5'), table_name='documents')
+    op.create_unique_constraint(None, 'documents', ['md5'])
+    op.drop_column('documents', 'file_key')
+    op.drop_index(op.f('ix_files_id'), table_name='files')
+    op.drop_index(op.f('ix_files_created_at'), table_name='files')
+    op.drop_table('files')
@@ -0,0 +1,127 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from faststream.nats import NatsBroker, PullSub
+from faststream.nats.message import NatsBatchMessage
+from faststream.nats.publisher.usecase import LogicPublisher
+from nats.aio.msg import Msg
+from pydantic import ValidationError
+
+from documents.src.config.logging import logger, request_id_var
+from documents.src.config.settings import settings
+from documents.src.domain.base import get_type_adapter
+from documents.src.middleware import RetryMiddleware
+from documents.src.service.uow import AbstractUnitOfWork
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def batch_pull_sub() -> PullSub:
+    """ Pull subscription which passes batches of up to nats_batch_size messages to the handler. """
+    return PullSub(
+        batch_size=settings.nats_batch_size,
+        timeout=settings.nats_batch_timeout / 1000,
+        batch=True,
+    )
+
+
+@asynccontextmanager
+async def in_progress(raw_messages: list[Msg]) -> AsyncIterator[None]:
+    """
+    Report messages to JetStream as in progress every nats_batch_progress_interval seconds,
+    so messages of a batch which takes longer than ack_wait of consumer aren't redelivered while they are processed.
+    """
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(settings.nats_batch_progress_interval)
+            try:
+                for raw_message in raw_messages:
+                    await raw_message.in_progress()
+            except Exception as e:
+                logger.warning("Failed to report batch messages in progress", error=repr(e))
+
+    task = asyncio.create_task(report())
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
+async def process_batch(
+        uow: AbstractUnitOfWork,
+        broker: NatsBroker,
+        message: NatsBatchMessage,
+        schema: type[T],
+        handler: Callable[[T], Awaitable[R]],
+        publisher: LogicPublisher | None = None,
+        prefetch: Callable[[list[T]], Awaitable[None]] | None = None,
+) -> list[R]:
+    """
+    Process batch of messages in one unit of work and ack or nak every message individually.
+
+    Invalid messages are published to DLQ and terminated right away, retries can't fix them.
+    Each message is handled in its own savepoint, so a failed message doesn't roll back the others.
+    Failed messages are retried by the policy of RetryMiddleware: nak'ed with delay of their attempt,
+    on the last attempt published to DLQ and terminated. Messages are acked, retried and results are published
+    only after the unit of work is committed, if commit fails the whole batch is redelivered.
+    Prefetch is called with all valid messages of batch before they are handled one by one,
+    messages are reported in progress until the unit of work is committed.
+    """
+
+    adapter = get_type_adapter(schema)
+    items, invalid, failed = [], [], []
+    for raw_message, body in zip(message.raw_message, await message.decode()):
+        try:
+            items.append((raw_message, body, adapter.validate_python(body)))
+        except ValidationError as e:
+            error_msg_info = RetryMiddleware.get_error_info(
+                raw_message, e, RetryMiddleware.get_attempt(raw_message), body
+            )
+            logger.error(f"Invalid {raw_message.subject} message of batch, sending to DLQ", extra=error_msg_info)
+            await RetryMiddleware.publish_to_dlq(broker, error_msg_info)
+            await raw_message.term()
+            invalid.append(raw_message)
+
+    processed = []
+    async with in_progress([raw_message for raw_message, _, _ in items]):
+        if prefetch is not None:
+            await prefetch([item for _, _, item in items])
+
+        for raw_message, body, item in items:
+            correlation_id = (raw_message.headers or {}).get("correlation_id")
+            token = request_id_var.set(correlation_id)
+            try:
+                async with uow.savepoint():
+                    result = await handler(item)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to process {raw_message.subject} message of batch",
+                    error=repr(e),
+                )
+                failed.append((raw_message, body, e))
+            else:
+                processed.append((raw_message, correlation_id, result))
+            finally:
+                request_id_var.reset(token)
+
+        await uow.commit()
+
+    for raw_message, correlation_id, result in processed:
+        if publisher is not None:
+            await publisher.publish(result, correlation_id=correlation_id)
+        await raw_message.ack()
+    for raw_message, body, exc in failed:
+        await RetryMiddleware.retry_or_dead_letter(
+            broker,
+            raw_message,
+            exc,
+            body,
+            nack=lambda delay, raw_message=raw_message: raw_message.nak(delay=delay),
+            reject=raw_message.term,
+        )
+
+    logger.info("Batch processed", processed=len(processed), failed=len(invalid) + len(failed))
+    return [result for _, _, result in processed]
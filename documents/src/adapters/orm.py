@@ -49,12 +49,43 @@ class OrmDocument(Base):
     name: Mapped[str]
     version: Mapped[int] = mapped_column(comment="Used on expertise")
     variation: Mapped[int] = mapped_column(comment="Continuous numbering for every document")
-    md5: Mapped[str | None] = mapped_column(sa.String(32), unique=True)
+    md5: Mapped[str | None] = mapped_column(sa.String(32), index=True)
+    file_key: Mapped[str | None] = mapped_column(
+        comment="S3 key of document file, shared by documents with the same content"
+    )
     note: Mapped[str | None]
     # TODO добавь поле, сделай миграцию и реализуй логику томов
     # volume: Mapped[int] = mapped_column(comment="Номер тома")
 
     company_id: Mapped[uuid.UUID] = mapped_column(index=True)
     project_id: Mapped[uuid.UUID] = mapped_column(index=True)
-    section_id: Mapped[uuid.UUID] = mapped_column(index=True)
+    section_id: Mapped[uuid.UUID]
     responsible_id: Mapped[uuid.UUID] = mapped_column(index=True)
+
+    __table_args__ = (
+        # latest documents of section
+        sa.Index(
+            "ix_documents_section_id_created_at",
+            "section_id", sa.desc("created_at"), sa.desc("id"),
+        ),
+    )
+
+
+class OrmFile(Base):
+    """ Uploaded file content shared by documents with the same MD5. """
+
+    __tablename__ = "files"
+
+    md5: Mapped[str] = mapped_column(sa.String(32), unique=True)
+    key: Mapped[str] = mapped_column(comment="S3 key of the file")
+    ref_count: Mapped[int] = mapped_column(default=1, comment="Amount of documents referencing the file")
+
+
+class OrmSectionVersion(Base):
+    """ Version and variation of the latest document of section. """
+
+    __tablename__ = "section_versions"
+
+    section_id: Mapped[uuid.UUID] = mapped_column(unique=True)
+    version: Mapped[int]
+    variation: Mapped[int]
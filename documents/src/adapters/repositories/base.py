@@ -1,13 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Sequence, TypeVar, Generic, Type
+from typing import Sequence, TypeVar, Generic, Type, AsyncIterator
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import Select, select, update, delete
+from sqlalchemy import Select, select, insert, update, delete, tuple_
 from sqlalchemy.orm import InstrumentedAttribute, load_only, defer
 
 from documents.src.adapters.orm import Base, OrmDocument
 from documents.src.config.logging import logger
+from documents.src.config.settings import settings
+from documents.src.domain.pagination import Cursor, get_page_size
 from documents.src.service.uow import AbstractUnitOfWork
 
 MODEL = TypeVar("MODEL", bound=Base)
@@ -23,6 +25,10 @@ class IGenericRepository(ABC, Generic[MODEL, IN_SCHEMA]):
     async def create(self, entity: IN_SCHEMA) -> MODEL:
         ...
 
+    @abstractmethod
+    async def bulk_create(self, entities: Sequence[IN_SCHEMA]) -> Sequence[MODEL]:
+        ...
+
     @abstractmethod
     async def get(
             self,
@@ -37,14 +43,30 @@ class IGenericRepository(ABC, Generic[MODEL, IN_SCHEMA]):
             self,
             include_fields: Sequence[InstrumentedAttribute] = (),
             exclude_fields: Sequence[InstrumentedAttribute] = (),
+            limit: int | None = None,
+            cursor: str | None = None,
             **kwargs
     ) -> list[MODEL]:
         ...
 
+    @abstractmethod
+    def stream(
+            self,
+            include_fields: Sequence[InstrumentedAttribute] = (),
+            exclude_fields: Sequence[InstrumentedAttribute] = (),
+            chunk_size: int = 500,
+            **kwargs
+    ) -> AsyncIterator[MODEL]:
+        ...
+
     @abstractmethod
     async def update(self, entity_id: UUID, **kwargs) -> MODEL | None:
         ...
 
+    @abstractmethod
+    async def bulk_update(self, updates: Sequence[tuple[UUID, dict]]) -> Sequence[MODEL]:
+        ...
+
     @abstractmethod
     async def delete(self, entity_id: UUID) -> None:
         ...
@@ -54,7 +76,8 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
     async def create(self, entity: IN_SCHEMA) -> MODEL:
         logger.info(
             f"Adding new {self.model.__name__}",
-            extra=entity.model_dump()
+            extra=entity.model_dump,
+            sample_rate=settings.log_sample_rate,
         )
         db_entity = self.model(**entity.model_dump())
         self.uow.session.add(db_entity)
@@ -62,10 +85,29 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
 
         logger.info(
             f"New {self.model.__name__} {db_entity.id} added to DB",
-            extra=db_entity.to_dict()
+            extra=db_entity.to_dict,
+            sample_rate=settings.log_sample_rate,
         )
         return db_entity
 
+    async def bulk_create(self, entities: Sequence[IN_SCHEMA]) -> Sequence[MODEL]:
+        """
+        Add entities to DB by single "INSERT ... VALUES (...), (...) RETURNING" query.
+
+        Created entities are returned in order of given ones.
+        """
+
+        if not entities:
+            return []
+
+        logger.info(f"Adding {len(entities)} new {self.model.__name__} entities")
+        query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        query_result = await self.uow.session.scalars(query, [entity.model_dump() for entity in entities])
+        db_entities = query_result.all()
+
+        logger.info(f"{len(db_entities)} new {self.model.__name__} entities added to DB")
+        return db_entities
+
     async def get(
             self,
             include_fields: Sequence[InstrumentedAttribute] = (),
@@ -108,12 +150,25 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
             self,
             include_fields: Sequence[InstrumentedAttribute] = (),
             exclude_fields: Sequence[InstrumentedAttribute] = (),
+            limit: int | None = None,
+            cursor: str | None = None,
             **kwargs
     ) -> list[MODEL]:
         """
-        Get specified entities from DB.
+        Get page of specified entities from DB.
+
+        The same as .get, but returns up to limit entities (never more than max_page_size setting)
+        using keyset pagination by (created_at, id).
 
-        The same as .get, but without limiting.
+        @:param limit: Page size.
+        @:param cursor: Cursor of the last entity of previous page (see domain.pagination.Cursor).
+
+        SQL query of the next page will be:
+        SELECT *
+          FROM documents
+         WHERE (created_at, id) < (:cursor_created_at, :cursor_id)
+         ORDER BY created_at DESC, id DESC
+         LIMIT :limit
         """
 
         query = await self._prepare_select(
@@ -121,15 +176,51 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
             exclude_fields=exclude_fields,
             **kwargs
         )
+        if cursor:
+            last_entity = Cursor.decode(cursor)
+            query = query.where(
+                tuple_(self.model.created_at, self.model.id)
+                < tuple_(last_entity.created_at, last_entity.id)
+            )
+        query = query.limit(get_page_size(limit))
+
         query_result = await self.uow.session.execute(query)
         db_entities = query_result.scalars().all()
 
         return db_entities
 
+    async def stream(
+            self,
+            include_fields: Sequence[InstrumentedAttribute] = (),
+            exclude_fields: Sequence[InstrumentedAttribute] = (),
+            chunk_size: int = 500,
+            **kwargs
+    ) -> AsyncIterator[MODEL]:
+        """
+        Iterate over all specified entities from DB without materializing them at once.
+
+        Rows are fetched by server side cursor in chunks of chunk_size,
+        so memory usage doesn't depend on amount of entities.
+        Ordering is the same as in .list, page size isn't limited.
+        """
+
+        query = await self._prepare_select(
+            include_fields=include_fields,
+            exclude_fields=exclude_fields,
+            **kwargs
+        )
+        await self.uow.ensure_transaction()
+        query_result = await self.uow.session.stream_scalars(
+            query.execution_options(yield_per=chunk_size)
+        )
+        async for db_entity in query_result:
+            yield db_entity
+
     async def update(self,  entity_id: UUID,  **kwargs ) -> MODEL | None:
         logger.info(
             f"Updating {self.model.__name__} with id {entity_id} in DB...",
-            extra=kwargs
+            extra=kwargs,
+            sample_rate=settings.log_sample_rate,
         )
         query = (
             update(self.model)
@@ -142,7 +233,8 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
         if db_entity:
             logger.info(
                 f"{self.model.__name__} with id {entity_id} updated in DB",
-                extra=db_entity.to_dict()
+                extra=db_entity.to_dict,
+                sample_rate=settings.log_sample_rate,
             )
         else:
             logger.warning(
@@ -150,6 +242,34 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
             )
         return db_entity
 
+    async def bulk_update(self, updates: Sequence[tuple[UUID, dict]]) -> Sequence[MODEL]:
+        """
+        Update entities in DB, every entity with its own values.
+
+        Existing entities are locked by "SELECT ... FOR UPDATE", updated by executemany "UPDATE ... WHERE id = :id"
+        (grouped by sets of updated fields) and returned by single "SELECT ... WHERE id IN (...)" query.
+        Missing entities are skipped.
+        """
+
+        if not updates:
+            return []
+
+        logger.info(f"Updating {len(updates)} {self.model.__name__} entities in DB...")
+        entity_ids = [entity_id for entity_id, _ in updates]
+        query = select(self.model.id).where(self.model.id.in_(entity_ids)).with_for_update()
+        existing_ids = set((await self.uow.session.scalars(query)).all())
+
+        values = [{"id": entity_id, **kwargs} for entity_id, kwargs in updates if kwargs and entity_id in existing_ids]
+        if values:
+            await self.uow.session.execute(update(self.model), values)
+
+        query = select(self.model).where(self.model.id.in_(existing_ids))
+        query_result = await self.uow.session.scalars(query.execution_options(populate_existing=True))
+        db_entities = query_result.all()
+
+        logger.info(f"{len(db_entities)} {self.model.__name__} entities updated in DB")
+        return db_entities
+
     async def delete(self, entity_id: UUID) -> None:
         logger.info(f"Deleting {self.model.__name__} with id {entity_id} from DB...")
 
@@ -167,7 +287,7 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
         query = (
             select(self.model)
             .filter_by(**kwargs)
-            .order_by(self.model.created_at.desc())
+            .order_by(self.model.created_at.desc(), self.model.id.desc())
         )
         if include_fields:
             query = query.options(load_only(*include_fields))
@@ -183,5 +303,26 @@ class IDocumentsRepository(IGenericRepository, ABC):
         super().__init__(uow, OrmDocument)
 
     @abstractmethod
-    async def get_latest(self, section_id: UUID) -> OrmDocument | None:
+    async def allocate_version(
+            self,
+            section_id: UUID,
+            raise_variation: bool = False,
+            count: int = 1,
+    ) -> tuple[int, int]:
+        ...
+
+    @abstractmethod
+    async def get_many(
+            self,
+            document_ids: Sequence[UUID],
+            include_fields: Sequence[InstrumentedAttribute] = (),
+    ) -> Sequence[OrmDocument]:
+        ...
+
+    @abstractmethod
+    async def acquire_file(self, md5: str, key: str) -> str:
+        ...
+
+    @abstractmethod
+    async def release_file(self, md5: str) -> str | None:
         ...
@@ -1,9 +1,13 @@
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import update, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import InstrumentedAttribute
 
-from documents.src.adapters.orm import OrmDocument
+from documents.src.adapters.orm import OrmDocument, OrmFile, OrmSectionVersion
 from documents.src.adapters.repositories.base import IDocumentsRepository, GenericRepository
+from documents.src.config.logging import logger
 from documents.src.domain.document import DocumentCreate
 
 
@@ -11,16 +15,102 @@ class DocumentsRepository(
     IDocumentsRepository,
     GenericRepository[OrmDocument, DocumentCreate]
 ):
-    async def get_latest(self, section_id: UUID) -> OrmDocument | None:
-        """ Get latest document of specified section if it exists. """
+    async def allocate_version(
+            self,
+            section_id: UUID,
+            raise_variation: bool = False,
+            count: int = 1,
+    ) -> tuple[int, int]:
+        """
+        Allocate version and variation of new document (or last of count new documents) of specified section.
+
+        Numbers are allocated by single "INSERT ... ON CONFLICT DO UPDATE ... RETURNING" query
+        to the section counter row, which stays locked till the end of transaction,
+        so concurrently created documents of the section get different versions.
+
+        SQL query will be:
+        INSERT INTO section_versions (section_id, version, variation)
+             VALUES (:section_id, :count, 0)
+        ON CONFLICT (section_id) DO UPDATE
+                SET version = section_versions.version + :count,
+                    variation = section_versions.variation + :count  -- or 0 without raise_variation
+          RETURNING version, variation
+        """
 
         query = (
-            select(OrmDocument)
-            .where(OrmDocument.section_id == section_id)
-            .order_by(OrmDocument.created_at.desc())
-            .limit(1)
+            insert(OrmSectionVersion)
+            .values(section_id=section_id, version=count, variation=count - 1 if raise_variation else 0)
+            .on_conflict_do_update(
+                index_elements=[OrmSectionVersion.section_id],
+                set_={
+                    "version": OrmSectionVersion.version + count,
+                    "variation": OrmSectionVersion.variation + count if raise_variation else 0,
+                },
+            )
+            .returning(OrmSectionVersion.version, OrmSectionVersion.variation)
         )
         query_result = await self.uow.session.execute(query)
-        latest_document = query_result.scalar()
+        version, variation = query_result.one()
+
+        return version, variation
+
+    async def get_many(
+            self,
+            document_ids: Sequence[UUID],
+            include_fields: Sequence[InstrumentedAttribute] = (),
+    ) -> Sequence[OrmDocument]:
+        """ Get documents with specified ids by single "id IN (...)" query, missing ids are skipped. """
+
+        query = await self._prepare_select(include_fields=include_fields)
+        query = query.where(OrmDocument.id.in_(document_ids))
+        query_result = await self.uow.session.execute(query)
+
+        return query_result.scalars().all()
+
+    async def acquire_file(self, md5: str, key: str) -> str:
+        """
+        Reference file with specified MD5, get S3 key of the file.
+
+        If there is no such file yet, it's registered with specified key.
+        Single "INSERT ... ON CONFLICT DO UPDATE" query keeps file row locked till the end of transaction,
+        so file can't be released by concurrent deletion meanwhile.
+        """
+
+        query = (
+            insert(OrmFile)
+            .values(md5=md5, key=key)
+            .on_conflict_do_update(
+                index_elements=[OrmFile.md5],
+                set_={"ref_count": OrmFile.ref_count + 1},
+            )
+            .returning(OrmFile.key)
+        )
+        query_result = await self.uow.session.execute(query)
+
+        return query_result.scalar_one()
+
+    async def release_file(self, md5: str) -> str | None:
+        """
+        Drop reference to file with specified MD5.
+
+        Returns S3 key of the file if it isn't referenced anymore, so it has to be deleted from S3.
+        """
+
+        query = (
+            update(OrmFile)
+            .where(OrmFile.md5 == md5)
+            .values(ref_count=OrmFile.ref_count - 1)
+            .returning(OrmFile.key, OrmFile.ref_count)
+        )
+        query_result = await self.uow.session.execute(query)
+        file = query_result.one_or_none()
+        if not file:
+            logger.warning(f"File with md5 {md5} not exist in DB")
+            return None
+        if file.ref_count > 0:
+            return None
+
+        await self.uow.session.execute(delete(OrmFile).where(OrmFile.md5 == md5))
+        logger.info(f"File {file.key} isn't referenced anymore, deleted from DB")
 
-        return latest_document
+        return file.key
@@ -1,16 +1,29 @@
 import abc
-from typing import AsyncGenerator
+import asyncio
+import base64
+import itertools
+import re
+import time
+from collections import deque
+from datetime import datetime
+from typing import AsyncGenerator, Sequence
 from uuid import UUID
 
 import aioboto3
 import aiobotocore.client
+from aiobotocore.config import AioConfig
 from aiobotocore.session import ClientCreatorContext
 from botocore.exceptions import ClientError
 
 from documents.src.config.logging import logger
 from documents.src.config.settings import settings
+from documents.src.domain.s3 import S3UploadedPart
 from documents.src.enums import DocumentContentType
 from documents.src.exceptions import FileExistError, FileNotExistError
+from documents.src.exceptions import InvalidMultipartUploadError, MultipartUploadNotFoundError
+
+
+MD5_PATTERN = re.compile(r"[0-9a-f]{32}")
 
 
 def get_s3_session_context():
@@ -19,21 +32,115 @@ def get_s3_session_context():
         region_name=settings.s3_region.get_secret_value(),
         aws_access_key_id=settings.s3_access_key.get_secret_value(),
         aws_secret_access_key=settings.s3_secret_key.get_secret_value(),
-        endpoint_url=settings.s3_endpoint.get_secret_value()
+        endpoint_url=settings.s3_endpoint.get_secret_value(),
+        config=AioConfig(max_pool_connections=settings.s3_max_pool_connections, signature_version="s3v4"),
     )
 
 
+async def head_object(client: aiobotocore.client.AioBaseClient, file_path: str | UUID) -> dict:
+    """ Get metadata of file, raises FileNotExistError if there is no such file. """
+
+    try:
+        return await client.head_object(Bucket=settings.s3_bucket.get_secret_value(), Key=str(file_path))
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "404":
+            raise FileNotExistError(f"File {file_path} not found in S3")
+        raise e
+
+
+class S3Client:
+    """
+    Process wide S3 client.
+
+    Creating aioboto3 session and client (credentials and endpoint resolution) takes much longer
+    than a small S3 request, so the client with its pool of s3_max_pool_connections connections
+    is created on first use and shared by all S3 adapters and streams until close().
+    """
+
+    def __init__(self):
+        self._context: ClientCreatorContext | None = None
+        self._client: aiobotocore.client.AioBaseClient | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> aiobotocore.client.AioBaseClient:
+        if self._client is None:
+            async with self._lock:
+                # client could be created by concurrent call while waiting for lock
+                if self._client is None:
+                    context = get_s3_session_context()
+                    self._client = await context.__aenter__()
+                    self._context = context
+        return self._client
+
+    async def close(self) -> None:
+        if self._context is not None:
+            context = self._context
+            self._context = None
+            self._client = None
+            await context.__aexit__(None, None, None)
+
+
+s3_client = S3Client()
+
+
+class PresignedUrlCache:
+    """
+    In-process cache of presigned download urls.
+
+    Urls are cached per (file path, expiry bucket), where expiry bucket is the current
+    ttl seconds long time interval. All cached urls are dropped when the next bucket starts,
+    so every returned url stays valid at least for (url expiration - ttl) seconds.
+    Amount of urls is limited by max_size, the oldest ones are evicted first.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._bucket: int | None = None
+        self._urls: dict[str, str] = {}
+
+    def get(self, file_path: str) -> str | None:
+        if self.ttl <= 0 or self._current_bucket() != self._bucket:
+            return None
+        return self._urls.get(file_path)
+
+    def set(self, file_path: str, url: str) -> None:
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+
+        bucket = self._current_bucket()
+        if bucket != self._bucket:
+            self._bucket = bucket
+            self._urls.clear()
+        elif file_path not in self._urls and len(self._urls) >= self.max_size:
+            del self._urls[next(iter(self._urls))]
+        self._urls[file_path] = url
+
+    def _current_bucket(self) -> int:
+        return int(time.time() // self.ttl)
+
+
+download_urls_cache = PresignedUrlCache(
+    ttl=settings.s3_download_url_cache_ttl,
+    max_size=settings.s3_download_url_cache_size,
+)
+
+
 class AbstractS3(abc.ABC):
     endpoint: str
     bucket: str
     download_url_expires_in: int
+    download_url_cache_ttl: int = 0
     upload_url_expires_in: int
     _client: aiobotocore.client.AioBaseClient | None
-    _context: ClientCreatorContext | None
 
     def __init__(self):
         self._client = None
-        self._context = None
+
+    @property
+    def download_url_min_expires_in(self) -> int:
+        """ Guaranteed lifetime of download url, cached urls may be returned when part of their lifetime passed. """
+        return self.download_url_expires_in - self.download_url_cache_ttl
 
     @abc.abstractmethod
     async def __aenter__(self):
@@ -48,7 +155,17 @@ class AbstractS3(abc.ABC):
         ...
 
     @abc.abstractmethod
-    async def get_stream(self, file_path: str | UUID, chunk_size: int = 1024) -> AsyncGenerator:
+    async def get_stream(
+            self,
+            file_path: str | UUID,
+            chunk_size: int = 1024,
+            start: int = 0,
+            end: int | None = None,
+    ) -> AsyncGenerator:
+        ...
+
+    @abc.abstractmethod
+    async def get_size(self, file_path: str | UUID) -> int:
         ...
 
     @abc.abstractmethod
@@ -56,53 +173,168 @@ class AbstractS3(abc.ABC):
         ...
 
     @abc.abstractmethod
-    async def get_upload_url(self, file_path: str | UUID, file_type: str = DocumentContentType.PDF.value) -> str:
+    async def get_upload_url(
+            self,
+            file_path: str | UUID,
+            file_type: str = DocumentContentType.PDF.value,
+            md5: str | None = None,
+    ) -> str:
         ...
 
+    @staticmethod
+    def get_upload_headers(md5: str | None = None) -> dict[str, str]:
+        """ Headers which client must send with file to upload url signed with md5. """
+        if md5 is None:
+            return {}
+        return {"Content-MD5": base64.b64encode(bytes.fromhex(md5)).decode()}
+
     @abc.abstractmethod
     async def exists(self, file_path: str | UUID) -> bool:
         ...
 
+    @abc.abstractmethod
+    async def get_md5(self, file_path: str | UUID) -> str | None:
+        ...
+
     @abc.abstractmethod
     async def delete(self, file_path: str | UUID) -> None:
         ...
 
+    @abc.abstractmethod
+    async def create_multipart_upload(self, file_path: str | UUID) -> str:
+        ...
+
+    @abc.abstractmethod
+    async def get_upload_part_urls(
+            self,
+            file_path: str | UUID,
+            upload_id: str,
+            part_numbers: Sequence[int],
+    ) -> dict[int, str]:
+        ...
+
+    @abc.abstractmethod
+    async def list_uploaded_parts(self, file_path: str | UUID, upload_id: str) -> list[S3UploadedPart]:
+        ...
+
+    @abc.abstractmethod
+    async def complete_multipart_upload(
+            self,
+            file_path: str | UUID,
+            upload_id: str,
+            parts: Sequence[S3UploadedPart],
+    ) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def abort_multipart_upload(self, file_path: str | UUID, upload_id: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def list_multipart_uploads(self, initiated_before: datetime) -> list[tuple[str, str]]:
+        ...
+
 
 class S3Stream:
     """
     Class for getting AsyncGenerator streams of S3 files.
 
-    S3Stream has its own s3 connection due to aioboto3's specific issues
-    with closing the streaming connection.
+    Range of the file (start and inclusive end) may be specified, whole file is streamed by default.
+    With concurrency > 1 file is read by parallel range requests of part_size bytes,
+    up to concurrency parts are prefetched, but bytes are yielded in order.
+    So memory usage of stream is limited by concurrency * part_size.
+
+    S3Stream uses shared S3 client, so it doesn't depend on lifetime of S3 adapter which created it.
+    Connection of fully read file returns to client's pool,
+    connection of partially read file (e.g. download was interrupted) is closed to not leak it.
     """
 
     def __init__(
             self,
             file_path: str | UUID,
-            chunk_size: int = 1024 * 128
+            chunk_size: int = 1024 * 128,
+            start: int = 0,
+            end: int | None = None,
+            part_size: int = settings.s3_stream_part_size,
+            concurrency: int = settings.s3_stream_concurrency,
     ):
         self.file_path = str(file_path)
         self.chunk_size = chunk_size
+        self.start = start
+        self.end = end
+        self.part_size = part_size
+        self.concurrency = concurrency
 
     async def __aiter__(self):
-        async with get_s3_session_context() as client:
-            try:
-                response = await client.get_object(
-                    Bucket=S3.bucket,
-                    Key=self.file_path
+        if self.end is not None and self.end < self.start:  # empty file
+            return
+
+        client = await s3_client.get()
+        if self.concurrency <= 1:
+            chunks = self._read_sequentially(client)
+        else:
+            chunks = self._read_in_parallel(client)
+
+        async for chunk in chunks:
+            yield chunk
+
+    async def _read_sequentially(self, client: aiobotocore.client.AioBaseClient):
+        if self.start or self.end is not None:
+            stream = await self._get_body(client, f"bytes={self.start}-{'' if self.end is None else self.end}")
+        else:
+            stream = await self._get_body(client)
+
+        async with stream:  # releases connection or closes it if body isn't read to the end
+            while file_data := await stream.read(self.chunk_size):
+                yield file_data
+
+    async def _read_in_parallel(self, client: aiobotocore.client.AioBaseClient):
+        end = self.end
+        if end is None:
+            end = await self._get_size(client) - 1
+
+        parts = (
+            (part_start, min(part_start + self.part_size, end + 1) - 1)
+            for part_start in range(self.start, end + 1, self.part_size)
+        )
+        prefetched: deque[asyncio.Task] = deque()
+        try:
+            for part in itertools.islice(parts, self.concurrency):
+                prefetched.append(asyncio.create_task(self._read_part(client, *part)))
+
+            while prefetched:
+                file_data = await prefetched.popleft()
+                if part := next(parts, None):
+                    prefetched.append(asyncio.create_task(self._read_part(client, *part)))
+                for offset in range(0, len(file_data), self.chunk_size):
+                    yield file_data[offset:offset + self.chunk_size]
+        finally:
+            for task in prefetched:
+                task.cancel()
+            await asyncio.gather(*prefetched, return_exceptions=True)
+
+    async def _read_part(self, client: aiobotocore.client.AioBaseClient, start: int, end: int) -> bytes:
+        stream = await self._get_body(client, f"bytes={start}-{end}")
+        async with stream:
+            return await stream.read()
+
+    async def _get_body(self, client: aiobotocore.client.AioBaseClient, byte_range: str | None = None):
+        params = {"Bucket": S3.bucket, "Key": self.file_path}
+        if byte_range:
+            params["Range"] = byte_range
+        try:
+            response = await client.get_object(**params)
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            if error_code == "NoSuchKey":
+                raise FileNotExistError(
+                    f"File {self.file_path} not found in S3"
                 )
-                stream = response["Body"]
-                async with stream:
-                    while file_data := await stream.read(self.chunk_size):
-                        yield file_data
-
-            except ClientError as e:
-                error_code = e.response["Error"]["Code"]
-                if error_code == "NoSuchKey":
-                    raise FileNotExistError(
-                        f"File {self.file_path} not found in S3"
-                    )
-                raise e
+            raise e
+        return response["Body"]
+
+    async def _get_size(self, client: aiobotocore.client.AioBaseClient) -> int:
+        return (await head_object(client, self.file_path))["ContentLength"]
 
 
 class S3(AbstractS3):
@@ -123,27 +355,26 @@ class S3(AbstractS3):
             s3.get("document_path_as_string")
 
     Note:
-        If you use S3 through dependency injection
-        the resulting instance of the class will use single connection until dependency close it.
+        All instances share process wide S3 client (see S3Client),
+        entering and exiting the context doesn't create or close connections.
     """
 
     endpoint: str = settings.s3_endpoint.get_secret_value()
     bucket: str = settings.s3_bucket.get_secret_value()
     download_url_expires_in: int = 60 * 5
+    download_url_cache_ttl: int = max(settings.s3_download_url_cache_ttl, 0)
+    download_urls: PresignedUrlCache = download_urls_cache
     upload_url_expires_in: int = 60 * 10
     _client: aiobotocore.client.AioBaseClient | None
-    _context: ClientCreatorContext | None
 
     async def __aenter__(self):
-        self._context = get_s3_session_context()
-        self._client = await self._context.__aenter__()
+        self._client = await s3_client.get()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        if self._context and self._client:
-            await self._context.__aexit__(exc_type, exc, tb)
-            self._client = None
-            self._context = None
+        # client is process wide and stays open till s3_client.close(),
+        # so it's kept for callbacks running after exit, e.g. deletion of files after commit of unit of work
+        pass
 
     async def put(
             self,
@@ -167,41 +398,68 @@ class S3(AbstractS3):
             self,
             file_path: str | UUID,
             chunk_size: int = 1024 * 128,
+            start: int = 0,
+            end: int | None = None,
     ) -> S3Stream:
-        """  Getting stream of file from S3. """
+        """  Getting stream of file (or its range from start to inclusive end) from S3. """
 
-        return S3Stream(file_path, chunk_size=chunk_size)
+        return S3Stream(file_path, chunk_size=chunk_size, start=start, end=end)
+
+    async def get_size(self, file_path: str | UUID) -> int:
+        """ Get size of file in bytes without getting file itself. """
+
+        return (await head_object(self._client, file_path))["ContentLength"]
 
     async def get_download_url(self, file_path: str | UUID) -> str:
-        if not await self.exists(file_path):
-            raise FileNotExistError("There is no such document in S3")
+        """
+        Getting download url of file from S3.
 
-        return await self._client.generate_presigned_url(
+        Url is signed locally without checking the file existence,
+        callers must ensure that file is uploaded (e.g. by "uploaded" flag of document).
+        """
+
+        file_path = str(file_path)
+        if url := self.download_urls.get(file_path):
+            return url
+
+        url = await self._client.generate_presigned_url(
             "get_object",
             Params={
                 "Bucket": self.bucket,
-                "Key": str(file_path),
+                "Key": file_path,
             },
             ExpiresIn=self.download_url_expires_in
         )
+        self.download_urls.set(file_path, url)
+        return url
 
     async def get_upload_url(
             self,
             file_path: str | UUID,
-            file_type: str = DocumentContentType.PDF.value
+            file_type: str = DocumentContentType.PDF.value,
+            md5: str | None = None,
     ) -> str:
-        """ Getting upload url of file from S3. """
+        """
+        Getting upload url of file from S3.
+
+        If client provides md5 of the file, it's signed into url as Content-MD5 header
+        (see get_upload_headers), so S3 rejects upload of corrupted or another file.
+        """
 
         if not DocumentContentType.is_valid(file_type):
             raise ValueError("Invalid file type")
 
+        params = {
+            "Bucket": self.bucket,
+            "Key": str(file_path),
+            # "ContentType": str(file_type),  # may be added if needed
+        }
+        if md5 is not None:
+            params["ContentMD5"] = self.get_upload_headers(md5)["Content-MD5"]
+
         return await self._client.generate_presigned_url(
             "put_object",
-            Params={
-                "Bucket": self.bucket,
-                "Key": str(file_path),
-                # "ContentType": str(file_type),  # may be added if needed
-            },
+            Params=params,
             ExpiresIn=self.upload_url_expires_in
         )
 
@@ -216,9 +474,128 @@ class S3(AbstractS3):
                 return False
             raise e
 
+    async def get_md5(self, file_path: str | UUID) -> str | None:
+        """
+        Get MD5 of file by its ETag without reading the file.
+
+        ETag is MD5 of the file only for single part uploads (presigned PUT)
+        without KMS or customer key encryption, otherwise None is returned.
+        Raises FileNotExistError if there is no such file.
+        """
+
+        head = await head_object(self._client, file_path)
+        etag = head.get("ETag", "").strip('"')
+        encrypted = head.get("ServerSideEncryption") == "aws:kms" or "SSECustomerAlgorithm" in head
+        if encrypted or not MD5_PATTERN.fullmatch(etag):  # multipart ETag is "<md5 of parts md5>-<parts>"
+            return None
+        return etag
+
     async def delete(self, file_path: str | UUID) -> None:
         """  Delete specified file. """
 
         logger.info(f"Deleting document {file_path} from S3...")
         await self._client.delete_object(Bucket=S3.bucket, Key=str(file_path))
         logger.info(f"Document {file_path} successfully deleted from S3")
+
+    async def create_multipart_upload(self, file_path: str | UUID) -> str:
+        """ Start multipart upload of file and get its upload id. """
+
+        response = await self._client.create_multipart_upload(Bucket=self.bucket, Key=str(file_path))
+        logger.info(f"Multipart upload {response['UploadId']} of document {file_path} started")
+        return response["UploadId"]
+
+    async def get_upload_part_urls(
+            self,
+            file_path: str | UUID,
+            upload_id: str,
+            part_numbers: Sequence[int],
+    ) -> dict[int, str]:
+        """ Getting upload urls of multipart upload parts, urls are signed locally. """
+
+        return {
+            part_number: await self._client.generate_presigned_url(
+                "upload_part",
+                Params={
+                    "Bucket": self.bucket,
+                    "Key": str(file_path),
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=self.upload_url_expires_in
+            )
+            for part_number in part_numbers
+        }
+
+    async def list_uploaded_parts(self, file_path: str | UUID, upload_id: str) -> list[S3UploadedPart]:
+        """ Get already uploaded parts of multipart upload, e.g. to resume it. """
+
+        parts = []
+        params = {"Bucket": self.bucket, "Key": str(file_path), "UploadId": upload_id}
+        try:
+            while True:
+                response = await self._client.list_parts(**params)
+                parts.extend(
+                    S3UploadedPart(part_number=part["PartNumber"], etag=part["ETag"], size=part["Size"])
+                    for part in response.get("Parts", [])
+                )
+                if not response.get("IsTruncated"):
+                    return parts
+                params["PartNumberMarker"] = response["NextPartNumberMarker"]
+        except ClientError as e:
+            self._raise_multipart_error(e, upload_id)
+
+    async def complete_multipart_upload(
+            self,
+            file_path: str | UUID,
+            upload_id: str,
+            parts: Sequence[S3UploadedPart],
+    ) -> None:
+        """ Assemble file from uploaded parts. """
+
+        try:
+            await self._client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=str(file_path),
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": part.part_number, "ETag": part.etag}
+                        for part in sorted(parts, key=lambda p: p.part_number)
+                    ]
+                },
+            )
+        except ClientError as e:
+            self._raise_multipart_error(e, upload_id)
+        logger.info(f"Multipart upload {upload_id} of document {file_path} completed")
+
+    async def abort_multipart_upload(self, file_path: str | UUID, upload_id: str) -> None:
+        """ Abort multipart upload and delete its uploaded parts, aborting of missing upload is ignored. """
+
+        try:
+            await self._client.abort_multipart_upload(Bucket=self.bucket, Key=str(file_path), UploadId=upload_id)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchUpload":
+                raise e
+        logger.info(f"Multipart upload {upload_id} of document {file_path} aborted")
+
+    async def list_multipart_uploads(self, initiated_before: datetime) -> list[tuple[str, str]]:
+        """ Get (file path, upload id) of not completed multipart uploads started before specified time. """
+
+        uploads = []
+        paginator = self._client.get_paginator("list_multipart_uploads")
+        async for page in paginator.paginate(Bucket=self.bucket):
+            uploads.extend(
+                (upload["Key"], upload["UploadId"])
+                for upload in page.get("Uploads", [])
+                if upload["Initiated"] < initiated_before
+            )
+        return uploads
+
+    @staticmethod
+    def _raise_multipart_error(error: ClientError, upload_id: str):
+        error_code = error.response["Error"]["Code"]
+        if error_code == "NoSuchUpload":
+            raise MultipartUploadNotFoundError(f"Multipart upload {upload_id} not found in S3")
+        if error_code in ("InvalidPart", "InvalidPartOrder", "EntityTooSmall"):
+            raise InvalidMultipartUploadError(error.response["Error"].get("Message", error_code))
+        raise error
@@ -1,7 +1,8 @@
 from datetime import datetime
+from functools import cache
 from uuid import UUID
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, TypeAdapter, model_validator
 
 
 class BaseValidationMixin:
@@ -22,3 +23,15 @@ class BaseValidationMixin:
 class EntityDeletedEvent(BaseModel):
     id: UUID
     deleted_at: datetime
+
+
+@cache
+def get_list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """ TypeAdapter of list[schema]. Building it is expensive, so it's created once per schema. """
+    return TypeAdapter(list[schema])
+
+
+@cache
+def get_type_adapter(schema: type) -> TypeAdapter:
+    """ TypeAdapter of any type, it's created once per type. """
+    return TypeAdapter(schema)
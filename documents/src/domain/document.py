@@ -5,6 +5,7 @@ from pydantic import BaseModel, ConfigDict
 
 from documents.src.domain.base import BaseValidationMixin
 from documents.src.enums import DocumentStatuses
+from documents.src.domain.pagination import PaginationParams
 
 
 class DocumentIn(BaseModel):
@@ -38,7 +39,7 @@ class DocumentOut(DocumentCreate):
     updated_at: datetime.datetime | None
 
 
-class DocumentsSearch(BaseModel):
+class DocumentsSearch(PaginationParams):
     id: UUID | None = None
     company_id: UUID | None = None
     project_id: UUID | None = None
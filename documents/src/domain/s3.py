@@ -1,4 +1,31 @@
-from pydantic import BaseModel, AnyHttpUrl
+import math
+from typing import Annotated, AsyncIterable, NamedTuple
+from uuid import UUID
+
+from pydantic import BaseModel, AnyHttpUrl, Field
+
+from documents.src.config.settings import settings
+from documents.src.exceptions import RangeNotSatisfiableError
+
+# limits of S3 multipart uploads
+S3_MIN_PART_SIZE = 5 * 1024 ** 2
+S3_MAX_PART_SIZE = 5 * 1024 ** 3
+S3_MAX_PARTS = 10_000
+S3_MAX_OBJECT_SIZE = 5 * 1024 ** 4
+
+PartNumber = Annotated[int, Field(ge=1, le=S3_MAX_PARTS)]
+
+
+def get_part_size(file_size: int, part_size: int | None = None) -> int:
+    """
+    Negotiate part size of multipart upload.
+
+    Requested part size (s3_multipart_part_size setting by default) is limited by S3 part size limits
+    and increased if the file can't be uploaded by S3_MAX_PARTS parts of such size.
+    """
+
+    part_size = min(max(part_size or settings.s3_multipart_part_size, S3_MIN_PART_SIZE), S3_MAX_PART_SIZE)
+    return max(part_size, math.ceil(file_size / S3_MAX_PARTS))
 
 
 class S3DownloadResponse(BaseModel):
@@ -10,3 +37,106 @@ class S3DownloadResponse(BaseModel):
 class S3UploadResponse(BaseModel):
     url: AnyHttpUrl
     expires_in: int
+    # must be sent with file to upload url
+    headers: dict[str, str] = {}
+
+
+class S3UrlsRequest(BaseModel):
+    document_ids: list[UUID] = Field(min_length=1, max_length=settings.max_page_size)
+
+
+class S3DocumentDownloadResponse(S3DownloadResponse):
+    document_id: UUID
+
+
+class S3DocumentUploadResponse(S3UploadResponse):
+    document_id: UUID
+
+
+class S3MultipartUploadRequest(BaseModel):
+    file_size: int = Field(gt=0, le=S3_MAX_OBJECT_SIZE)
+    # preferred part size, may be changed by S3 limits
+    part_size: int | None = Field(None, gt=0)
+
+
+class S3MultipartUploadResponse(BaseModel):
+    upload_id: str
+    part_size: int
+    parts_count: int
+
+
+class S3PartUrlsRequest(BaseModel):
+    part_numbers: list[PartNumber] = Field(min_length=1, max_length=settings.max_page_size)
+
+
+class S3PartUrl(BaseModel):
+    part_number: int
+    url: AnyHttpUrl
+
+
+class S3PartUrlsResponse(BaseModel):
+    urls: list[S3PartUrl]
+    expires_in: int
+
+
+class S3UploadedPart(BaseModel):
+    part_number: PartNumber
+    etag: str
+    size: int | None = None
+
+
+class S3CompleteMultipartUploadRequest(BaseModel):
+    parts: list[S3UploadedPart] = Field(min_length=1, max_length=S3_MAX_PARTS)
+
+
+class ByteRange(NamedTuple):
+    """ Satisfiable range of file bytes, end is inclusive. """
+
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    @classmethod
+    def parse(cls, header: str | None, size: int) -> "ByteRange | None":
+        """
+        Parse Range header of request to file of size bytes.
+
+        Returns None if whole file should be sent: there is no header, it's malformed
+        or requests multiple ranges (server may ignore such requests).
+        Raises RangeNotSatisfiableError if range is out of file.
+        """
+
+        if not header:
+            return None
+        unit, _, ranges = header.partition("=")
+        if unit.strip().lower() != "bytes" or "," in ranges:
+            return None
+
+        first, separator, last = ranges.strip().partition("-")
+        if not separator or not (first or last) or not all(v.isdigit() for v in (first, last) if v):
+            return None
+
+        if not first:  # suffix range "bytes=-500" means the last 500 bytes
+            if int(last) == 0:
+                raise RangeNotSatisfiableError(size)
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start, end = int(first), int(last) if last else size - 1
+            if last and start > end:
+                return None
+            end = min(end, size - 1)
+
+        if start >= size:
+            raise RangeNotSatisfiableError(size)
+        return cls(start, end)
+
+
+class FileDownload(NamedTuple):
+    filename: str
+    size: int
+    # None if whole file is downloaded
+    byte_range: ByteRange | None
+    stream: AsyncIterable[bytes]
@@ -1,20 +1,37 @@
+import math
+from urllib.parse import quote
 from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi import HTTPException
-from faststream.nats import NatsRouter
+from fastapi.responses import StreamingResponse
+from faststream import Context
+from faststream.nats import NatsBroker, NatsRouter
+from faststream.nats.message import NatsBatchMessage
 from nats.js.api import ConsumerConfig
 
 from documents.src.adapters.broker import streams
+from documents.src.adapters.broker.batch import batch_pull_sub, process_batch
 from documents.src.adapters.broker.cmd import DocumentCmd
 from documents.src.adapters.broker.events import DocumentEvents
+from documents.src.adapters.broker.ordering import KeyedLock
+from documents.src.config.settings import settings
 from documents.src.domain.base import EntityDeletedEvent
 from documents.src.domain.document import DocumentIn, DocumentOut, DocumentsSearch, DocumentUpdateCmd
-from documents.src.domain.s3 import S3DownloadResponse, S3UploadResponse
-from documents.src.exceptions import FileNotExistError
+from documents.src.domain.s3 import S3DownloadResponse, S3UploadResponse, S3UrlsRequest
+from documents.src.domain.s3 import S3DocumentDownloadResponse, S3DocumentUploadResponse
+from documents.src.domain.s3 import S3MultipartUploadRequest, S3MultipartUploadResponse
+from documents.src.domain.s3 import S3PartUrl, S3PartUrlsRequest, S3PartUrlsResponse
+from documents.src.domain.s3 import S3CompleteMultipartUploadRequest, S3UploadedPart
+from documents.src.domain.pagination import Cursor, page_response
+from documents.src.entrypoints.streaming import accepts_ndjson, ndjson_response
+from documents.src.exceptions import FileExistError, FileNotExistError, RangeNotSatisfiableError
+from documents.src.exceptions import InvalidMultipartUploadError, MultipartUploadNotFoundError
+from documents.src.middleware import RetryMiddleware
 from documents.src.service.document import DocumentService
+from documents.src.service.uow import UnitOfWork
 
 broker_router = NatsRouter()
 api_router = APIRouter(tags=["Documents"], route_class=DishkaRoute)
@@ -22,12 +39,23 @@ api_router = APIRouter(tags=["Documents"], route_class=DishkaRoute)
 document_commands = DocumentCmd(service_name="documents", entity_name="Document")
 document_events = DocumentEvents(service_name="documents", entity_name="Document")
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+# versions of documents of a section are allocated one by one within this process
+section_locks = KeyedLock()
+
+document_uploaded_publisher = broker_router.publisher(document_events.uploaded, stream=streams.events)
+
 
 @broker_router.subscriber(
     document_commands.create,
     stream=streams.cmd,
     queue="documents-create-workers",
-    config=ConsumerConfig(durable_name="documents-create")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="documents-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(document_events.created, stream=streams.events)
 async def create_document(
@@ -35,7 +63,28 @@ async def create_document(
         data: DocumentIn,
 ) -> DocumentOut:
     """ Create a new document metadata. """
-    return await document_service.create(data)
+    async with section_locks(data.section_id):
+        return await document_service.create(data)
+
+
+@broker_router.subscriber(
+    document_commands.bulk_create,
+    stream=streams.cmd,
+    queue="documents-bulk-create-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="documents-bulk-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
+)
+@broker_router.publisher(document_events.bulk_created, stream=streams.events)
+async def bulk_create_documents(
+        document_service: FromDishka[DocumentService],
+        data: list[DocumentIn],
+) -> list[DocumentOut]:
+    """ Create new documents by single DB insert, they are published as one event. """
+    async with section_locks(*(document.section_id for document in data)):
+        return await document_service.bulk_create(data)
 
 
 @api_router.get("/{document_id}", response_model=DocumentOut)
@@ -55,13 +104,62 @@ async def get_document(
 @api_router.get("", response_model=list[DocumentOut])
 async def get_documents_list(
         document_service: FromDishka[DocumentService],
+        request: Request,
         data: DocumentsSearch = Depends(),
-) -> list[DocumentOut]:
-    """Get all documents descriptions by provided fields."""
+) -> Response:
+    """
+    Get all documents descriptions by provided fields.
 
-    return await document_service.list(
+    Streams all documents descriptions as NDJSON (ignoring pagination) if requested with "Accept: application/x-ndjson".
+    """
+
+    if accepts_ndjson(request):
+        return ndjson_response(
+            document_service.stream(**data.model_dump(exclude_none=True, exclude={"limit", "cursor"}))
+        )
+
+    documents = await document_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(document_service.dump_json(documents), Cursor.after(documents, data.limit))
+
+
+@api_router.get("/{document_id}/download", response_class=StreamingResponse)
+async def download(
+        document_service: FromDishka[DocumentService],
+        document_id: UUID,
+        request: Request,
+) -> StreamingResponse:
+    """
+    Download specified file through the service.
+
+    Single range requests are supported ("Range: bytes=0-1023"), so downloads may be resumed or parallelized.
+    """
+
+    try:
+        file_download = await document_service.download(document_id, request.headers.get("range"))
+    except FileNotExistError as e:
+        raise HTTPException(404, detail=e.args[0])
+    except RangeNotSatisfiableError as e:
+        raise HTTPException(416, headers={"Content-Range": f"bytes */{e.args[0]}"})
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(file_download.filename)}",
+        "Content-Length": str(file_download.size),
+    }
+    status_code = 200
+    if byte_range := file_download.byte_range:
+        headers["Content-Range"] = f"bytes {byte_range.start}-{byte_range.end}/{file_download.size}"
+        headers["Content-Length"] = str(byte_range.length)
+        status_code = 206
+
+    return StreamingResponse(
+        file_download.stream,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/octet-stream",
+    )
 
 
 @api_router.get("/{document_id}/get-download-url", response_model=S3DownloadResponse)
@@ -79,44 +177,208 @@ async def get_download_url(
     return S3DownloadResponse(
         url=url,  # type: ignore
         filename=filename,
-        expires_in=document_service.s3.download_url_expires_in
+        expires_in=document_service.s3.download_url_min_expires_in
     )
 
 
+@api_router.post("/get-download-urls", response_model=list[S3DocumentDownloadResponse])
+async def get_download_urls(
+        document_service: FromDishka[DocumentService],
+        data: S3UrlsRequest,
+) -> list[S3DocumentDownloadResponse]:
+    """ Get download URLs for specified files, missing and not uploaded documents are skipped. """
+
+    urls = await document_service.get_download_urls(data.document_ids)
+    expires_in = document_service.s3.download_url_min_expires_in
+    return [
+        S3DocumentDownloadResponse(
+            document_id=document_id,
+            url=url,  # type: ignore
+            filename=filename,
+            expires_in=expires_in,
+        )
+        for document_id, (url, filename) in urls.items()
+    ]
+
+
 @api_router.get("/{document_id}/get-upload-url", response_model=S3UploadResponse)
 async def get_upload_url(
         document_service: FromDishka[DocumentService],
         document_id: UUID,
+        md5: str | None = Query(None, pattern=r"^[0-9a-f]{32}$"),
 ) -> S3UploadResponse:
-    """ Get upload URL for specified file. """
+    """
+    Get upload URL for specified file.
+
+    If MD5 of the file is provided, S3 verifies uploaded file by it,
+    returned headers must be sent with the file.
+    File of document can be uploaded only once.
+    """
 
-    url = await document_service.get_upload_url(document_id)
+    try:
+        url = await document_service.get_upload_url(document_id, md5=md5)
+    except FileNotExistError as e:
+        raise HTTPException(404, detail=e.args[0])
+    except FileExistError as e:
+        raise HTTPException(409, detail=e.args[0])
     return S3UploadResponse(
         url=url,  # type: ignore
-        expires_in=document_service.s3.upload_url_expires_in
+        expires_in=document_service.s3.upload_url_expires_in,
+        headers=document_service.s3.get_upload_headers(md5),
     )
 
 
+@api_router.post("/get-upload-urls", response_model=list[S3DocumentUploadResponse])
+async def get_upload_urls(
+        document_service: FromDishka[DocumentService],
+        data: S3UrlsRequest,
+) -> list[S3DocumentUploadResponse]:
+    """ Get upload URLs for specified files, missing and already uploaded documents are skipped. """
+
+    urls = await document_service.get_upload_urls(data.document_ids)
+    expires_in = document_service.s3.upload_url_expires_in
+    return [
+        S3DocumentUploadResponse(
+            document_id=document_id,
+            url=url,  # type: ignore
+            expires_in=expires_in,
+        )
+        for document_id, url in urls.items()
+    ]
+
+
+@api_router.post("/{document_id}/multipart-upload", response_model=S3MultipartUploadResponse)
+async def create_multipart_upload(
+        document_service: FromDishka[DocumentService],
+        document_id: UUID,
+        data: S3MultipartUploadRequest,
+) -> S3MultipartUploadResponse:
+    """
+    Start multipart upload of specified file.
+
+    Part size is negotiated by file size and preferred part size of client.
+    """
+
+    try:
+        upload_id, part_size = await document_service.create_multipart_upload(
+            document_id,
+            file_size=data.file_size,
+            part_size=data.part_size,
+        )
+    except FileNotExistError as e:
+        raise HTTPException(404, detail=e.args[0])
+    except FileExistError as e:
+        raise HTTPException(409, detail=e.args[0])
+
+    return S3MultipartUploadResponse(
+        upload_id=upload_id,
+        part_size=part_size,
+        parts_count=math.ceil(data.file_size / part_size),
+    )
+
+
+@api_router.post("/{document_id}/multipart-upload/{upload_id}/part-urls", response_model=S3PartUrlsResponse)
+async def get_upload_part_urls(
+        document_service: FromDishka[DocumentService],
+        document_id: UUID,
+        upload_id: str,
+        data: S3PartUrlsRequest,
+) -> S3PartUrlsResponse:
+    """ Get upload URLs of specified parts, ETag headers of their responses are needed to complete upload. """
+
+    urls = await document_service.get_upload_part_urls(document_id, upload_id, data.part_numbers)
+    return S3PartUrlsResponse(
+        urls=[S3PartUrl(part_number=part_number, url=url) for part_number, url in urls.items()],  # type: ignore
+        expires_in=document_service.s3.upload_url_expires_in,
+    )
+
+
+@api_router.get("/{document_id}/multipart-upload/{upload_id}/parts", response_model=list[S3UploadedPart])
+async def list_uploaded_parts(
+        document_service: FromDishka[DocumentService],
+        document_id: UUID,
+        upload_id: str,
+) -> list[S3UploadedPart]:
+    """ Get already uploaded parts to resume upload. """
+
+    try:
+        return await document_service.list_uploaded_parts(document_id, upload_id)
+    except MultipartUploadNotFoundError as e:
+        raise HTTPException(404, detail=e.args[0])
+
+
+@api_router.post("/{document_id}/multipart-upload/{upload_id}/complete", status_code=204)
+async def complete_multipart_upload(
+        document_service: FromDishka[DocumentService],
+        document_id: UUID,
+        upload_id: str,
+        data: S3CompleteMultipartUploadRequest,
+) -> None:
+    """ Assemble file from uploaded parts. """
+
+    try:
+        await document_service.complete_multipart_upload(document_id, upload_id, data.parts)
+    except (MultipartUploadNotFoundError, FileNotExistError) as e:
+        raise HTTPException(404, detail=e.args[0])
+    except FileExistError as e:
+        raise HTTPException(409, detail=e.args[0])
+    except InvalidMultipartUploadError as e:
+        raise HTTPException(422, detail=e.args[0])
+
+
+@api_router.delete("/{document_id}/multipart-upload/{upload_id}", status_code=204)
+async def abort_multipart_upload(
+        document_service: FromDishka[DocumentService],
+        document_id: UUID,
+        upload_id: str,
+) -> None:
+    """ Abort multipart upload and delete its uploaded parts. """
+
+    await document_service.abort_multipart_upload(document_id, upload_id)
+
+
 @broker_router.subscriber(
     document_commands.sync,
     stream=streams.cmd,
-    queue="documents-sync-workers",
-    config=ConsumerConfig(durable_name="documents-sync")
+    pull_sub=batch_pull_sub(),
+    config=ConsumerConfig(
+        durable_name="documents-sync-batch",
+        max_ack_pending=settings.nats_max_ack_pending,
+        # backstop of retry policy applied by process_batch, e.g. if process dies on the last attempt
+        max_deliver=RetryMiddleware.get_retry_policy()[0],
+    )
 )
-@broker_router.publisher(document_events.uploaded, stream=streams.events)
 async def upload_callback(
         document_service: FromDishka[DocumentService],
-        document_id: UUID,
-) -> DocumentOut:
-    """ Upload callback for specified file. """
-    return await document_service.sync_document_with_file(document_id)
+        uow: FromDishka[UnitOfWork],
+        message: NatsBatchMessage = Context("message"),
+        broker: NatsBroker = Context("broker"),
+) -> None:
+    """
+    Upload callbacks for specified files, bursts of callbacks are synced in one transaction.
+
+    Files of the batch are looked up in S3 concurrently before documents are synced one by one.
+    """
+    await process_batch(
+        uow,
+        broker,
+        message,
+        UUID,
+        document_service.sync_document_with_file,
+        publisher=document_uploaded_publisher,
+        prefetch=document_service.prefetch_files_md5,
+    )
 
 
 @broker_router.subscriber(
     document_commands.update,
     stream=streams.cmd,
     queue="documents-update-workers",
-    config=ConsumerConfig(durable_name="documents-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="documents-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(document_events.updated, stream=streams.events)
 async def update_document(
@@ -125,21 +387,50 @@ async def update_document(
 ) -> DocumentOut:
     """ Update specified document. """
 
-    document = await document_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
+    async with update_locks(update_data.id):
+        document = await document_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        if not document:
+            raise Exception("Failed to update non-existent document")
+
+        return document
+
+
+@broker_router.subscriber(
+    document_commands.bulk_update,
+    stream=streams.cmd,
+    queue="documents-bulk-update-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="documents-bulk-update",
+        max_ack_pending=settings.nats_max_ack_pending,
     )
-    if not document:
-        raise Exception("Failed to update non-existent document")
+)
+@broker_router.publisher(document_events.bulk_updated, stream=streams.events)
+async def bulk_update_documents(
+        document_service: FromDishka[DocumentService],
+        update_data: list[DocumentUpdateCmd],
+) -> list[DocumentOut]:
+    """ Update specified documents in single DB transaction, they are published as one event. """
 
-    return document
+    async with update_locks(*(entity.id for entity in update_data)):
+        return await document_service.bulk_update([
+            (document.id, document.data.model_dump(exclude_none=True))
+            for document in update_data
+        ])
 
 
 @broker_router.subscriber(
     document_commands.delete,
     stream=streams.cmd,
     queue="documents-delete-workers",
-    config=ConsumerConfig(durable_name="documents-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="documents-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(document_events.deleted, stream=streams.events)
 async def delete_document(
@@ -0,0 +1,37 @@
+from typing import AsyncIterable, AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """ Client asked for streaming list response by Accept header. """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def encode_ndjson(
+        entities: AsyncIterable[BaseModel],
+        chunk_size: int = 100,
+) -> AsyncIterator[bytes]:
+    """ Encode entities as newline delimited JSON, chunk_size entities per chunk. """
+
+    chunk = []
+    async for entity in entities:
+        chunk.append(entity.model_dump_json().encode())
+        if len(chunk) >= chunk_size:
+            yield b"\n".join(chunk) + b"\n"
+            chunk.clear()
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def ndjson_response(entities: AsyncIterable[BaseModel]) -> StreamingResponse:
+    """
+    Streaming list response with constant memory usage.
+
+    Entities are encoded and sent to client while being read from DB.
+    """
+    return StreamingResponse(encode_ndjson(entities), media_type=NDJSON_MEDIA_TYPE)
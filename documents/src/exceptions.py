@@ -4,3 +4,15 @@ class FileExistError(Exception):
 
 class FileNotExistError(Exception):
     ...
+
+
+class RangeNotSatisfiableError(Exception):
+    """ Requested range is out of file, file size is passed as the first argument. """
+
+
+class MultipartUploadNotFoundError(Exception):
+    ...
+
+
+class InvalidMultipartUploadError(Exception):
+    ...
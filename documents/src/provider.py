@@ -5,7 +5,7 @@ from dishka import provide, Scope, Provider
 from documents.src.adapters.repositories.documents import DocumentsRepository
 from documents.src.adapters.s3 import S3
 from documents.src.service.document import DocumentService
-from documents.src.service.uow import UnitOfWork
+from documents.src.service.uow import UnitOfWork, ReplicaUnitOfWork
 
 
 class DependencyProvider(Provider):
@@ -38,3 +38,13 @@ class DependencyProvider(Provider):
     ) -> DocumentService:
         """ Real dependency of DocumentService for production. """
         return DocumentService(repo, s3)
+
+
+class ReadDependencyProvider(DependencyProvider):
+    """ Dependencies of read app, its queries are served by read replica. """
+
+    @provide(scope=Scope.REQUEST)
+    async def get_uow(self) -> AsyncIterable[UnitOfWork]:
+        """ Real dependency of read-only UnitOfWork bound to read replica for production. """
+        async with ReplicaUnitOfWork() as uow:
+            yield uow
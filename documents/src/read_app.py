@@ -5,16 +5,18 @@ from dishka import make_async_container
 from dishka.integrations.fastapi import setup_dishka, FastapiProvider
 from fastapi import FastAPI
 
+from documents.src.adapters.s3 import s3_client
 from documents.src.config.settings import settings
 from documents.src.entrypoints.router import router
 from documents.src.middleware import logging_middleware
-from documents.src.provider import DependencyProvider
+from documents.src.provider import ReadDependencyProvider
 
 
 @asynccontextmanager
 async def lifespan(application: FastAPI):
     yield
     await application.state.dishka_container.close()
+    await s3_client.close()
 
 
 def get_read_app():
@@ -27,7 +29,7 @@ def get_read_app():
     app.middleware("http")(logging_middleware)
 
     container = make_async_container(
-        DependencyProvider(),
+        ReadDependencyProvider(),
         FastapiProvider()
     )
     setup_dishka(container=container, app=app)
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Type, AsyncGenerator
+from typing import TypeVar, Generic, Type, AsyncIterator, Sequence
 from uuid import UUID
 
 from pydantic import BaseModel
 
 from documents.src.adapters.s3 import AbstractS3
 from documents.src.domain.document import DocumentIn, DocumentOut
+from documents.src.domain.s3 import FileDownload, S3UploadedPart
 from documents.src.adapters.repositories.base import IGenericRepository
+from documents.src.domain.base import get_list_adapter
 
 REPO = TypeVar("REPO", bound=IGenericRepository)
 IN_SCHEMA = TypeVar("IN_SCHEMA", bound=BaseModel)
@@ -30,6 +32,10 @@ class IGenericService(ABC, Generic[REPO, IN_SCHEMA, OUT_SCHEMA]):
     async def create(self, entity: IN_SCHEMA, **kwargs) -> IN_SCHEMA:
         ...
 
+    @abstractmethod
+    async def bulk_create(self, entities: Sequence[IN_SCHEMA]) -> Sequence[OUT_SCHEMA]:
+        ...
+
     @abstractmethod
     async def get(self, **kwargs) -> OUT_SCHEMA | None:
         ...
@@ -38,10 +44,22 @@ class IGenericService(ABC, Generic[REPO, IN_SCHEMA, OUT_SCHEMA]):
     async def list(self, **kwargs) -> list[OUT_SCHEMA]:
         ...
 
+    @abstractmethod
+    def dump_json(self, entities: Sequence[OUT_SCHEMA]) -> bytes:
+        ...
+
+    @abstractmethod
+    def stream(self, **kwargs) -> AsyncIterator[OUT_SCHEMA]:
+        ...
+
     @abstractmethod
     async def update(self, entity_id: UUID, **kwargs) -> OUT_SCHEMA | None:
         ...
 
+    @abstractmethod
+    async def bulk_update(self, updates: Sequence[tuple[UUID, dict]]) -> Sequence[OUT_SCHEMA]:
+        ...
+
     @abstractmethod
     async def delete(self, entity_id: UUID) -> None:
         ...
@@ -55,19 +73,35 @@ class GenericService(IGenericService[REPO, IN_SCHEMA, OUT_SCHEMA]):
         created_entity = self.out_schema.model_validate(created_entity)
         return created_entity
 
+    async def bulk_create(self, entities: Sequence[IN_SCHEMA]) -> Sequence[OUT_SCHEMA]:
+        created_entities = await self.repository.bulk_create(entities)
+        return get_list_adapter(self.out_schema).validate_python(created_entities, from_attributes=True)
+
     async def get(self, **kwargs) -> OUT_SCHEMA | None:
         db_entity = await self.repository.get(**kwargs)
         return self.out_schema.model_validate(db_entity) if db_entity else None
 
     async def list(self, **kwargs) -> list[OUT_SCHEMA]:
-        db_entity = await self.repository.list(**kwargs)
-        return [self.out_schema.model_validate(d) for d in db_entity]
+        db_entities = await self.repository.list(**kwargs)
+        return get_list_adapter(self.out_schema).validate_python(db_entities, from_attributes=True)
+
+    def dump_json(self, entities: Sequence[OUT_SCHEMA]) -> bytes:
+        """ Serialize entities to JSON in one pass, without validating them again. """
+        return get_list_adapter(self.out_schema).dump_json(entities)
+
+    async def stream(self, **kwargs) -> AsyncIterator[OUT_SCHEMA]:
+        async for db_entity in self.repository.stream(**kwargs):
+            yield self.out_schema.model_validate(db_entity)
 
     async def update(self, entity_id: UUID, **kwargs) -> OUT_SCHEMA | None:
         updated_entity = await self.repository.update(entity_id, **kwargs)
         updated_entity = self.out_schema.model_validate(updated_entity) if updated_entity else None
         return updated_entity
 
+    async def bulk_update(self, updates: Sequence[tuple[UUID, dict]]) -> Sequence[OUT_SCHEMA]:
+        updated_entities = await self.repository.bulk_update(updates)
+        return get_list_adapter(self.out_schema).validate_python(updated_entities, from_attributes=True)
+
     async def delete(self, entity_id: UUID, **kwargs) -> None:
         await self.repository.delete(entity_id)
 
@@ -78,6 +112,8 @@ class IDocumentService(IGenericService, ABC):
     def __init__(self, repository: REPO, s3: AbstractS3):
         """ Throws model into generic base. """
         self.s3 = s3
+        # MD5 of uploaded files got in advance for sync of documents, they live as long as the service
+        self._file_md5s: dict[UUID, str] = {}
         super().__init__(
             repository=repository,
             in_schema=DocumentIn,
@@ -85,17 +121,64 @@ class IDocumentService(IGenericService, ABC):
         )
 
     @abstractmethod
-    async def download(self, document_id: UUID) -> tuple[str, AsyncGenerator]:
-        """ Download file from S3. """
+    async def download(self, document_id: UUID, range_header: str | None = None) -> FileDownload:
+        """ Download file (or its range requested by Range header) from S3. """
 
     @abstractmethod
     async def get_download_url(self, document_id: UUID) -> tuple[str, str]:
         """ Get S3 download url and filename. """
 
     @abstractmethod
-    async def get_upload_url(self, document_id: UUID) -> str:
+    async def get_download_urls(self, document_ids: Sequence[UUID]) -> dict[UUID, tuple[str, str]]:
+        """ Get S3 download urls and filenames of uploaded documents. """
+
+    @abstractmethod
+    async def get_upload_url(self, document_id: UUID, md5: str | None = None) -> str:
         """  Get S3 upload url. """
 
+    @abstractmethod
+    async def get_upload_urls(self, document_ids: Sequence[UUID]) -> dict[UUID, str]:
+        """  Get S3 upload urls of existing documents. """
+
+    @abstractmethod
+    async def create_multipart_upload(
+            self,
+            document_id: UUID,
+            file_size: int,
+            part_size: int | None = None,
+    ) -> tuple[str, int]:
+        """ Start multipart upload of document file, get upload id and negotiated part size. """
+
+    @abstractmethod
+    async def get_upload_part_urls(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            part_numbers: Sequence[int],
+    ) -> dict[int, str]:
+        """ Get S3 upload urls of multipart upload parts. """
+
+    @abstractmethod
+    async def list_uploaded_parts(self, document_id: UUID, upload_id: str) -> list[S3UploadedPart]:
+        """ Get uploaded parts of multipart upload. """
+
+    @abstractmethod
+    async def complete_multipart_upload(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            parts: Sequence[S3UploadedPart],
+    ) -> None:
+        """ Assemble document file from uploaded parts. """
+
+    @abstractmethod
+    async def abort_multipart_upload(self, document_id: UUID, upload_id: str) -> None:
+        """ Abort multipart upload of document file. """
+
+    @abstractmethod
+    async def prefetch_files_md5(self, document_ids: Sequence[UUID]) -> None:
+        """ Get MD5 of uploaded files of documents concurrently before their sync. """
+
     @abstractmethod
     async def sync_document_with_file(self, document_id: UUID) -> DocumentOut:
         """ Sync document with its uploaded file. """
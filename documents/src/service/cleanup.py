@@ -0,0 +1,63 @@
+import asyncio
+import contextlib
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from documents.src.adapters.s3 import AbstractS3, S3
+from documents.src.config.logging import logger
+from documents.src.config.settings import settings
+
+
+class MultipartUploadsCleaner:
+    """
+    Periodic job aborting stale multipart uploads.
+
+    Parts of not completed uploads are stored (and billed) by S3 until upload is aborted,
+    so uploads started more than ttl seconds ago are aborted every interval seconds.
+    """
+
+    def __init__(self, s3_factory: Callable[[], AbstractS3], ttl: float, interval: float):
+        self.s3_factory = s3_factory
+        self.ttl = ttl
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def clean(self) -> int:
+        """ Abort stale multipart uploads and return their amount. """
+
+        initiated_before = datetime.now(timezone.utc) - timedelta(seconds=self.ttl)
+        s3 = self.s3_factory()
+        async with s3:
+            uploads = await s3.list_multipart_uploads(initiated_before)
+            for file_path, upload_id in uploads:
+                await s3.abort_multipart_upload(file_path, upload_id)
+
+        if uploads:
+            logger.info(f"{len(uploads)} stale multipart uploads aborted")
+        return len(uploads)
+
+    async def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.clean()
+            except Exception as e:
+                logger.error(f"Cleanup of stale multipart uploads failed: {e!r}")
+            await asyncio.sleep(self.interval)
+
+
+multipart_uploads_cleaner = MultipartUploadsCleaner(
+    S3,
+    ttl=settings.s3_multipart_upload_ttl,
+    interval=settings.s3_multipart_cleanup_interval,
+)
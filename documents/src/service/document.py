@@ -1,14 +1,19 @@
+import asyncio
 import hashlib
+from collections import Counter
 from datetime import datetime, timezone
-from typing import AsyncGenerator
+from functools import partial
+from typing import Sequence
 from uuid import UUID
 
 from documents.src.adapters.orm import OrmDocument
 from documents.src.adapters.repositories.documents import DocumentsRepository
 from documents.src.config.logging import logger
+from documents.src.config.settings import settings
 from documents.src.domain.document import DocumentCreate
 from documents.src.domain.document import DocumentIn, DocumentOut
-from documents.src.exceptions import FileNotExistError
+from documents.src.domain.s3 import ByteRange, FileDownload, S3UploadedPart, get_part_size
+from documents.src.exceptions import FileExistError, FileNotExistError
 from documents.src.service.base import IDocumentService, GenericService
 
 
@@ -31,21 +36,19 @@ class DocumentService(
 
         raise_variation flag used when document is examining by expert.
         If set to True - variation number of new versions will be increased.
+        Version and variation are allocated atomically, so concurrent creations in one section don't race.
         """
 
         logger.info(
             f"Creating new document for section {document_in.section_id}",
             extra=document_in.model_dump()
         )
-        latest_document = await self.repository.get_latest(document_in.section_id)
-        version = latest_document.version + 1 if latest_document else 1
-        variation = 0
         if raise_variation:
             logger.info(
                 f"Raising variation of new document for section {document_in.section_id}",
                 extra=document_in.model_dump()
             )
-            variation = latest_document.variation + 1 if latest_document else 0
+        version, variation = await self.repository.allocate_version(document_in.section_id, raise_variation)
 
         document_for_creation = DocumentCreate(
             **document_in.model_dump(),
@@ -62,58 +65,281 @@ class DocumentService(
 
         return created_document
 
-    async def download(self, document_id: UUID) -> tuple[str, AsyncGenerator]:
-        """ Download file from S3. """
+    async def bulk_create(self, documents_in: Sequence[DocumentIn]) -> list[DocumentOut]:
+        """
+        Creates new documents by single DB insert.
+
+        Versions are allocated by one query per section,
+        documents of the same section get sequential versions in given order (variation isn't raised).
+        """
+
+        logger.info(f"Creating {len(documents_in)} new documents")
+        sections = Counter(document_in.section_id for document_in in documents_in)
+        next_versions = {}
+        # counter rows are locked in the same order by all transactions to not deadlock
+        for section_id in sorted(sections):
+            last_version, _ = await self.repository.allocate_version(section_id, count=sections[section_id])
+            next_versions[section_id] = last_version - sections[section_id] + 1
+
+        documents_for_creation = []
+        for document_in in documents_in:
+            documents_for_creation.append(DocumentCreate(
+                **document_in.model_dump(),
+                version=next_versions[document_in.section_id],
+                variation=0,
+            ))
+            next_versions[document_in.section_id] += 1
+
+        return await super().bulk_create(documents_for_creation)
+
+    async def download(self, document_id: UUID, range_header: str | None = None) -> FileDownload:
+        """
+        Download file (or its range requested by Range header) from S3.
+
+        Raises FileNotExistError if there is no such document or its file isn't uploaded,
+        RangeNotSatisfiableError if requested range is out of file.
+        """
 
         document = await self.repository.get(
             id=document_id,
-            include_fields=(OrmDocument.name,)
+            include_fields=(OrmDocument.name, OrmDocument.uploaded, OrmDocument.file_key)
         )
-        file_stream = await self.s3.get_stream(document_id)
+        if not document:
+            raise FileNotExistError("There is no such document in DB")
+        if not document.uploaded:
+            raise FileNotExistError("Document file is not uploaded yet")
+
+        size = await self.s3.get_size(document.file_key)
+        byte_range = ByteRange.parse(range_header, size)
+        start, end = byte_range or (0, size - 1)
+        file_stream = await self.s3.get_stream(document.file_key, start=start, end=end)
 
-        return document.name, file_stream
+        return FileDownload(document.name, size, byte_range, file_stream)
 
     async def get_download_url(self, document_id: UUID) -> tuple[str, str]:
         """ Get S3 download url and filename. """
 
         document = await self.repository.get(
             id=document_id,
-            include_fields=[OrmDocument.name]
+            include_fields=[OrmDocument.name, OrmDocument.uploaded, OrmDocument.file_key]
         )
         if not document:
             raise FileNotExistError("There is no such document in DB")
-        url = await self.s3.get_download_url(document_id)
+        # file existence is confirmed by sync_document_with_file, so S3 is not requested here
+        if not document.uploaded:
+            raise FileNotExistError("Document file is not uploaded yet")
+        url = await self.s3.get_download_url(document.file_key)
 
         return url, document.name
 
-    async def get_upload_url(self, document_id: UUID) -> str:
-        """  Get S3 upload url. """
+    async def get_download_urls(self, document_ids: Sequence[UUID]) -> dict[UUID, tuple[str, str]]:
+        """
+        Get S3 download urls and filenames of uploaded documents.
+
+        Documents are queried at once, urls are signed locally.
+        Missing and not uploaded documents are skipped.
+        """
+
+        documents = await self.repository.get_many(
+            document_ids,
+            include_fields=[OrmDocument.id, OrmDocument.name, OrmDocument.uploaded, OrmDocument.file_key]
+        )
+        return {
+            document.id: (await self.s3.get_download_url(document.file_key), document.name)
+            for document in documents
+            if document.uploaded
+        }
+
+    async def get_upload_url(self, document_id: UUID, md5: str | None = None) -> str:
+        """
+        Get S3 upload url, signed with md5 of the file if it's provided.
+
+        Raises FileNotExistError if there is no such document, FileExistError if its file is already uploaded.
+        """
+
+        await self._check_uploadable(document_id)
+        return await self.s3.get_upload_url(document_id, md5=md5)
+
+    async def get_upload_urls(self, document_ids: Sequence[UUID]) -> dict[UUID, str]:
+        """  Get S3 upload urls of existing documents, missing and already uploaded documents are skipped. """
+
+        documents = await self.repository.get_many(
+            document_ids,
+            include_fields=[OrmDocument.id, OrmDocument.uploaded, OrmDocument.md5]
+        )
+        return {
+            document.id: await self.s3.get_upload_url(document.id)
+            for document in documents
+            if not (document.uploaded or document.md5)
+        }
+
+    async def create_multipart_upload(
+            self,
+            document_id: UUID,
+            file_size: int,
+            part_size: int | None = None,
+    ) -> tuple[str, int]:
+        """
+        Start multipart upload of document file, get upload id and negotiated part size.
+
+        Parts may be uploaded in parallel by urls of get_upload_part_urls,
+        upload is resumed by list_uploaded_parts and finished by complete_multipart_upload.
+        Not completed uploads are aborted by MultipartUploadsCleaner.
+        Raises FileNotExistError if there is no such document, FileExistError if its file is already uploaded.
+        """
+
+        await self._check_uploadable(document_id)
+        upload_id = await self.s3.create_multipart_upload(document_id)
+        return upload_id, get_part_size(file_size, part_size)
+
+    async def get_upload_part_urls(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            part_numbers: Sequence[int],
+    ) -> dict[int, str]:
+        """ Get S3 upload urls of multipart upload parts. """
+
+        return await self.s3.get_upload_part_urls(document_id, upload_id, part_numbers)
+
+    async def list_uploaded_parts(self, document_id: UUID, upload_id: str) -> list[S3UploadedPart]:
+        """ Get uploaded parts of multipart upload. """
+
+        return await self.s3.list_uploaded_parts(document_id, upload_id)
+
+    async def complete_multipart_upload(
+            self,
+            document_id: UUID,
+            upload_id: str,
+            parts: Sequence[S3UploadedPart],
+    ) -> None:
+        """
+        Assemble document file from uploaded parts.
+
+        Raises FileExistError if file of document was uploaded since the upload was started.
+        """
+
+        await self._check_uploadable(document_id)
+        await self.s3.complete_multipart_upload(document_id, upload_id, parts)
+
+    async def abort_multipart_upload(self, document_id: UUID, upload_id: str) -> None:
+        """ Abort multipart upload of document file. """
+
+        await self.s3.abort_multipart_upload(document_id, upload_id)
+
+    async def _check_uploadable(self, document_id: UUID) -> None:
+        """
+        Files are uploaded to the key of their document and may be referenced by other documents after sync,
+        so file of a synced document can't be uploaded again, it would replace files of the other documents.
+        """
 
-        return await self.s3.get_upload_url(document_id)
+        document = await self.repository.get(
+            id=document_id,
+            include_fields=[OrmDocument.id, OrmDocument.uploaded, OrmDocument.md5]
+        )
+        if not document:
+            raise FileNotExistError("There is no such document in DB")
+        if document.uploaded or document.md5:
+            raise FileExistError("Document file is already uploaded, it can't be replaced")
 
     async def sync_document_with_file(self, document_id: UUID) -> DocumentOut:
-        """ Sync document with its uploaded file. """
+        """
+        Sync document with its uploaded file.
 
-        if not await self.s3.exists(document_id):
-            raise FileNotExistError("There is no such document in S3")
+        MD5 is taken from file metadata, file is read only if its ETag isn't MD5.
+        Files are stored once per content: if a file with the same MD5 is already stored,
+        document references it and uploaded duplicate is deleted from S3 after commit.
+        Repeated sync of already synced document doesn't change it (file can't be uploaded again).
+        """
 
-        file_stream = await self.s3.get_stream(document_id)
-        md5 = hashlib.md5()
-        async for chunk in file_stream:
-            md5.update(chunk)
+        document = await self.repository.get(id=document_id)
+        if not document:
+            raise FileNotExistError("There is no such document in DB")
+
+        md5 = self._file_md5s.pop(document_id, None)
+        if document.md5:
+            # redelivered sync, its upload could be already deleted as a duplicate
+            return self.out_schema.model_validate(document)
+        if md5 is None:
+            md5 = await self._get_file_md5(document_id)
+
+        upload_key = str(document_id)
+        file_key = await self.repository.acquire_file(md5, upload_key)
+        if file_key != upload_key:
+            logger.info(f"File of document {document_id} is already stored as {file_key}, deleting its duplicate")
+            self._delete_file_after_commit(upload_key)
 
         updated_document = await self.repository.update(
             document_id,
             uploaded=True,
-            md5=md5.hexdigest()
+            md5=md5,
+            file_key=file_key,
         )
         updated_document = self.out_schema.model_validate(updated_document)
 
         return updated_document
 
+    async def prefetch_files_md5(self, document_ids: Sequence[UUID]) -> None:
+        """
+        Get MD5 of uploaded files of documents by s3_sync_concurrency concurrent requests,
+        so files which have to be read to compute MD5 don't hold up sync of each other.
+
+        Files which failed to be looked up are skipped, they are looked up again by sync of their documents.
+        """
+
+        semaphore = asyncio.Semaphore(settings.s3_sync_concurrency)
+
+        async def get_file_md5(document_id: UUID) -> str:
+            async with semaphore:
+                return await self._get_file_md5(document_id)
+
+        md5s = await asyncio.gather(*map(get_file_md5, document_ids), return_exceptions=True)
+        self._file_md5s.update(
+            (document_id, md5)
+            for document_id, md5 in zip(document_ids, md5s)
+            if isinstance(md5, str)
+        )
+
+    async def _get_file_md5(self, document_id: UUID) -> str:
+        md5 = await self.s3.get_md5(document_id)
+        if md5 is None:
+            logger.warning(f"ETag of document {document_id} isn't MD5, reading file to compute it")
+            md5 = await self._compute_md5(document_id)
+        return md5
+
+    async def _compute_md5(self, document_id: UUID) -> str:
+        file_stream = await self.s3.get_stream(document_id)
+        md5 = hashlib.md5()
+        async for chunk in file_stream:
+            md5.update(chunk)
+        return md5.hexdigest()
+
     async def delete(self, document_id: UUID, **kwargs) -> datetime:
-        """ Delete document from S3 and DB. """
+        """
+        Delete document from DB and its file from S3 if it isn't referenced by other documents.
+
+        File is deleted after commit, so rolled back deletion doesn't leave document without its file.
+        """
 
-        await self.s3.delete(document_id)
+        document = await self.repository.get(id=document_id, include_fields=[OrmDocument.md5])
+        if document and document.md5:
+            await self._release_file(document.md5)
+        else:
+            # file could be uploaded, but not synced yet
+            self._delete_file_after_commit(str(document_id))
         await self.repository.delete(document_id)
         return datetime.now(timezone.utc)
+
+    async def _release_file(self, md5: str) -> None:
+        """ Drop reference to file, delete it from S3 when it's not referenced anymore. """
+
+        file_key = await self.repository.release_file(md5)
+        if file_key:
+            self._delete_file_after_commit(file_key)
+
+    def _delete_file_after_commit(self, file_key: str) -> None:
+        """
+        Files are deleted only when changes referencing them are committed,
+        if the deletion fails the file is just left in S3.
+        """
+        self.repository.uow.after_commit(partial(self.s3.delete, file_key))
@@ -2,13 +2,25 @@ from dishka import make_async_container
 from dishka.integrations.faststream import setup_dishka, FastStreamProvider
 from faststream import FastStream
 
+from documents.src.adapters.db_pool import check_pool_capacity
+from documents.src.adapters.s3 import s3_client
 from documents.src.entrypoints.router import broker
 from documents.src.provider import DependencyProvider
+from documents.src.service.cleanup import multipart_uploads_cleaner
+
+
+def check_db_pool_capacity() -> None:
+    # push subscribers run up to max_workers handlers at once, batch subscribers run one
+    check_pool_capacity(sum(getattr(subscriber, "max_workers", None) or 1 for subscriber in broker.subscribers))
 
 
 def get_write_app():
     app = FastStream(
-        broker
+        broker,
+        on_startup=[check_db_pool_capacity],
+        after_startup=[multipart_uploads_cleaner.start],
+        on_shutdown=[multipart_uploads_cleaner.stop],
+        after_shutdown=[s3_client.close],
     )
     container = make_async_container(
         DependencyProvider(),
@@ -0,0 +1,78 @@
+"""
+Records per second of JSON formatter, with stdlib json and CustomJSONEncoder and with orjson JSONFormatter.
+Records carry fields like repositories log: ids, datetimes, enums of entities.
+
+    python -m documents.tests.benchmarks.json_formatter [--records 100000]
+"""
+import argparse
+import datetime
+import json
+import logging
+import time
+from enum import Enum
+from uuid import uuid4
+
+from shared_logging import CustomJSONEncoder, JSONFormatter
+
+
+class Status(Enum):
+    DRAFT = "draft"
+
+
+class StdlibJSONFormatter(logging.Formatter):
+    """ Previous formatter: record dict is serialized by json with Python-level default. """
+
+    def format(self, record):
+        log_entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "service": "documents",
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "request_id": getattr(record, 'request_id', None),
+            "user_ip": getattr(record, 'user_ip', None),
+        }
+        if hasattr(record, 'extra_fields'):
+            log_entry.update(record.extra_fields)
+
+        return json.dumps(log_entry, cls=CustomJSONEncoder, ensure_ascii=False)
+
+
+def make_record() -> logging.LogRecord:
+    record = logging.LogRecord("documents", logging.INFO, __file__, 1, "Document updated in DB", None, None)
+    record.request_id = str(uuid4())
+    record.user_ip = "127.0.0.1"
+    record.extra_fields = {
+        "extra": {
+            "id": uuid4(),
+            "section_id": uuid4(),
+            "status": Status.DRAFT,
+            "name": "Document",
+            "version": 3,
+            "created_at": datetime.datetime.now(),
+            "updated_at": datetime.datetime.now(),
+        },
+    }
+    return record
+
+
+def measure(name: str, formatter: logging.Formatter, records: int) -> None:
+    record = make_record()
+
+    start = time.perf_counter()
+    for _ in range(records):
+        formatter.format(record)
+    total = time.perf_counter() - start
+
+    print(f"{name:<20} {records / total:10.0f} records/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    measure("json", StdlibJSONFormatter(), args.records)
+    measure("orjson", JSONFormatter("documents"), args.records)
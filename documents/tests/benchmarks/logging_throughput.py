@@ -0,0 +1,110 @@
+"""
+Request throughput of an app logging like the services do, with logging off,
+with handlers called on the event loop and with handlers run by the queue listener.
+
+Log files are written to a temporary directory, console output goes to /dev/null.
+Stalls of log output (stdout pipe of the container, slow disk) are emulated by --write-latency ms per write:
+
+    python -m documents.tests.benchmarks.logging_throughput [--requests 2000] [--concurrency 20] [--write-latency 1]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from typing import TextIO
+
+import httpx
+from fastapi import FastAPI
+
+from documents.src.config import logging as logging_config
+from documents.src.config.logging import SERVICE_NAME, logger
+from shared_logging import ContextFilter, create_handlers, setup_logging
+from documents.src.middleware import logging_middleware
+
+PAYLOAD = {f"field_{i}": f"value {i}" for i in range(20)}
+
+
+class SlowStream:
+    """ Console stream which blocks for latency seconds on every write. """
+
+    def __init__(self, stream: TextIO, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def get_app() -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(logging_middleware)
+
+    @app.get("/documents")
+    async def get_documents():
+        # repositories log full payloads of entities
+        logger.info("Got documents", payload=PAYLOAD)
+        return PAYLOAD
+
+    return app
+
+
+def use_sync_handlers(handlers: list[logging.Handler]) -> None:
+    """ Previous pipeline: handlers are called on the event loop thread. """
+
+    root = logging.getLogger()
+    root.handlers.clear()
+    for handler in handlers:
+        handler.addFilter(ContextFilter())
+        root.addHandler(handler)
+
+
+async def measure(name: str, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=get_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def request():
+            async with semaphore:
+                response = await client.get("/documents")
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(requests)))
+        total = time.perf_counter() - start
+
+    print(f"{name:<32} {requests / total:8.1f} req/s")
+
+
+async def main(requests: int, concurrency: int, write_latency: float) -> None:
+    logging_config.listener.stop()
+
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        logging.disable(logging.CRITICAL)
+        await measure("logging off", requests, concurrency)
+        logging.disable(logging.NOTSET)
+
+        for latency in (0, write_latency / 1000):
+            suffix = f", {latency * 1000:g} ms writes" if latency else ""
+            stream = SlowStream(devnull, latency)
+
+            use_sync_handlers(create_handlers(SERVICE_NAME, log_dir, stream=stream))
+            await measure("sync handlers" + suffix, requests, concurrency)
+
+            listener = setup_logging(SERVICE_NAME, create_handlers(SERVICE_NAME, log_dir, stream=stream))
+            await measure("queue handler" + suffix, requests, concurrency)
+            listener.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--write-latency", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.write_latency))
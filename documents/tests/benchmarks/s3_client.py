@@ -0,0 +1,76 @@
+"""
+Latency of small S3 requests with client created per request and with shared S3 client.
+
+Runs against S3 from settings (MinIO from docker-compose or moto server), bucket must exist:
+
+    python -m documents.tests.benchmarks.s3_client [--requests 200] [--concurrency 10]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from documents.src.adapters.s3 import S3, S3Stream, get_s3_session_context, s3_client
+
+
+async def per_request_client(key: str) -> None:
+    async with get_s3_session_context() as client:
+        await client.head_object(Bucket=S3.bucket, Key=key)
+
+
+async def shared_client(key: str) -> None:
+    async with S3() as s3:
+        await s3.exists(key)
+
+
+async def interrupted_stream(key: str) -> None:
+    async for _ in S3Stream(key, chunk_size=1024):
+        break
+
+
+async def measure(name: str, request, key: str, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def timed():
+        async with semaphore:
+            start = time.perf_counter()
+            await request(key)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(requests)))
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"{name:<20} "
+        f"{requests / total:8.1f} req/s  "
+        f"p50 {latencies[len(latencies) // 2] * 1000:7.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.2f} ms"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    key = f"benchmarks/{uuid.uuid4()}"
+    async with S3() as s3:
+        await s3.put(key, b"0" * 1024 * 1024)
+
+    try:
+        await measure("per request client", per_request_client, key, requests, concurrency)
+        await measure("shared client", shared_client, key, requests, concurrency)
+        # with more requests than s3_max_pool_connections leaked connections of interrupted streams
+        # would exhaust the pool of shared client and the benchmark would hang here
+        await measure("interrupted stream", interrupted_stream, key, requests, concurrency)
+    finally:
+        async with S3() as s3:
+            await s3.delete(key)
+        await s3_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
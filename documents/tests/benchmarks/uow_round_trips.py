@@ -0,0 +1,104 @@
+"""
+Round trips and latency of read request with read-write and read-only UnitOfWork.
+
+Runs against DB from settings through local TCP proxy, which counts requests of client
+and delays each of them by simulated network round trip time:
+
+    python -m documents.tests.benchmarks.uow_round_trips [--requests 200] [--rtt-ms 1]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from documents.src.adapters.repositories.documents import DocumentsRepository
+from documents.src.config.settings import settings
+from documents.src.service.uow import UnitOfWork, create_engine
+
+
+class RoundTripProxy:
+    """ TCP proxy counting client requests (round trips) and delaying them by rtt. """
+
+    def __init__(self, target_host: str, target_port: int, rtt: float):
+        self.target_host = target_host
+        self.target_port = target_port
+        self.rtt = rtt
+        self.round_trips = 0
+        self.port = None
+        self._server = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+
+    async def _handle(self, client_reader, client_writer) -> None:
+        server_reader, server_writer = await asyncio.open_connection(self.target_host, self.target_port)
+        await asyncio.gather(
+            self._pipe(client_reader, server_writer, count=True),
+            self._pipe(server_reader, client_writer, count=False),
+        )
+
+    async def _pipe(self, reader, writer, count: bool) -> None:
+        try:
+            while data := await reader.read(65536):
+                if count:
+                    self.round_trips += 1
+                    await asyncio.sleep(self.rtt)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def run(read_only: bool, requests: int, rtt: float) -> tuple[float, float]:
+    url = make_url(settings.async_db_url)
+    proxy = RoundTripProxy(url.host, url.port, rtt)
+    await proxy.start()
+
+    engine = create_engine(
+        url.set(host="127.0.0.1", port=proxy.port).render_as_string(hide_password=False),
+        name="benchmark",
+        read_only=read_only,
+    )
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def request():
+        async with UnitOfWork(session_factory, read_only=read_only) as uow:
+            await DocumentsRepository(uow).get(id=uuid.uuid4())
+
+    for _ in range(10):  # opens connection and fills prepared statements cache
+        await request()
+
+    proxy.round_trips = 0
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        await request()
+    elapsed = time.perf_counter() - started_at
+
+    await engine.dispose()
+    await proxy.stop()
+    return proxy.round_trips / requests, elapsed / requests * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'round trips':>14}{'ms/request':>14}")
+    for read_only in (False, True):
+        round_trips, latency = await run(read_only, args.requests, args.rtt_ms / 1000)
+        print(f"{'read-only' if read_only else 'read-write':<12}{round_trips:>14.2f}{latency:>14.2f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
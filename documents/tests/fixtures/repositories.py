@@ -1,4 +1,4 @@
-from typing import Sequence
+from typing import Sequence, AsyncIterator
 from uuid import UUID, uuid4
 from datetime import datetime
 
@@ -15,28 +15,53 @@ class FakeDocumentsRepository(IDocumentsRepository):
 
     def __init__(self, uow: AbstractUnitOfWork, documents: list[OrmDocument] = None):
         self.documents = documents or []
+        # md5: [file key, references count]
+        self.files: dict[str, list] = {}
+        # section id: (version, variation)
+        self.section_versions: dict[UUID, tuple[int, int]] = {}
         super().__init__(uow)
 
-    async def get_latest(self, section_id: UUID) -> OrmDocument | None:
-        docs = [d for d in self.documents if d.section_id == section_id]
-        return max(docs, key=lambda x: x.created_at, default=None)
+    async def allocate_version(
+            self,
+            section_id: UUID,
+            raise_variation: bool = False,
+            count: int = 1,
+    ) -> tuple[int, int]:
+        if section_id in self.section_versions:
+            version, variation = self.section_versions[section_id]
+            version, variation = version + count, variation + count if raise_variation else 0
+        else:
+            version, variation = count, count - 1 if raise_variation else 0
+        self.section_versions[section_id] = (version, variation)
+        return version, variation
+
+    async def get_many(
+            self,
+            document_ids: Sequence[UUID],
+            include_fields: Sequence[InstrumentedAttribute] = (),
+    ) -> list[OrmDocument]:
+        return [d for d in self.documents if d.id in document_ids]
 
     async def create(self, document: DocumentCreate) -> OrmDocument:
         document = OrmDocument(
             **document.model_dump(),
             id=uuid4(),
+            uploaded=False,
             created_at=datetime.now()
         )
         self.documents.append(document)
         return document
 
+    async def bulk_create(self, documents: Sequence[DocumentCreate]) -> Sequence[OrmDocument]:
+        return [await self.create(document) for document in documents]
+
     async def get(
             self,
             include_fields: Sequence[InstrumentedAttribute] = (),
             exclude_fields: Sequence[InstrumentedAttribute] = (),
             **kwargs
-    ) -> OrmDocument:
-        ...
+    ) -> OrmDocument | None:
+        return await anext(self.stream(**kwargs), None)
 
     async def list(
             self,
@@ -44,17 +69,48 @@ class FakeDocumentsRepository(IDocumentsRepository):
             exclude_fields: Sequence[InstrumentedAttribute] = (),
             **kwargs
     ) -> list[OrmDocument]:
-        ...
+        return [document async for document in self.stream(**kwargs)]
+
+    async def stream(
+            self,
+            include_fields: Sequence[InstrumentedAttribute] = (),
+            exclude_fields: Sequence[InstrumentedAttribute] = (),
+            chunk_size: int = 500,
+            **kwargs
+    ) -> AsyncIterator[OrmDocument]:
+        for document in sorted(self.documents, key=lambda x: x.created_at, reverse=True):
+            if all(getattr(document, k) == v for k, v in kwargs.items()):
+                yield document
 
     async def update(
             self,
             document_id: UUID,
             **kwargs
-    ) -> OrmDocument:
-        ...
+    ) -> OrmDocument | None:
+        document = await self.get(id=document_id)
+        for field, value in kwargs.items() if document else ():
+            setattr(document, field, value)
+        return document
+
+    async def bulk_update(self, updates: Sequence[tuple[UUID, dict]]) -> Sequence[OrmDocument]:
+        documents = [await self.update(document_id, **kwargs) for document_id, kwargs in updates]
+        return [document for document in documents if document]
 
     async def delete(
             self,
             document_id: UUID
-    ) -> OrmDocument:
-        ...
+    ) -> None:
+        self.documents = [d for d in self.documents if d.id != document_id]
+
+    async def acquire_file(self, md5: str, key: str) -> str:
+        file = self.files.setdefault(md5, [key, 0])
+        file[1] += 1
+        return file[0]
+
+    async def release_file(self, md5: str) -> str | None:
+        file = self.files[md5]
+        file[1] -= 1
+        if file[1] > 0:
+            return None
+        del self.files[md5]
+        return file[0]
@@ -1,7 +1,11 @@
-from typing import AsyncGenerator
-from uuid import UUID
+import hashlib
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Sequence
+from uuid import UUID, uuid4
 
-from documents.src.adapters.s3 import AbstractS3, FileExistError
+from documents.src.adapters.s3 import AbstractS3, FileExistError, FileNotExistError
+from documents.src.domain.s3 import S3UploadedPart
+from documents.src.exceptions import MultipartUploadNotFoundError
 from documents.src.enums import DocumentContentType
 
 
@@ -10,6 +14,8 @@ class FakeS3(AbstractS3):
 
     def __init__(self, documents: dict | None = None):
         self.documents = documents or {}
+        # upload id: (file path, initiated at, parts)
+        self.uploads: dict[str, tuple[str, datetime, list[S3UploadedPart]]] = {}
         super().__init__()
 
     async def __aenter__(self):
@@ -24,20 +30,33 @@ class FakeS3(AbstractS3):
         self.documents[file_path] = file_data
 
     async def delete(self, file_path: str) -> None:
-        self.documents.pop(file_path, None)
+        self.documents.pop(str(file_path), None)
 
     async def get(self, file_path: str) -> bytes:
         return self.documents[file_path]
 
     async def exists(self, file_path: str) -> bool:
-        return True if self.documents.get(file_path) else False
+        return True if self.documents.get(str(file_path)) else False
 
     async def get_stream(
             self,
             file_path: str,
-            chunk_size: int = 1024
+            chunk_size: int = 1024,
+            start: int = 0,
+            end: int | None = None,
     ) -> AsyncGenerator:
-        ...
+        file_data = self.documents[str(file_path)][start:None if end is None else end + 1]
+
+        async def stream():
+            for offset in range(0, len(file_data), chunk_size):
+                yield file_data[offset:offset + chunk_size]
+
+        return stream()
+
+    async def get_size(self, file_path: str | UUID) -> int:
+        if not await self.exists(file_path):
+            raise FileNotExistError
+        return len(self.documents[str(file_path)])
 
     async def get_download_url(self, file_path: str | UUID) -> str:
         return "https://testing-link.com"
@@ -45,6 +64,54 @@ class FakeS3(AbstractS3):
     async def get_upload_url(
             self,
             file_path: str | UUID,
-            file_type: str = DocumentContentType.PDF.value
+            file_type: str = DocumentContentType.PDF.value,
+            md5: str | None = None,
     ) -> str:
         return "https://testing-link.com"
+
+    async def get_md5(self, file_path: str | UUID) -> str | None:
+        if not await self.exists(file_path):
+            raise FileNotExistError
+        return hashlib.md5(self.documents[str(file_path)]).hexdigest()
+
+    async def create_multipart_upload(self, file_path: str | UUID) -> str:
+        upload_id = str(uuid4())
+        self.uploads[upload_id] = (str(file_path), datetime.now(timezone.utc), [])
+        return upload_id
+
+    async def get_upload_part_urls(
+            self,
+            file_path: str | UUID,
+            upload_id: str,
+            part_numbers: Sequence[int],
+    ) -> dict[int, str]:
+        self._get_upload(upload_id)
+        return {part_number: f"https://testing-link.com/{part_number}" for part_number in part_numbers}
+
+    async def list_uploaded_parts(self, file_path: str | UUID, upload_id: str) -> list[S3UploadedPart]:
+        return self._get_upload(upload_id)[2]
+
+    async def complete_multipart_upload(
+            self,
+            file_path: str | UUID,
+            upload_id: str,
+            parts: Sequence[S3UploadedPart],
+    ) -> None:
+        self._get_upload(upload_id)
+        self.documents[str(file_path)] = b"".join(part.etag.encode() for part in parts)
+        del self.uploads[upload_id]
+
+    async def abort_multipart_upload(self, file_path: str | UUID, upload_id: str) -> None:
+        self.uploads.pop(upload_id, None)
+
+    async def list_multipart_uploads(self, initiated_before: datetime) -> list[tuple[str, str]]:
+        return [
+            (file_path, upload_id)
+            for upload_id, (file_path, initiated_at, _) in self.uploads.items()
+            if initiated_at < initiated_before
+        ]
+
+    def _get_upload(self, upload_id: str) -> tuple[str, datetime, list[S3UploadedPart]]:
+        if upload_id not in self.uploads:
+            raise MultipartUploadNotFoundError
+        return self.uploads[upload_id]
@@ -5,6 +5,7 @@ class FakeUnitOfWork(AbstractUnitOfWork):
     """Fake Unit of Work for testing."""
 
     def __init__(self, session=None):
+        super().__init__()
         self.session = session
         self.committed = False
         self.rolled_back = False
@@ -15,8 +16,10 @@ class FakeUnitOfWork(AbstractUnitOfWork):
 
     async def commit(self):
         self.committed = True
+        await self._run_after_commit()
 
     async def rollback(self):
+        self._after_commit.clear()
         self.rolled_back = True
 
     async def close(self):
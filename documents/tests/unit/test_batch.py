@@ -0,0 +1,197 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from documents.src.adapters.broker.batch import process_batch
+from documents.src.config.logging import request_id_var
+from documents.src.config.settings import settings
+from documents.src.middleware import RetryMiddleware
+from documents.tests.fixtures.uow import FakeUnitOfWork
+
+
+class FakeRawMessage:
+    """ Raw JetStream message which records its ack, nak, term and progress reports. """
+
+    subject = "cmd.documents.Sync"
+
+    def __init__(self, data, correlation_id: str, num_delivered: int = 1):
+        self.data = data
+        self.headers = {"correlation_id": correlation_id}
+        self.metadata = SimpleNamespace(num_delivered=num_delivered)
+        self.acked = False
+        self.nak_delay = None
+        self.terminated = False
+        self.in_progress_reports = 0
+
+    async def ack(self):
+        self.acked = True
+
+    async def nak(self, delay=None):
+        self.nak_delay = delay
+
+    async def term(self):
+        self.terminated = True
+
+    async def in_progress(self):
+        self.in_progress_reports += 1
+
+
+class FakeBatchMessage:
+    def __init__(self, raw_messages: list[FakeRawMessage]):
+        self.raw_message = raw_messages
+
+    async def decode(self):
+        return [m.data for m in self.raw_message]
+
+
+class FakeBroker:
+    def __init__(self):
+        self.dlq = []
+
+    async def publish(self, message, subject, stream):
+        self.dlq.append((subject, message))
+
+
+class FakePublisher:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, message, correlation_id=None):
+        self.published.append((message, correlation_id))
+
+
+class SavepointUnitOfWork(FakeUnitOfWork):
+    """ Fake unit of work which records outcomes of savepoints. """
+
+    def __init__(self):
+        super().__init__()
+        self.savepoints = []
+
+    def savepoint(self):
+        uow = self
+
+        class Savepoint:
+            async def __aenter__(self):
+                return None
+
+            async def __aexit__(self, exc_type, exc, tb):
+                uow.savepoints.append("rollback" if exc_type else "release")
+
+        return Savepoint()
+
+
+@pytest.fixture(autouse=True)
+def retry_policy(monkeypatch):
+    monkeypatch.setattr(settings, "debug", 0)
+    monkeypatch.setattr(settings, "is_test", 0)
+    monkeypatch.setattr(settings, "local", 0)
+    monkeypatch.setattr(RetryMiddleware, "max_retries", 3)
+    monkeypatch.setattr(RetryMiddleware, "delays", (1, 2))
+
+
+async def test_batch_messages_are_acked_individually():
+    ids = [uuid.uuid4() for _ in range(3)]
+    raw_messages = [FakeRawMessage(str(i), correlation_id=f"request-{n}") for n, i in enumerate(ids)]
+    raw_messages.append(FakeRawMessage("not-an-uuid", correlation_id="request-invalid"))
+    uow, broker, publisher = SavepointUnitOfWork(), FakeBroker(), FakePublisher()
+    request_ids = []
+
+    async def handler(document_id: uuid.UUID) -> str:
+        request_ids.append(request_id_var.get())
+        if document_id == ids[1]:
+            raise Exception("Failed to sync document")
+        return document_id.hex
+
+    prefetched = []
+
+    async def prefetch(document_ids: list[uuid.UUID]) -> None:
+        prefetched.extend(document_ids)
+
+    results = await process_batch(
+        uow,
+        broker,
+        FakeBatchMessage(raw_messages),
+        uuid.UUID,
+        handler,
+        publisher=publisher,
+        prefetch=prefetch,
+    )
+
+    assert results == [ids[0].hex, ids[2].hex]
+    assert prefetched == ids
+    assert uow.committed
+    assert uow.savepoints == ["release", "rollback", "release"]
+    assert request_ids == ["request-0", "request-1", "request-2"]
+    assert request_id_var.get() is None
+    assert publisher.published == [(ids[0].hex, "request-0"), (ids[2].hex, "request-2")]
+    assert [m.acked for m in raw_messages] == [True, False, True, False]
+    # failed message is retried with delay of its first attempt, invalid one can't be fixed by retries
+    assert [m.nak_delay for m in raw_messages] == [None, 1, None, None]
+    assert [m.terminated for m in raw_messages] == [False, False, False, True]
+    assert [(subject, message["message"]) for subject, message in broker.dlq] == [
+        ("dlq.cmd.documents.Sync", "not-an-uuid"),
+    ]
+
+
+async def test_batch_is_not_acked_if_commit_fails():
+    raw_messages = [FakeRawMessage(str(uuid.uuid4()), correlation_id="request")]
+
+    class FailingUnitOfWork(FakeUnitOfWork):
+        async def commit(self):
+            raise Exception("Failed to commit")
+
+    async def handler(document_id: uuid.UUID) -> uuid.UUID:
+        return document_id
+
+    with pytest.raises(Exception, match="Failed to commit"):
+        await process_batch(FailingUnitOfWork(), FakeBroker(), FakeBatchMessage(raw_messages), uuid.UUID, handler)
+
+    assert not raw_messages[0].acked
+    assert raw_messages[0].nak_delay is None
+
+
+async def test_failed_batch_message_is_sent_to_dlq_after_max_retries():
+    document_id = uuid.uuid4()
+    broker = FakeBroker()
+
+    async def handler(document_id: uuid.UUID) -> uuid.UUID:
+        raise Exception("Failed to sync document")
+
+    delivered = []
+    for attempt in range(1, RetryMiddleware.max_retries + 1):
+        raw_message = FakeRawMessage(str(document_id), correlation_id="request", num_delivered=attempt)
+        await process_batch(SavepointUnitOfWork(), broker, FakeBatchMessage([raw_message]), uuid.UUID, handler)
+        delivered.append(raw_message)
+
+    assert [m.nak_delay for m in delivered] == [1, 2, None]
+    assert [m.terminated for m in delivered] == [False, False, True]
+    assert not any(m.acked for m in delivered)
+    assert [subject for subject, _ in broker.dlq] == ["dlq.cmd.documents.Sync"]
+    assert broker.dlq[0][1]["attempts"] == 3
+    assert broker.dlq[0][1]["message"] == str(document_id)
+    assert broker.dlq[0][1]["correlation_id"] == "request"
+
+
+async def test_batch_messages_are_reported_in_progress_while_prefetched(monkeypatch):
+    monkeypatch.setattr(settings, "nats_batch_progress_interval", 0.01)
+    raw_messages = [FakeRawMessage(str(uuid.uuid4()), correlation_id="request") for _ in range(2)]
+
+    async def prefetch(document_ids: list[uuid.UUID]) -> None:
+        # longer than a few progress intervals, like S3 lookups of a batch of large files
+        await asyncio.sleep(0.05)
+
+    async def handler(document_id: uuid.UUID) -> uuid.UUID:
+        return document_id
+
+    await process_batch(
+        SavepointUnitOfWork(), FakeBroker(), FakeBatchMessage(raw_messages), uuid.UUID, handler, prefetch=prefetch
+    )
+    reports = [m.in_progress_reports for m in raw_messages]
+    await asyncio.sleep(0.03)
+
+    assert all(n >= 2 for n in reports)
+    # reporting stops with the batch
+    assert [m.in_progress_reports for m in raw_messages] == reports
+    assert all(m.acked for m in raw_messages)
@@ -0,0 +1,87 @@
+import logging
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from documents.src.adapters.db_pool import MonitoredPool, check_pool_capacity
+from documents.src.config.settings import settings
+
+
+class FakeDBAPIConnection:
+    def rollback(self):
+        ...
+
+    def close(self):
+        ...
+
+
+def make_pool(pool_size: int = 1, max_overflow: int = 0, timeout: float = 0.01) -> MonitoredPool:
+    return MonitoredPool(
+        creator=FakeDBAPIConnection,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        timeout=timeout,
+    )
+
+
+async def test_pool_metrics():
+    pool = make_pool(pool_size=1, max_overflow=1)
+
+    connections = [await greenlet_spawn(pool.connect) for _ in range(2)]
+
+    assert pool.metrics["checked_out"] == 2
+    assert pool.metrics["overflow"] == 1
+    assert pool.metrics["checkouts"] == 2
+    for connection in connections:
+        connection.close()
+    assert pool.metrics["checked_out"] == 0
+
+
+async def test_pool_exhaustion_is_logged(caplog):
+    pool = make_pool()
+    connection = await greenlet_spawn(pool.connect)
+
+    with pytest.raises(exc.TimeoutError):
+        await greenlet_spawn(pool.connect)
+
+    assert "DB connection pool is exhausted" in caplog.messages
+    connection.close()
+
+
+async def test_slow_checkout_is_logged(caplog, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_slow_checkout", 0)
+    pool = make_pool()
+
+    with caplog.at_level(logging.WARNING):
+        connection = await greenlet_spawn(pool.connect)
+
+    assert "Slow DB connection checkout" in caplog.messages
+    connection.close()
+
+
+async def test_periodic_metrics(caplog, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_metrics_interval", 0.000001)
+    pool = make_pool()
+
+    connection = await greenlet_spawn(pool.connect)
+
+    assert "DB connection pool metrics" in caplog.messages
+    assert pool.metrics["checkouts"] == 0  # stats are reset after logging
+    connection.close()
+
+
+def test_pool_capacity_is_checked(caplog, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 5)
+    monkeypatch.setattr(settings, "db_max_overflow", 10)
+    message = (
+        "Subscribers may run more handlers at once than DB pool has connections, "
+        "lower NATS_MAX_WORKERS or raise DB_POOL_SIZE and DB_MAX_OVERFLOW"
+    )
+
+    with caplog.at_level(logging.WARNING):
+        check_pool_capacity(handlers=15)
+        assert message not in caplog.messages
+
+        check_pool_capacity(handlers=16)
+        assert message in caplog.messages
@@ -1,6 +1,12 @@
+import asyncio
+import hashlib
+import json
 import uuid
 
+import pytest
+
 from documents.src.domain.document import DocumentIn
+from documents.src.exceptions import FileExistError, FileNotExistError
 from documents.tests.fixtures.factories import create_document_in_data
 
 
@@ -116,3 +122,156 @@ async def test_document_variations(fake_documents_service):
     assert first_document.variation == 0
     assert second_document.version == 2
     assert second_document.variation == 1
+
+
+async def test_documents_bulk_creation(fake_documents_service):
+    """ Documents of the same section get sequential versions in order of bulk. """
+
+    first_section, second_section = uuid.uuid4(), uuid.uuid4()
+    await fake_documents_service.create(DocumentIn(**create_document_in_data(section_id=first_section)))
+
+    documents = await fake_documents_service.bulk_create([
+        DocumentIn(**create_document_in_data(section_id=section_id))
+        for section_id in (first_section, second_section, first_section)
+    ])
+
+    assert [(d.section_id, d.version) for d in documents] == [
+        (first_section, 2),
+        (second_section, 1),
+        (first_section, 3),
+    ]
+
+
+async def test_documents_bulk_update(fake_documents_service):
+    documents = [
+        await fake_documents_service.create(DocumentIn(**create_document_in_data()))
+        for _ in range(2)
+    ]
+
+    updated_documents = await fake_documents_service.bulk_update([
+        (documents[0].id, {"note": "first"}),
+        (documents[1].id, {"name": "second"}),
+        (uuid.uuid4(), {"note": "missing"}),
+    ])
+
+    assert [(d.id, d.note, d.name) for d in updated_documents] == [
+        (documents[0].id, "first", documents[0].name),
+        (documents[1].id, documents[1].note, "second"),
+    ]
+
+
+async def test_documents_list_json(fake_documents_service):
+    for _ in range(3):
+        await fake_documents_service.create(DocumentIn(**create_document_in_data()))
+
+    documents = await fake_documents_service.list()
+    content = fake_documents_service.dump_json(documents)
+
+    assert json.loads(content) == [d.model_dump(mode="json") for d in documents]
+
+
+async def test_download_urls_of_uploaded_documents(fake_documents_service):
+    documents = [
+        await fake_documents_service.create(DocumentIn(**create_document_in_data(name=f"Document {i}")))
+        for i in range(3)
+    ]
+    fake_documents_service.repository.documents[0].uploaded = True
+    document_ids = [d.id for d in documents] + [uuid.uuid4()]
+
+    download_urls = await fake_documents_service.get_download_urls(document_ids)
+    upload_urls = await fake_documents_service.get_upload_urls(document_ids)
+
+    assert list(download_urls) == [documents[0].id]
+    assert download_urls[documents[0].id][1] == "Document 0"
+    assert set(upload_urls) == {d.id for d in documents[1:]}
+
+
+async def test_uploaded_files_deduplication(fake_documents_service):
+    s3 = fake_documents_service.s3
+    first, second = [
+        await fake_documents_service.create(DocumentIn(**create_document_in_data()))
+        for _ in range(2)
+    ]
+    for document in (first, second):
+        s3.documents[str(document.id)] = b"same content"
+
+    uow = fake_documents_service.repository.uow
+
+    await fake_documents_service.sync_document_with_file(first.id)
+    await fake_documents_service.sync_document_with_file(second.id)
+    await fake_documents_service.sync_document_with_file(second.id)  # repeated sync
+    # duplicate is deleted only after commit
+    assert list(s3.documents) == [str(first.id), str(second.id)]
+
+    await uow.commit()
+    # duplicate is deleted, both documents reference file of the first one
+    assert list(s3.documents) == [str(first.id)]
+    assert {d.file_key for d in fake_documents_service.repository.documents} == {str(first.id)}
+
+    await fake_documents_service.delete(first.id)
+    await uow.commit()
+    assert list(s3.documents) == [str(first.id)]  # still referenced by second document
+
+    await fake_documents_service.delete(second.id)
+    await uow.commit()
+    assert s3.documents == {}
+    assert fake_documents_service.repository.files == {}
+
+
+async def test_synced_file_is_not_uploaded_again(fake_documents_service):
+    """ Uploaded file may be referenced by other documents, so it can't be replaced by upload of its document. """
+
+    s3 = fake_documents_service.s3
+    first, second = [
+        await fake_documents_service.create(DocumentIn(**create_document_in_data()))
+        for _ in range(2)
+    ]
+    for document in (first, second):
+        s3.documents[str(document.id)] = b"same content"
+        await fake_documents_service.sync_document_with_file(document.id)
+
+    with pytest.raises(FileExistError):
+        await fake_documents_service.get_upload_url(first.id)
+    with pytest.raises(FileExistError):
+        await fake_documents_service.create_multipart_upload(first.id, file_size=1024)
+    with pytest.raises(FileNotExistError):
+        await fake_documents_service.get_upload_url(uuid.uuid4())
+
+    # content replaced by a still valid upload url doesn't change synced documents
+    s3.documents[str(first.id)] = b"other content"
+    synced = await fake_documents_service.sync_document_with_file(first.id)
+    assert synced.md5.hex == hashlib.md5(b"same content").hexdigest()
+
+
+async def test_files_md5_prefetch(fake_documents_service, monkeypatch):
+    s3 = fake_documents_service.s3
+    documents = [
+        await fake_documents_service.create(DocumentIn(**create_document_in_data()))
+        for _ in range(5)
+    ]
+    for n, document in enumerate(documents[:4]):
+        s3.documents[str(document.id)] = f"content {n}".encode()
+
+    in_flight = max_in_flight = 0
+    get_md5 = s3.get_md5
+
+    async def counting_get_md5(file_path):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return await get_md5(file_path)
+
+    monkeypatch.setattr(s3, "get_md5", counting_get_md5)
+    monkeypatch.setattr("documents.src.service.document.settings.s3_sync_concurrency", 2)
+
+    await fake_documents_service.prefetch_files_md5([document.id for document in documents])
+    assert max_in_flight == 2
+
+    # prefetched MD5 are used by sync, the file without upload is skipped by prefetch
+    monkeypatch.setattr(s3, "get_md5", None)
+    synced = [await fake_documents_service.sync_document_with_file(document.id) for document in documents[:4]]
+    assert [document.md5.hex for document in synced] == [
+        hashlib.md5(f"content {n}".encode()).hexdigest() for n in range(4)
+    ]
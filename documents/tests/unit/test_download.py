@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from documents.src.adapters import s3
+from documents.src.adapters.s3 import S3Stream
+from documents.src.domain.s3 import ByteRange
+from documents.src.exceptions import RangeNotSatisfiableError
+
+
+class FakeBody:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        ...
+
+    async def read(self, size: int = -1) -> bytes:
+        await asyncio.sleep(0)
+        data, self.data = (self.data, b"") if size < 0 else (self.data[:size], self.data[size:])
+        return data
+
+
+class FakeS3Client:
+    """ S3 client serving single file, keeps requested ranges and max amount of concurrent requests. """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.ranges = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def head_object(self, **kwargs) -> dict:
+        return {"ContentLength": len(self.data)}
+
+    async def get_object(self, Range: str | None = None, **kwargs) -> dict:
+        self.ranges.append(Range)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+        if Range is None:
+            return {"Body": FakeBody(self.data)}
+        start, end = Range.removeprefix("bytes=").split("-")
+        return {"Body": FakeBody(self.data[int(start):int(end) + 1 if end else None])}
+
+
+@pytest.fixture
+def client(monkeypatch) -> FakeS3Client:
+    client = FakeS3Client(bytes(range(256)) * 40)
+
+    async def get_client():
+        return client
+
+    monkeypatch.setattr(s3.s3_client, "get", get_client)
+    return client
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-99", ByteRange(0, 99)),
+        ("bytes=100-", ByteRange(100, 999)),
+        ("bytes=-10", ByteRange(990, 999)),
+        ("bytes=0-5000", ByteRange(0, 999)),
+        ("bytes=5-2", None),
+        ("bytes=a-b", None),
+        ("bytes=0-1,5-6", None),
+    ]
+)
+def test_range_parsing(header, expected):
+    assert ByteRange.parse(header, size=1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+def test_unsatisfiable_range(header):
+    with pytest.raises(RangeNotSatisfiableError):
+        ByteRange.parse(header, size=1000)
+
+
+async def test_parallel_stream(client):
+    stream = S3Stream("file", chunk_size=100, part_size=1000, concurrency=3)
+
+    data = b"".join([chunk async for chunk in stream])
+
+    assert data == client.data
+    assert len(client.ranges) == 11
+    assert client.max_in_flight == 3
+
+
+async def test_parallel_stream_of_range(client):
+    stream = S3Stream("file", start=1500, end=3499, part_size=1000, concurrency=2)
+
+    data = b"".join([chunk async for chunk in stream])
+
+    assert data == client.data[1500:3500]
+    assert client.ranges == ["bytes=1500-2499", "bytes=2500-3499"]
+
+
+async def test_sequential_stream_of_range(client):
+    stream = S3Stream("file", start=10, concurrency=1)
+
+    data = b"".join([chunk async for chunk in stream])
+
+    assert data == client.data[10:]
+    assert client.ranges == ["bytes=10-"]
@@ -0,0 +1,156 @@
+import datetime
+import json
+import logging
+import queue
+import sys
+from decimal import Decimal
+from enum import Enum
+from uuid import uuid4
+
+import pytest
+
+from shared_logging import BoundedQueueHandler, ContextLogger, DropPolicy, JSONFormatter
+
+
+def make_record(message: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": message, "levelno": logging.INFO, "levelname": "INFO"})
+
+
+def drain(log_queue: queue.Queue) -> list[str]:
+    messages = []
+    while not log_queue.empty():
+        messages.append(log_queue.get_nowait().getMessage())
+    return messages
+
+
+@pytest.mark.parametrize(
+    "drop_policy, queued",
+    [
+        (DropPolicy.NEW, ["first", "second"]),
+        (DropPolicy.OLD, ["second", "third"]),
+    ],
+)
+def test_full_queue_drop_policy(drop_policy, queued):
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, drop_policy)
+
+    for message in ("first", "second", "third"):
+        handler.handle(make_record(message))
+
+    assert drain(log_queue) == queued
+    assert handler.dropped == 1
+
+    handler.handle(make_record("fourth"))
+
+    assert drain(log_queue) == ["1 log records were dropped, log queue was full", "fourth"]
+    assert handler.dropped == 0
+
+
+def test_record_is_prepared_without_formatting():
+    log_queue = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(log_queue)
+    try:
+        raise ValueError("failure")
+    except ValueError:
+        record = logging.LogRecord("test", logging.ERROR, __file__, 1, "%s of %s", ("part", "batch"), None)
+        record.exc_info = sys.exc_info()
+
+    handler.handle(record)
+    queued = log_queue.get_nowait()
+
+    assert queued.msg == "part of batch"
+    assert queued.args is None
+    assert queued.exc_info is None
+    assert "ValueError: failure" in queued.exc_text
+    # original record is intact for other handlers of the logger
+    assert record.args == ("part", "batch")
+
+
+class Payload:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        return {"id": 1}
+
+
+@pytest.fixture
+def context_logger(caplog) -> ContextLogger:
+    caplog.set_level(logging.INFO, logger="test")
+    return ContextLogger(logging.getLogger("test"))
+
+
+def test_payload_is_built_only_for_logged_records(context_logger, caplog):
+    payload = Payload()
+
+    context_logger.debug(lambda: "Not logged", extra=payload)
+    context_logger.info(lambda: "Logged", extra=payload, status=200)
+
+    assert payload.calls == 1
+    [record] = caplog.records
+    assert record.getMessage() == "Logged"
+    assert record.extra_fields == {"extra": {"id": 1}, "status": 200}
+    assert record.funcName == "test_payload_is_built_only_for_logged_records"
+
+
+def test_sampled_records(context_logger, caplog, monkeypatch):
+    payload = Payload()
+    samples = iter([0.3, 0.1])
+    monkeypatch.setattr("shared_logging.context.random.random", lambda: next(samples))
+
+    context_logger.info("Dropped", sample_rate=0.2, extra=payload)
+    context_logger.info("Sampled", sample_rate=0.2, extra=payload)
+    context_logger.info("Always logged")
+
+    assert payload.calls == 1
+    assert [record.getMessage() for record in caplog.records] == ["Sampled", "Always logged"]
+    assert caplog.records[0].extra_fields["sample_rate"] == 0.2
+
+
+class Status(Enum):
+    DRAFT = "draft"
+
+
+def test_json_formatter():
+    entity_id = uuid4()
+    record = make_record("Document updated")
+    record.request_id = "request"
+    record.extra_fields = {
+        "id": entity_id,
+        "status": Status.DRAFT,
+        "created_at": datetime.datetime(2025, 1, 2, 3, 4, 5),
+        "price": Decimal("1.5"),
+        "versions": {entity_id: [1, 2]},
+        "unknown": object,
+    }
+
+    log_entry = json.loads(JSONFormatter("documents").format(record))
+
+    assert log_entry["service"] == "documents"
+    assert log_entry["host"]
+    assert log_entry["message"] == "Document updated"
+    assert log_entry["request_id"] == "request"
+    assert log_entry["id"] == str(entity_id)
+    assert log_entry["status"] == "draft"
+    assert log_entry["created_at"] == "2025-01-02T03:04:05"
+    assert log_entry["price"] == 1.5
+    assert log_entry["versions"] == {str(entity_id): [1, 2]}
+    assert log_entry["unknown"] == str(object)
+
+
+@pytest.mark.parametrize(
+    "extra_fields",
+    [
+        {"service": "worker"},
+        {"size": 2 ** 70},
+    ],
+)
+def test_json_formatter_fallback(extra_fields):
+    record = make_record("Fallback")
+    record.extra_fields = extra_fields
+
+    log_entry = json.loads(JSONFormatter("documents").format(record))
+
+    assert log_entry["message"] == "Fallback"
+    assert {key: log_entry[key] for key in extra_fields} == extra_fields
@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from documents.src.config.settings import settings
+from documents.src.domain.s3 import S3_MAX_PARTS, S3_MIN_PART_SIZE, get_part_size
+from documents.src.exceptions import FileNotExistError
+from documents.src.service.cleanup import MultipartUploadsCleaner
+from documents.tests.fixtures.s3 import FakeS3
+
+
+@pytest.mark.parametrize(
+    "file_size, part_size, expected",
+    [
+        (100, None, settings.s3_multipart_part_size),
+        (100, 1, S3_MIN_PART_SIZE),
+        (S3_MAX_PARTS * S3_MIN_PART_SIZE * 10, S3_MIN_PART_SIZE, S3_MIN_PART_SIZE * 10),
+    ]
+)
+def test_part_size(file_size, part_size, expected):
+    assert get_part_size(file_size, part_size) == expected
+
+
+async def test_multipart_upload_of_missing_document(fake_documents_service):
+    with pytest.raises(FileNotExistError):
+        await fake_documents_service.create_multipart_upload(uuid.uuid4(), file_size=100)
+
+
+async def test_stale_uploads_cleanup():
+    s3 = FakeS3()
+    stale_upload_id = await s3.create_multipart_upload("stale")
+    path, _, parts = s3.uploads[stale_upload_id]
+    s3.uploads[stale_upload_id] = (path, datetime.now(timezone.utc) - timedelta(hours=2), parts)
+    await s3.create_multipart_upload("active")
+
+    cleaner = MultipartUploadsCleaner(lambda: s3, ttl=60 * 60, interval=0)
+    aborted = await cleaner.clean()
+
+    assert aborted == 1
+    assert stale_upload_id not in s3.uploads
+    assert len(s3.uploads) == 1
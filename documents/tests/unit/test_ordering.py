@@ -0,0 +1,75 @@
+import asyncio
+
+from documents.src.adapters.broker.ordering import KeyedLock
+
+
+async def test_same_key_is_processed_in_order():
+    locks = KeyedLock()
+    processed = []
+
+    async def handle(key: str, n: int):
+        async with locks(key):
+            await asyncio.sleep(0.01 if n == 0 else 0)
+            processed.append((key, n))
+
+    await asyncio.gather(*(handle(key, n) for n in range(3) for key in ("first", "second")))
+
+    assert [n for key, n in processed if key == "first"] == [0, 1, 2]
+    assert [n for key, n in processed if key == "second"] == [0, 1, 2]
+    assert len(locks) == 0
+
+
+async def test_different_keys_run_concurrently():
+    locks = KeyedLock()
+    in_flight = max_in_flight = 0
+
+    async def handle(key: int):
+        nonlocal in_flight, max_in_flight
+        async with locks(key):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(handle(key) for key in range(5)))
+
+    assert max_in_flight == 5
+
+
+async def test_many_keys_are_locked_without_deadlock():
+    locks = KeyedLock()
+    processed = []
+
+    async def handle(*keys: str):
+        async with locks(*keys):
+            await asyncio.sleep(0.01)
+            processed.append(keys)
+
+    await asyncio.wait_for(asyncio.gather(handle("a", "b", "a"), handle("b", "a"), handle("b")), timeout=1)
+
+    assert processed == [("a", "b", "a"), ("b", "a"), ("b",)]
+    assert len(locks) == 0
+
+
+async def test_cancelled_waiter_keeps_order():
+    locks = KeyedLock()
+    processed = []
+    first_started = asyncio.Event()
+
+    async def handle(n: int):
+        async with locks("key"):
+            first_started.set()
+            await asyncio.sleep(0.02 if n == 0 else 0)
+            processed.append(n)
+
+    first = asyncio.create_task(handle(0))
+    await first_started.wait()
+    cancelled = asyncio.create_task(handle(1))
+    last = asyncio.create_task(handle(2))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    await asyncio.gather(first, last)
+
+    assert processed == [0, 2]
+    assert len(locks) == 0
@@ -0,0 +1,113 @@
+import datetime
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from documents.src.adapters.repositories.documents import DocumentsRepository
+from documents.src.config.settings import settings
+from documents.src.domain.document import DocumentsSearch
+from documents.src.domain.pagination import Cursor, NEXT_CURSOR_HEADER, get_page_size, page_response
+from documents.tests.fixtures.uow import FakeUnitOfWork
+
+
+class QueryCapturingSession:
+    """ Fake DB session which keeps executed queries instead of running them. """
+
+    def __init__(self):
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []))
+
+
+def compile_query(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def make_page(size: int) -> list[SimpleNamespace]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        SimpleNamespace(id=uuid.uuid4(), created_at=now - datetime.timedelta(seconds=i))
+        for i in range(size)
+    ]
+
+
+def test_cursor_encoding():
+    cursor = Cursor(created_at=datetime.datetime.now(datetime.timezone.utc), id=uuid.uuid4())
+
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "eyJpZCI6IDF9"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        Cursor.decode(cursor)
+
+    with pytest.raises(ValueError):
+        DocumentsSearch(cursor=cursor)
+
+
+def test_page_size_is_limited():
+    assert get_page_size(None) == settings.max_page_size
+    assert get_page_size(10) == 10
+    assert get_page_size(settings.max_page_size + 1) == settings.max_page_size
+
+
+def test_next_cursor_points_to_last_entity():
+    page = make_page(10)
+
+    cursor = Cursor.after(page, limit=10)
+
+    assert cursor == Cursor(created_at=page[-1].created_at, id=page[-1].id)
+
+
+@pytest.mark.parametrize("page_size", [0, 9])
+def test_no_next_cursor_on_last_page(page_size):
+    assert Cursor.after(make_page(page_size), limit=10) is None
+
+
+async def test_first_page_query():
+    session = QueryCapturingSession()
+    repo = DocumentsRepository(FakeUnitOfWork(session=session))
+
+    await repo.list(limit=10, section_id=uuid.uuid4())
+    sql = compile_query(session.queries[0])
+
+    assert "ORDER BY documents.created_at DESC, documents.id DESC" in sql
+    assert "LIMIT" in sql
+    assert "(documents.created_at, documents.id) <" not in sql
+
+
+async def test_next_page_query():
+    session = QueryCapturingSession()
+    repo = DocumentsRepository(FakeUnitOfWork(session=session))
+    cursor = Cursor(created_at=datetime.datetime.now(datetime.timezone.utc), id=uuid.uuid4())
+
+    await repo.list(limit=10, cursor=cursor.encode())
+    query = session.queries[0]
+
+    assert "(documents.created_at, documents.id) <" in compile_query(query)
+    assert query._limit == 10
+
+
+async def test_unlimited_request_is_limited_by_server():
+    session = QueryCapturingSession()
+    repo = DocumentsRepository(FakeUnitOfWork(session=session))
+
+    await repo.list(limit=settings.max_page_size * 10)
+
+    assert session.queries[0]._limit == settings.max_page_size
+
+
+def test_page_response():
+    cursor = Cursor(created_at=datetime.datetime.now(datetime.timezone.utc), id=uuid.uuid4())
+
+    response = page_response(b"[]", cursor)
+
+    assert response.body == b"[]"
+    assert response.media_type == "application/json"
+    assert response.headers[NEXT_CURSOR_HEADER] == cursor.encode()
+    assert NEXT_CURSOR_HEADER not in page_response(b"[]", None).headers
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from faststream import ContextRepo
+
+from documents.src import middleware
+from documents.src.middleware import RetryMiddleware
+
+DELAY = 0.2
+MESSAGES = 50
+
+
+class FakeJetStream:
+    """
+    Queue of JetStream consumer: nak'ed messages are redelivered after their delay,
+    rejected ones are dropped.
+    """
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.dlq = []
+
+    def deliver(self, message: "FakeMessage") -> None:
+        message.num_delivered += 1
+        self.queue.put_nowait(message)
+
+    def redeliver(self, message: "FakeMessage", delay: float) -> None:
+        asyncio.get_running_loop().call_later(delay, self.deliver, message)
+
+    async def publish(self, message, subject, stream):
+        self.dlq.append((subject, message))
+
+
+class FakeMessage:
+    """ StreamMessage of JetStream message which is nak'ed to the fake JetStream. """
+
+    def __init__(self, jetstream: FakeJetStream, body: str):
+        self.jetstream = jetstream
+        self.body = body
+        self.num_delivered = 0
+        self.headers = {}
+        self.message_id = self.correlation_id = body
+
+    @property
+    def raw_message(self):
+        return SimpleNamespace(
+            subject="cmd.documents.Sync",
+            headers=self.headers,
+            metadata=SimpleNamespace(num_delivered=self.num_delivered),
+        )
+
+    async def decode(self):
+        return self.body
+
+    async def nack(self, delay=None):
+        self.jetstream.redeliver(self, delay)
+
+    async def reject(self):
+        pass
+
+
+async def consume(jetstream: FakeJetStream, expected: int) -> dict[str, float]:
+    """ Single consumer slot, returns processing time of the good messages. """
+
+    context = ContextRepo()
+    context.set_global("broker", jetstream)
+    finished = {}
+    start = time.perf_counter()
+
+    async def handler(message: FakeMessage):
+        if message.body == "poison":
+            raise ValueError("Poison message")
+        await asyncio.sleep(0.001)
+        finished[message.body] = time.perf_counter() - start
+
+    while len(finished) + len(jetstream.dlq) < expected:
+        message = await jetstream.queue.get()
+        try:
+            await RetryMiddleware(message, context=context).consume_scope(handler, message)
+        except ValueError:
+            pass
+
+    return finished
+
+
+@pytest.fixture(autouse=True)
+def retry_policy(monkeypatch):
+    monkeypatch.setattr(middleware.settings, "debug", 0)
+    monkeypatch.setattr(middleware.settings, "is_test", 0)
+    monkeypatch.setattr(middleware.settings, "local", 0)
+    monkeypatch.setattr(RetryMiddleware, "max_retries", 3)
+    monkeypatch.setattr(RetryMiddleware, "delays", (DELAY, DELAY))
+
+
+async def test_poison_message_does_not_block_consumer():
+    clean, poisoned = FakeJetStream(), FakeJetStream()
+    poisoned.deliver(FakeMessage(poisoned, "poison"))
+    for n in range(MESSAGES):
+        clean.deliver(FakeMessage(clean, str(n)))
+        poisoned.deliver(FakeMessage(poisoned, str(n)))
+
+    clean_finished = await consume(clean, expected=MESSAGES)
+    poisoned_finished = await consume(poisoned, expected=MESSAGES + 1)
+
+    # good messages are processed before the first redelivery of the poison message
+    assert max(poisoned_finished.values()) < DELAY
+    # throughput is about the same as without poison message
+    assert max(poisoned_finished.values()) < max(clean_finished.values()) * 1.5 + 0.05
+    assert [subject for subject, _ in poisoned.dlq] == ["dlq.cmd.documents.Sync"]
+    assert poisoned.dlq[0][1]["attempts"] == 3
+
+
+async def test_message_is_retried_with_delay():
+    jetstream = FakeJetStream()
+    message = FakeMessage(jetstream, "poison")
+    jetstream.deliver(message)
+
+    start = time.perf_counter()
+    await consume(jetstream, expected=1)
+
+    assert message.num_delivered == 3
+    assert time.perf_counter() - start >= 2 * DELAY
@@ -0,0 +1,101 @@
+import asyncio
+import base64
+import hashlib
+
+import pytest
+
+from documents.src.adapters import s3
+from documents.src.adapters.s3 import PresignedUrlCache, S3, S3Client
+
+
+class FakeClientContext:
+    """ Client context of aioboto3 session counting created and closed clients. """
+
+    opened = 0
+    closed = 0
+
+    async def __aenter__(self):
+        await asyncio.sleep(0)
+        FakeClientContext.opened += 1
+        return object()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        FakeClientContext.closed += 1
+
+
+@pytest.fixture
+def client(monkeypatch) -> S3Client:
+    FakeClientContext.opened = FakeClientContext.closed = 0
+    client = S3Client()
+    monkeypatch.setattr(s3, "get_s3_session_context", FakeClientContext)
+    monkeypatch.setattr(s3, "s3_client", client)
+    return client
+
+
+async def test_client_is_shared(client):
+    clients = await asyncio.gather(*(client.get() for _ in range(10)))
+
+    async with S3() as first, S3() as second:
+        assert first._client is second._client is clients[0]
+
+    assert len(set(map(id, clients))) == 1
+    assert FakeClientContext.opened == 1
+    assert FakeClientContext.closed == 0
+
+
+async def test_client_close(client):
+    first = await client.get()
+    await client.close()
+    await client.close()
+
+    assert FakeClientContext.closed == 1
+    assert await client.get() is not first
+    assert FakeClientContext.opened == 2
+
+
+def test_presigned_url_cache(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(s3.time, "time", lambda: now)
+    cache = PresignedUrlCache(ttl=60, max_size=2)
+
+    for path in ("first", "second", "third"):
+        cache.set(path, f"url-{path}")
+
+    assert cache.get("first") is None  # evicted by size
+    assert cache.get("third") == "url-third"
+
+    now += 60
+    assert cache.get("third") is None  # next expiry bucket
+
+
+async def test_download_url_is_signed_locally(monkeypatch):
+    # shared client with unreachable endpoint, any S3 request would fail
+    monkeypatch.setattr(s3, "s3_client", S3Client())
+    monkeypatch.setattr(S3, "download_urls", PresignedUrlCache(ttl=60, max_size=10))
+
+    async with S3() as storage:
+        url = await storage.get_download_url("document")
+        cached_url = await storage.get_download_url("document")
+        another_url = await storage.get_download_url("another-document")
+
+    await s3.s3_client.close()
+
+    assert url == cached_url
+    assert "Signature=" in url
+    assert another_url != url
+
+
+async def test_upload_url_is_signed_with_md5(monkeypatch):
+    monkeypatch.setattr(s3, "s3_client", S3Client())
+    md5 = hashlib.md5(b"file content").hexdigest()
+
+    async with S3() as storage:
+        url = await storage.get_upload_url("document", md5=md5)
+        unsigned_url = await storage.get_upload_url("document")
+
+    await s3.s3_client.close()
+
+    assert "content-md5" in url
+    assert "content-md5" not in unsigned_url
+    assert storage.get_upload_headers(md5) == {"Content-MD5": base64.b64encode(bytes.fromhex(md5)).decode()}
+    assert storage.get_upload_headers(None) == {}
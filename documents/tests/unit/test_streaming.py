@@ -0,0 +1,36 @@
+import json
+import uuid
+
+from documents.src.domain.document import DocumentIn
+from documents.src.entrypoints.streaming import encode_ndjson
+from documents.tests.fixtures.factories import create_document_in_data
+
+
+async def test_stream_documents(fake_documents_service):
+    section_id = uuid.uuid4()
+    for _ in range(3):
+        await fake_documents_service.create(
+            DocumentIn(**create_document_in_data(section_id=section_id))
+        )
+    await fake_documents_service.create(DocumentIn(**create_document_in_data()))
+
+    documents = [
+        d async for d in fake_documents_service.stream(section_id=section_id)
+    ]
+
+    assert len(documents) == 3
+    assert all(d.section_id == section_id for d in documents)
+
+
+async def test_encode_ndjson(fake_documents_service):
+    for _ in range(5):
+        await fake_documents_service.create(DocumentIn(**create_document_in_data()))
+
+    chunks = [
+        chunk async for chunk in encode_ndjson(fake_documents_service.stream(), chunk_size=2)
+    ]
+    lines = b"".join(chunks).decode().splitlines()
+
+    assert len(chunks) == 3
+    assert len(lines) == 5
+    assert all(json.loads(line)["id"] for line in lines)
@@ -0,0 +1,130 @@
+from contextlib import asynccontextmanager
+from functools import partial
+
+import pytest
+
+from documents.src.service.uow import ReplicaState, ReplicaUnitOfWork, UnitOfWork
+
+
+class FakeSession:
+    """ AsyncSession replacement which may fail to connect. """
+
+    def __init__(self, name: str, connection_error: Exception | None = None):
+        self.name = name
+        self.connection_error = connection_error
+        self.calls = []
+
+    @property
+    def closed(self) -> bool:
+        return "close" in self.calls
+
+    async def connection(self, **kwargs):
+        if self.connection_error:
+            raise self.connection_error
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+    async def close(self):
+        self.calls.append("close")
+
+
+class FakeSessionFactory:
+    def __init__(self, name: str, connection_error: Exception | None = None):
+        self.name = name
+        self.connection_error = connection_error
+        self.sessions = []
+
+    def __call__(self) -> FakeSession:
+        session = FakeSession(self.name, self.connection_error)
+        self.sessions.append(session)
+        return session
+
+
+@pytest.fixture
+def primary() -> FakeSessionFactory:
+    return FakeSessionFactory("primary")
+
+
+async def test_read_write_uow_is_committed(primary):
+    async with UnitOfWork(primary):
+        ...
+
+    assert primary.sessions[0].calls == ["commit", "rollback", "close"]
+
+
+async def test_read_only_uow_is_only_closed(primary):
+    async with UnitOfWork(primary, read_only=True):
+        ...
+
+    assert primary.sessions[0].calls == ["close"]
+
+
+async def test_replica_is_used(primary):
+    uow = ReplicaUnitOfWork(primary, FakeSessionFactory("replica"), ReplicaState(retry_interval=30))
+
+    async with uow:
+        assert uow.session.name == "replica"
+
+
+async def test_primary_is_used_without_replica(primary):
+    uow = ReplicaUnitOfWork(primary, None, ReplicaState(retry_interval=30))
+
+    async with uow:
+        assert uow.session.name == "primary"
+
+
+async def test_fallback_to_primary(primary):
+    replica = FakeSessionFactory("replica", connection_error=ConnectionRefusedError())
+    state = ReplicaState(retry_interval=30)
+
+    async with ReplicaUnitOfWork(primary, replica, state) as uow:
+        assert uow.session.name == "primary"
+    async with ReplicaUnitOfWork(primary, replica, state) as uow:
+        assert uow.session.name == "primary"
+
+    assert not state.available
+    assert len(replica.sessions) == 1  # unavailable replica isn't retried until retry_interval passes
+    assert replica.sessions[0].closed
+
+
+async def test_replica_is_retried():
+    replica = FakeSessionFactory("replica", connection_error=ConnectionRefusedError())
+    state = ReplicaState(retry_interval=0)
+
+    async with ReplicaUnitOfWork(FakeSessionFactory("primary"), replica, state):
+        ...
+    replica.connection_error = None
+    async with ReplicaUnitOfWork(FakeSessionFactory("primary"), replica, state) as uow:
+        assert uow.session.name == "replica"
+
+
+async def test_after_commit_callbacks(primary):
+    calls = []
+
+    async def callback(name: str):
+        calls.append(name)
+
+    async with UnitOfWork(primary) as uow:
+        uow.after_commit(partial(callback, "committed"))
+        with pytest.raises(ValueError):
+            async with uow.savepoint():
+                uow.after_commit(partial(callback, "rolled back savepoint"))
+                raise ValueError
+        assert calls == []
+
+    assert calls == ["committed"]
+
+    with pytest.raises(ValueError):
+        async with UnitOfWork(primary) as uow:
+            uow.after_commit(partial(callback, "rolled back"))
+            raise ValueError
+
+    assert calls == ["committed"]
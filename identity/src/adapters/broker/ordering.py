@@ -0,0 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+
+
+class KeyedLock:
+    """
+    Lock per key for handlers of concurrent subscribers.
+
+    Messages with the same key are processed one by one in the order they reached the handler,
+    messages with different keys run concurrently. Every holder waits only for the previous holders of its keys,
+    keys of a holder are taken at once, so holders with many keys can't deadlock.
+
+    Ordering is best effort and holds within one process only:
+    - messages are ordered by the time their handlers reach the lock, not by publish order,
+      redelivered message is handled after the ones which arrived in between;
+    - queue group spreads messages of the same key over all workers, other processes don't see this lock;
+    - lock is released before unit of work is committed, commits of holders are ordered only by
+      DB row locks taken by their statements while they held the lock.
+    Don't rely on it where command order matters across workers.
+    """
+
+    def __init__(self):
+        # future of the last holder of a key, it's done when the holder releases its keys
+        self._tails: dict[Hashable, asyncio.Future] = {}
+
+    @asynccontextmanager
+    async def __call__(self, *keys: Hashable) -> AsyncIterator[None]:
+        unique_keys = set(keys)
+        previous = {self._tails[key] for key in unique_keys if key in self._tails}
+        released = asyncio.get_running_loop().create_future()
+        released.add_done_callback(lambda _: self._drop(unique_keys, released))
+        for key in unique_keys:
+            self._tails[key] = released
+
+        try:
+            if previous:
+                await asyncio.wait(previous)
+            yield
+        finally:
+            if all(future.done() for future in previous):
+                released.set_result(None)
+            else:
+                # cancelled while waiting, next holders still have to wait for the previous ones
+                asyncio.gather(*previous).add_done_callback(lambda _: released.set_result(None))
+
+    def _drop(self, keys: set[Hashable], released: asyncio.Future) -> None:
+        for key in keys:
+            if self._tails.get(key) is released:
+                del self._tails[key]
+
+    def __len__(self) -> int:
+        return len(self._tails)
@@ -1,8 +1,14 @@
 import abc
-from typing import Protocol
+import asyncio
+import json
+import time
+from typing import Protocol, Callable, Awaitable
 
+from jwcrypto import jwk
+from jwcrypto.common import JWKeyNotFound
 from keycloak import KeycloakOpenID
 
+from identity.src.config.logging import logger
 from identity.src.config.settings import settings
 
 
@@ -10,6 +16,62 @@ class KeycloakClientProtocol(Protocol):
     async def a_introspect(self, token: str) -> dict:
         ...
 
+    async def a_certs(self) -> dict:
+        ...
+
+    async def a_decode_token(self, token: str, validate: bool = True, **kwargs) -> dict:
+        ...
+
+
+class JWKSCache:
+    """
+    Process wide cache of realm public keys (JWKS).
+
+    Keys are refreshed when they are older than refresh_interval
+    or on demand when token is signed with unknown key (keys rotation).
+    On demand refreshes are limited by min_refresh_interval,
+    so tokens with fake key ids can't flood keycloak with requests.
+    """
+
+    def __init__(self, refresh_interval: float, min_refresh_interval: float = 10.0):
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: jwk.JWKSet | None = None
+        self._fetched_at: float = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(
+            self,
+            fetch: Callable[[], Awaitable[dict]],
+            force: bool = False,
+    ) -> jwk.JWKSet:
+        """ Get cached keys, fetch them with fetch callable if needed. """
+
+        if not self._need_refresh(force):
+            return self._keys
+
+        async with self._lock:
+            # keys could be refreshed by concurrent call while waiting for lock
+            if self._need_refresh(force):
+                jwks = await fetch()
+                self._keys = jwk.JWKSet.from_json(json.dumps(jwks))
+                self._fetched_at = time.monotonic()
+                logger.info("Keycloak JWKS refreshed")
+
+        return self._keys
+
+    def _need_refresh(self, force: bool) -> bool:
+        if self._keys is None:
+            return True
+
+        age = time.monotonic() - self._fetched_at
+        if force:
+            return age >= self.min_refresh_interval
+        return age >= self.refresh_interval
+
+
+jwks_cache = JWKSCache(refresh_interval=settings.kc_jwks_refresh_interval)
+
 
 class AbstractKeycloak(abc.ABC):
 
@@ -20,12 +82,17 @@ class AbstractKeycloak(abc.ABC):
     async def introspect(self, token) -> dict:
         ...
 
+    @abc.abstractmethod
+    async def decode_token(self, token) -> dict:
+        ...
+
     @abc.abstractmethod
     def _get_client(self) -> KeycloakClientProtocol:
         ...
 
 
 class Keycloak(AbstractKeycloak):
+    jwks: JWKSCache = jwks_cache
 
     def _get_client(self):
         return KeycloakOpenID(
@@ -38,3 +105,28 @@ class Keycloak(AbstractKeycloak):
 
     async def introspect(self, token) -> dict:
         return await self.client.a_introspect(token)
+
+    async def decode_token(self, token) -> dict:
+        """
+        Verify token locally and return its claims.
+
+        Signature is checked by cached realm public keys,
+        "exp" and "aud" claims are validated.
+        Raises jwcrypto.common.JWException subclasses on invalid token.
+        """
+
+        keys = await self.jwks.get(self.client.a_certs)
+        try:
+            return await self._decode_token(token, keys)
+        except JWKeyNotFound:
+            # token may be signed with rotated key
+            keys = await self.jwks.get(self.client.a_certs, force=True)
+            return await self._decode_token(token, keys)
+
+    async def _decode_token(self, token: str, keys: jwk.JWKSet) -> dict:
+        return await self.client.a_decode_token(
+            token,
+            key=keys,
+            check_claims={"exp": None, "aud": settings.kc_audience},
+            expected_type="JWS",
+        )
@@ -1,6 +1,7 @@
 from identity.src.adapters.orm import OrmUser
 from identity.src.adapters.repositories.base import GenericRepository, IUsersRepository
 from identity.src.config.logging import logger
+from identity.src.config.settings import settings
 from identity.src.domain.user import UserBase
 
 
@@ -13,7 +14,8 @@ class UsersRepository(
     async def create(self, user: UserBase) -> OrmUser:
         logger.info(
             f"Adding new OrmUser with id {user.id}...",
-            extra=user.model_dump()
+            extra=user.model_dump,
+            sample_rate=settings.log_sample_rate,
         )
 
         # difference here
@@ -24,6 +26,7 @@ class UsersRepository(
 
         logger.info(
             f"New user {user.id} added to DB",
-            extra=db_user.to_dict()
+            extra=db_user.to_dict,
+            sample_rate=settings.log_sample_rate,
         )
         return db_user
@@ -15,20 +15,64 @@ class Settings(BaseSettings):
     debug: int = os.getenv("DEBUG", 0)
     local: int = os.getenv("LOCAL", 0)
     is_test: int = os.getenv("IS_TEST", 0)
+    # records below log_level are discarded before their payloads are built
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    # share of high-volume INFO events (requests, consumed messages, repository writes) which are logged
+    log_sample_rate: float = os.getenv("LOG_SAMPLE_RATE", 1.0)
+    # log records are written by a background thread, records logged while its queue is full
+    # are handled by log_drop_policy: "new" drops them, "old" drops the oldest queued records, "block" waits
+    log_queue_size: int = os.getenv("LOG_QUEUE_SIZE", 10_000)
+    log_drop_policy: str = os.getenv("LOG_DROP_POLICY", "new")
     service_host: str = os.getenv("SERVICE_HOST")
     read_service_port: int = os.getenv("READ_SERVICE_PORT")
+    # server side limit of list endpoints page size
+    max_page_size: int = os.getenv("MAX_PAGE_SIZE", 1000)
     db_database: SecretStr = os.getenv("POSTGRES_DB")
     db_username: SecretStr = os.getenv("POSTGRES_USER")
     db_password: SecretStr = os.getenv("POSTGRES_PASSWORD")
     db_host: SecretStr = os.getenv("DB_HOST")
     db_port: SecretStr = os.getenv("DB_PORT")
+    # streaming replica used by read app (with the same credentials as primary),
+    # read app uses primary DB if replica host isn't set
+    db_replica_host: SecretStr | None = os.getenv("DB_REPLICA_HOST")
+    db_replica_port: SecretStr | None = os.getenv("DB_REPLICA_PORT")
+    # seconds while primary DB is used after replica failed to give a connection
+    db_replica_retry_interval: float = os.getenv("DB_REPLICA_RETRY_INTERVAL", 30.0)
+    # pool of async engine, read and write apps are separate processes with their own pools,
+    # write app needs a connection per concurrent handler, see nats_max_workers
+    db_pool_size: int = os.getenv("DB_POOL_SIZE", 5)
+    db_max_overflow: int = os.getenv("DB_MAX_OVERFLOW", 10)
+    db_pool_timeout: float = os.getenv("DB_POOL_TIMEOUT", 30.0)
+    db_pool_recycle: int = os.getenv("DB_POOL_RECYCLE", 1800)
+    db_pool_pre_ping: int = os.getenv("DB_POOL_PRE_PING", 1)
+    # asyncpg prepared statements cache per connection, set to 0 behind pgbouncer in transaction mode
+    db_statement_cache_size: int = os.getenv("DB_STATEMENT_CACHE_SIZE", 100)
+    db_application_name: str = os.getenv("DB_APPLICATION_NAME", "identity")
+    # milliseconds, 0 disables timeout
+    db_statement_timeout: int = os.getenv("DB_STATEMENT_TIMEOUT", 30_000)
+    # seconds, set db_pool_metrics_interval to 0 to disable periodic pool metrics logging
+    db_pool_metrics_interval: float = os.getenv("DB_POOL_METRICS_INTERVAL", 60.0)
+    db_pool_slow_checkout: float = os.getenv("DB_POOL_SLOW_CHECKOUT", 1.0)
 
     nats_url: str = os.getenv("NATS_URL")
+    # messages processed concurrently by each subscriber of write app process, they share its DB pool:
+    # nats_max_workers * amount of subscribers should fit db_pool_size + db_max_overflow,
+    # otherwise handlers wait for connections instead of adding throughput (checked on write app startup)
+    nats_max_workers: int = os.getenv("NATS_MAX_WORKERS", 5)
+    # not acked messages of each consumer, it limits in-flight messages of all write app processes together
+    nats_max_ack_pending: int = os.getenv("NATS_MAX_ACK_PENDING", 100)
     kc_external_base_url: str = os.getenv("KC_EXTERNAL_BASE_URL")
     kc_internal_base_url: str = os.getenv("KC_INTERNAL_BASE_URL")
     kc_realm: str = os.getenv("KC_REALM")
     kc_client_id: str = os.getenv("KC_CLIENT_ID")
     kc_client_secret: SecretStr = os.getenv("KC_CLIENT_SECRET")
+    # tokens are verified locally with realm public keys (JWKS) by default,
+    # set KC_LOCAL_VERIFICATION=0 to introspect every token by keycloak
+    kc_local_verification: int = os.getenv("KC_LOCAL_VERIFICATION", 1)
+    # additionally introspect locally verified tokens to reject revoked ones
+    kc_check_revoked: int = os.getenv("KC_CHECK_REVOKED", 0)
+    kc_audience: str = os.getenv("KC_AUDIENCE", "account")
+    kc_jwks_refresh_interval: float = os.getenv("KC_JWKS_REFRESH_INTERVAL", 300.0)
 
     login_redirect_url: str = os.getenv("LOGIN_REDIRECT_URL")
 
@@ -64,13 +108,23 @@ class Settings(BaseSettings):
     def sync_db_url(self):
         return self._get_db_url(sync=True)
 
-    def _get_db_url(self, sync=False):
+    @property
+    def replica_async_db_url(self) -> str | None:
+        if not self.db_replica_host:
+            return None
+        return self._get_db_url(
+            sync=False,
+            host=self.db_replica_host,
+            port=self.db_replica_port or self.db_port,
+        )
+
+    def _get_db_url(self, sync=False, host: SecretStr = None, port: SecretStr = None):
         return (
             f"postgresql{'' if sync else '+asyncpg'}://"
             f"{self.db_username.get_secret_value()}:"
             f"{self.db_password.get_secret_value()}@"
-            f"{self.db_host.get_secret_value()}:"
-            f"{self.db_port.get_secret_value()}/"
+            f"{(host or self.db_host).get_secret_value()}:"
+            f"{(port or self.db_port).get_secret_value()}/"
             f"{self.db_database.get_secret_value()}"
         )
 
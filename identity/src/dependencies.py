@@ -49,7 +49,7 @@ async def get_authenticated_user(
     Dependency to get current user from Keycloak token
     """
     try:
-        token_info = await auth_service.introspect(token)
+        token_info = await auth_service.verify(token)
         if not token_info.get("active"):
             raise HTTPException(
                 status_code=401,
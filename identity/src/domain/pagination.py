@@ -0,0 +1,73 @@
+import base64
+from datetime import datetime
+from typing import Annotated, Sequence
+from uuid import UUID
+
+from fastapi import Response
+from pydantic import BaseModel, Field, AfterValidator
+
+from identity.src.config.settings import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Cursor(BaseModel):
+    """
+    Keyset pagination cursor.
+
+    Points to the last entity of the previous page by its (created_at, id) sort key.
+    Clients get it from X-Next-Cursor response header and pass it back as is.
+    """
+
+    created_at: datetime
+    id: UUID
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "Cursor":
+        """ Decode cursor string. Raises ValueError if it's malformed. """
+
+        try:
+            padded_cursor = cursor + "=" * (-len(cursor) % 4)
+            return cls.model_validate_json(base64.urlsafe_b64decode(padded_cursor))
+        except ValueError:
+            raise ValueError("Invalid cursor")
+
+    @classmethod
+    def after(cls, page: Sequence, limit: int | None) -> "Cursor | None":
+        """ Cursor of the page next to specified one or None if it's the last page. """
+
+        if not page or len(page) < get_page_size(limit):
+            return None
+        return cls(created_at=page[-1].created_at, id=page[-1].id)
+
+
+def get_page_size(limit: int | None) -> int:
+    """ Requested page size limited by server side maximum. """
+    return min(limit or settings.max_page_size, settings.max_page_size)
+
+
+def validate_cursor(cursor: str | None) -> str | None:
+    if cursor is not None:
+        Cursor.decode(cursor)
+    return cursor
+
+
+class PaginationParams(BaseModel):
+    """ Keyset pagination params of list endpoints. """
+
+    limit: int | None = Field(default=None, ge=1)
+    cursor: Annotated[str | None, AfterValidator(validate_cursor)] = None
+
+
+def page_response(content: bytes, next_cursor: Cursor | None) -> Response:
+    """
+    JSON response of already serialized page.
+
+    Returned as is, so FastAPI doesn't validate and serialize page again by response_model.
+    """
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor.encode()} if next_cursor else None
+    return Response(content, media_type="application/json", headers=headers)
@@ -6,6 +6,7 @@ from pydantic import BaseModel, ConfigDict
 from identity.src.domain.company import Company
 from identity.src.domain.base import BaseValidationMixin
 from identity.src.enums import UserProjectRole
+from identity.src.domain.pagination import PaginationParams
 
 
 class UserBase(BaseModel):
@@ -33,7 +34,7 @@ class User(AuthenticatedUser):
     updated_at: datetime | None
 
 
-class UsersSearch(BaseModel):
+class UsersSearch(PaginationParams):
     email: str | None = None
     first_name: str | None = None
     last_name: str | None = None
@@ -56,7 +56,7 @@ async def get_user(
     Use flow:
     - frontend calls protected client service endpoint using bearer header;
     - client service (or any) calls identity/auth/get-user through its own dependency;
-    - get_authenticated_user dependency calls keycloak through OAuth and get users id and roles;
+    - get_authenticated_user dependency verifies token by cached keycloak public keys and get users id and roles;
     - auth service calls db to collect all users data;
     - get_user make User object and return it back to client service;
     - client service do its job and return result to frontend.
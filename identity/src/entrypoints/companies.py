@@ -2,15 +2,18 @@ from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from faststream.nats import NatsRouter
 from nats.js.api import ConsumerConfig
 
 from identity.src.adapters.broker import streams
 from identity.src.adapters.broker.cmd import CompanyCmd
 from identity.src.adapters.broker.events import CompanyEvents
+from identity.src.adapters.broker.ordering import KeyedLock
+from identity.src.config.settings import settings
 from identity.src.domain.base import EntityDeletedEvent
 from identity.src.domain.company import Company, CompanyBase, CompaniesSearch, CompaniesUpdateCmd
+from identity.src.domain.pagination import Cursor, page_response
 from identity.src.service.company import CompaniesService
 
 broker_router = NatsRouter()
@@ -19,12 +22,19 @@ api_router = APIRouter(tags=["Companies"], route_class=DishkaRoute)
 company_commands = CompanyCmd(service_name="identity", entity_name="Company")
 company_events = CompanyEvents(service_name="identity", entity_name="Company")
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+
 
 @broker_router.subscriber(
     company_commands.create,
     stream=streams.cmd,
     queue="companies-create-workers",
-    config=ConsumerConfig(durable_name="companies-create")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="companies-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(company_events.created, stream=streams.events)
 async def create_company(
@@ -53,19 +63,24 @@ async def get_company(
 async def get_companies_list(
         companies_service: FromDishka[CompaniesService],
         data: CompaniesSearch = Depends(),
-) -> list[Company]:
+) -> Response:
     """Get all companies by provided fields."""
 
-    return await companies_service.list(
+    companies = await companies_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(companies_service.dump_json(companies), Cursor.after(companies, data.limit))
 
 
 @broker_router.subscriber(
     company_commands.update,
     stream=streams.cmd,
     queue="companies-update-workers",
-    config=ConsumerConfig(durable_name="companies-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="companies-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(company_events.updated, stream=streams.events)
 async def update_company(
@@ -74,21 +89,26 @@ async def update_company(
 ) -> Company:
     """ Update specified companies. """
 
-    company = await companies_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
-    )
-    if not company:
-        raise Exception("Failed to update non-existent company")
+    async with update_locks(update_data.id):
+        company = await companies_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        if not company:
+            raise Exception("Failed to update non-existent company")
 
-    return company
+        return company
 
 
 @broker_router.subscriber(
     company_commands.delete,
     stream=streams.cmd,
     queue="companies-delete-workers",
-    config=ConsumerConfig(durable_name="companies-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="companies-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(company_events.deleted, stream=streams.events)
 async def delete_company(
@@ -2,15 +2,18 @@ from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from faststream.nats import NatsRouter
 from nats.js.api import ConsumerConfig
 
 from identity.src.adapters.broker import streams
 from identity.src.adapters.broker.cmd import UserCmd
 from identity.src.adapters.broker.events import UserEvents
+from identity.src.adapters.broker.ordering import KeyedLock
+from identity.src.config.settings import settings
 from identity.src.domain.base import EntityDeletedEvent
 from identity.src.domain.user import User, UsersSearch, UserUpdateCmd
+from identity.src.domain.pagination import Cursor, page_response
 from identity.src.service.user import UserService
 
 broker_router = NatsRouter()
@@ -19,6 +22,9 @@ api_router = APIRouter(tags=["Users"], route_class=DishkaRoute)
 user_commands = UserCmd(service_name="identity", entity_name="User")
 user_events = UserEvents(service_name="identity", entity_name="User")
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+
 
 @api_router.get("/{user_id}", response_model=User)
 async def get_user(
@@ -34,19 +40,24 @@ async def get_user(
 async def get_users_list(
         user_service: FromDishka[UserService],
         data: UsersSearch = Depends(),
-) -> list[User]:
+) -> Response:
     """Get all users by provided fields."""
 
-    return await user_service.list(
+    users = await user_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(user_service.dump_json(users), Cursor.after(users, data.limit))
 
 
 @broker_router.subscriber(
     user_commands.update,
     stream=streams.cmd,
     queue="users-update-workers",
-    config=ConsumerConfig(durable_name="users-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="users-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(user_events.updated, stream=streams.events)
 async def update_user(
@@ -55,18 +66,23 @@ async def update_user(
 ) -> User:
     """ Update specified user. """
 
-    user = await user_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
-    )
-    return user
+    async with update_locks(update_data.id):
+        user = await user_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        return user
 
 
 @broker_router.subscriber(
     user_commands.delete,
     stream=streams.cmd,
     queue="users-delete-workers",
-    config=ConsumerConfig(durable_name="users-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="users-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(user_events.deleted, stream=streams.events)
 async def delete_user(
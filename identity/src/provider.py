@@ -7,7 +7,7 @@ from identity.src.adapters.repositories.companies import CompaniesRepository
 from identity.src.adapters.repositories.users import UsersRepository
 from identity.src.service.auth import AuthService
 from identity.src.service.company import CompaniesService
-from identity.src.service.uow import UnitOfWork
+from identity.src.service.uow import UnitOfWork, ReplicaUnitOfWork
 from identity.src.service.user import UserService
 
 
@@ -64,3 +64,26 @@ class DependencyProvider(Provider):
     ) -> AuthService:
         """ Real dependency of AuthService for production. """
         return AuthService(repo, keycloak)
+
+
+class ReadDependencyProvider(DependencyProvider):
+    """ Dependencies of read app, its queries are served by read replica. """
+
+    @provide(scope=Scope.REQUEST)
+    async def get_uow(self) -> AsyncIterable[UnitOfWork]:
+        """ Real dependency of read-only UnitOfWork bound to read replica for production. """
+        async with ReplicaUnitOfWork() as uow:
+            yield uow
+
+    @provide(scope=Scope.REQUEST)
+    async def get_auth_service(
+            self,
+            keycloak: Keycloak,
+    ) -> AsyncIterable[AuthService]:
+        """
+        Real dependency of AuthService for production.
+
+        Users are created on their first login, so auth always works with primary DB.
+        """
+        async with UnitOfWork() as uow:
+            yield AuthService(UsersRepository(uow=uow), keycloak)
@@ -29,6 +29,10 @@ class IAuthService(abc.ABC):
     async def introspect(self, token) -> dict:
         ...
 
+    @abc.abstractmethod
+    async def verify(self, token) -> dict:
+        ...
+
     @abc.abstractmethod
     async def resolve_user(
             self,
@@ -42,6 +46,26 @@ class AuthService(IAuthService):
     async def introspect(self, token) -> dict:
         return await self.keycloak.introspect(token)
 
+    async def verify(self, token) -> dict:
+        """
+        Verify token and return its info in introspection format.
+
+        By default token is verified locally without keycloak calls,
+        so revoked but not yet expired tokens are accepted
+        unless kc_check_revoked setting is enabled.
+        """
+
+        if not settings.kc_local_verification:
+            return await self.introspect(token)
+
+        token_info = await self.keycloak.decode_token(token)
+        if settings.kc_check_revoked:
+            introspected = await self.introspect(token)
+            if not introspected.get("active"):
+                return introspected
+
+        return {**token_info, "active": True}
+
     async def resolve_user(
             self,
             authenticated_user: AuthenticatedUser
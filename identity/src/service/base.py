@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import TypeVar, Generic, Type
+from typing import TypeVar, Generic, Type, Sequence
 from uuid import UUID
 
 from pydantic import BaseModel
 
 from identity.src.adapters.repositories.base import IGenericRepository
+from identity.src.domain.base import get_list_adapter
 from identity.src.domain.company import Company, CompanyBase
 from identity.src.domain.user import UserBase, User
 
@@ -39,6 +40,10 @@ class IGenericService(ABC, Generic[REPO, IN_SCHEMA, OUT_SCHEMA]):
     async def list(self, **kwargs) -> list[OUT_SCHEMA]:
         ...
 
+    @abstractmethod
+    def dump_json(self, entities: Sequence[OUT_SCHEMA]) -> bytes:
+        ...
+
     @abstractmethod
     async def update(self, entity_id: UUID, **kwargs) -> OUT_SCHEMA:
         ...
@@ -61,8 +66,12 @@ class GenericService(IGenericService[REPO, IN_SCHEMA, OUT_SCHEMA]):
         return self.out_schema.model_validate(db_entity) if db_entity else None
 
     async def list(self, **kwargs) -> list[OUT_SCHEMA]:
-        db_entity = await self.repository.list(**kwargs)
-        return [self.out_schema.model_validate(d) for d in db_entity]
+        db_entities = await self.repository.list(**kwargs)
+        return get_list_adapter(self.out_schema).validate_python(db_entities, from_attributes=True)
+
+    def dump_json(self, entities: Sequence[OUT_SCHEMA]) -> bytes:
+        """ Serialize entities to JSON in one pass, without validating them again. """
+        return get_list_adapter(self.out_schema).dump_json(entities)
 
     async def update(self, entity_id: UUID, **kwargs) -> OUT_SCHEMA | None:
         updated_entity = await self.repository.update(entity_id, **kwargs)
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+from jwcrypto.common import JWException
+
+from identity.src.config.settings import settings
+from identity.src.service.auth import AuthService
+from identity.tests.fixtures.keycloak import FakeKeycloak, FakeKeycloakClient
+from identity.tests.fixtures.keycloak import generate_key, make_token
+
+
+@pytest.fixture
+def signing_key():
+    return generate_key()
+
+
+@pytest.fixture
+def keycloak_client(signing_key) -> FakeKeycloakClient:
+    return FakeKeycloakClient(keys=[signing_key])
+
+
+@pytest.fixture
+def auth_service(keycloak_client) -> AuthService:
+    return AuthService(repository=None, keycloak=FakeKeycloak(keycloak_client))
+
+
+async def test_verify_locally(auth_service, keycloak_client, signing_key):
+    token = make_token(signing_key, realm_access={"roles": ["admin", "user"]})
+
+    token_info = await auth_service.verify(token)
+
+    assert token_info["active"] is True
+    assert token_info["realm_access"]["roles"] == ["admin", "user"]
+    assert keycloak_client.introspect_calls == 0
+
+
+async def test_jwks_is_cached(auth_service, keycloak_client, signing_key):
+    for _ in range(5):
+        await auth_service.verify(make_token(signing_key))
+
+    assert keycloak_client.certs_calls == 1
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"exp": int(time.time()) - 3600},
+        {"aud": "another-client"},
+    ]
+)
+async def test_invalid_claims(auth_service, signing_key, claims):
+    with pytest.raises(JWException):
+        await auth_service.verify(make_token(signing_key, **claims))
+
+
+async def test_foreign_signature(auth_service):
+    foreign_key = generate_key(kid="foreign")
+
+    with pytest.raises(JWException):
+        await auth_service.verify(make_token(foreign_key))
+
+
+async def test_rotated_key(auth_service, keycloak_client, signing_key):
+    await auth_service.verify(make_token(signing_key))
+
+    rotated_key = generate_key()
+    keycloak_client.keys.append(rotated_key)
+    token_info = await auth_service.verify(make_token(rotated_key))
+
+    assert token_info["active"] is True
+    assert keycloak_client.certs_calls == 2
+
+
+async def test_revoked_token(auth_service, keycloak_client, signing_key, monkeypatch):
+    monkeypatch.setattr(settings, "kc_check_revoked", 1)
+    keycloak_client.active = False
+
+    token_info = await auth_service.verify(make_token(signing_key))
+
+    assert token_info["active"] is False
+    assert keycloak_client.introspect_calls == 1
+
+
+async def test_introspection_mode(auth_service, keycloak_client, signing_key, monkeypatch):
+    monkeypatch.setattr(settings, "kc_local_verification", 0)
+
+    token_info = await auth_service.verify(make_token(signing_key))
+
+    assert token_info["active"] is True
+    assert keycloak_client.introspect_calls == 1
+    assert keycloak_client.certs_calls == 0
@@ -3,11 +3,13 @@ from typing import Sequence, TypeVar, Generic, Type
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import Select, select, update, delete
+from sqlalchemy import Select, select, update, delete, tuple_
 from sqlalchemy.orm import InstrumentedAttribute, load_only, defer
 
 from notifications.src.adapters.orm import Base, OrmNotification
 from notifications.src.config.logging import logger
+from notifications.src.config.settings import settings
+from notifications.src.domain.pagination import Cursor, get_page_size
 from notifications.src.service.uow import AbstractUnitOfWork
 
 MODEL = TypeVar("MODEL", bound=Base)
@@ -37,6 +39,8 @@ class IGenericRepository(ABC, Generic[MODEL, IN_SCHEMA]):
             self,
             include_fields: Sequence[InstrumentedAttribute] = (),
             exclude_fields: Sequence[InstrumentedAttribute] = (),
+            limit: int | None = None,
+            cursor: str | None = None,
             **kwargs
     ) -> list[MODEL]:
         ...
@@ -54,7 +58,8 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
     async def create(self, entity: IN_SCHEMA) -> MODEL:
         logger.info(
             f"Adding new {self.model.__name__}",
-            extra=entity.model_dump()
+            extra=entity.model_dump,
+            sample_rate=settings.log_sample_rate,
         )
         db_entity = self.model(**entity.model_dump())
         self.uow.session.add(db_entity)
@@ -62,7 +67,8 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
 
         logger.info(
             f"New {self.model.__name__} {db_entity.id} added to DB",
-            extra=db_entity.to_dict()
+            extra=db_entity.to_dict,
+            sample_rate=settings.log_sample_rate,
         )
         return db_entity
 
@@ -108,12 +114,25 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
             self,
             include_fields: Sequence[InstrumentedAttribute] = (),
             exclude_fields: Sequence[InstrumentedAttribute] = (),
+            limit: int | None = None,
+            cursor: str | None = None,
             **kwargs
     ) -> list[MODEL]:
         """
-        Get specified entities from DB.
+        Get page of specified entities from DB.
 
-        The same as .get, but without limiting.
+        The same as .get, but returns up to limit entities (never more than max_page_size setting)
+        using keyset pagination by (created_at, id).
+
+        @:param limit: Page size.
+        @:param cursor: Cursor of the last entity of previous page (see domain.pagination.Cursor).
+
+        SQL query of the next page will be:
+        SELECT *
+          FROM documents
+         WHERE (created_at, id) < (:cursor_created_at, :cursor_id)
+         ORDER BY created_at DESC, id DESC
+         LIMIT :limit
         """
 
         query = await self._prepare_select(
@@ -121,6 +140,14 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
             exclude_fields=exclude_fields,
             **kwargs
         )
+        if cursor:
+            last_entity = Cursor.decode(cursor)
+            query = query.where(
+                tuple_(self.model.created_at, self.model.id)
+                < tuple_(last_entity.created_at, last_entity.id)
+            )
+        query = query.limit(get_page_size(limit))
+
         query_result = await self.uow.session.execute(query)
         db_entities = query_result.scalars().all()
 
@@ -129,7 +156,8 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
     async def update(self, entity_id: UUID, **kwargs) -> MODEL | None:
         logger.info(
             f"Updating {self.model.__name__} with id {entity_id} in DB...",
-            extra=kwargs
+            extra=kwargs,
+            sample_rate=settings.log_sample_rate,
         )
         query = (
             update(self.model)
@@ -142,7 +170,8 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
         if db_entity:
             logger.info(
                 f"{self.model.__name__} with id {entity_id} updated in DB",
-                extra=db_entity.to_dict()
+                extra=db_entity.to_dict,
+                sample_rate=settings.log_sample_rate,
             )
         else:
             logger.warning(
@@ -167,7 +196,7 @@ class GenericRepository(IGenericRepository[MODEL, IN_SCHEMA]):
         query = (
             select(self.model)
             .filter_by(**kwargs)
-            .order_by(self.model.created_at.desc())
+            .order_by(self.model.created_at.desc(), self.model.id.desc())
         )
         if include_fields:
             query = query.options(load_only(*include_fields))
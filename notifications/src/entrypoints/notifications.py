@@ -2,17 +2,25 @@ from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends, HTTPException
-from faststream.nats import NatsRouter
+from fastapi import APIRouter, Depends, HTTPException, Response
+from faststream import Context
+from faststream.nats import NatsBroker, NatsRouter
+from faststream.nats.message import NatsBatchMessage
 from nats.js.api import ConsumerConfig
 
 from notifications.src.adapters.broker import streams
+from notifications.src.adapters.broker.batch import batch_pull_sub, process_batch
 from notifications.src.adapters.broker.cmd import NotificationCmd
 from notifications.src.adapters.broker.events import NotificationEvents
+from notifications.src.adapters.broker.ordering import KeyedLock
+from notifications.src.config.settings import settings
 from notifications.src.domain.base import EntityDeletedEvent
 from notifications.src.domain.notification import NotificationIn, NotificationOut
 from notifications.src.domain.notification import NotificationsSearch, NotificationUpdateCmd
+from notifications.src.domain.pagination import Cursor, page_response
+from notifications.src.middleware import RetryMiddleware
 from notifications.src.service.notification import NotificationService
+from notifications.src.service.uow import UnitOfWork
 
 broker_router = NatsRouter()
 api_router = APIRouter(tags=["Notifications"], route_class=DishkaRoute)
@@ -20,20 +28,38 @@ api_router = APIRouter(tags=["Notifications"], route_class=DishkaRoute)
 notification_commands = NotificationCmd(service_name="notifications", entity_name="Notification")
 notification_events = NotificationEvents(service_name="notifications", entity_name="Notification")
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+
+notification_created_publisher = broker_router.publisher(notification_events.created, stream=streams.events)
+
 
 @broker_router.subscriber(
     notification_commands.create,
     stream=streams.cmd,
-    queue="notifications-create-workers",
-    config=ConsumerConfig(durable_name="notifications-create")
+    pull_sub=batch_pull_sub(),
+    config=ConsumerConfig(
+        durable_name="notifications-create-batch",
+        max_ack_pending=settings.nats_max_ack_pending,
+        # backstop of retry policy applied by process_batch, e.g. if process dies on the last attempt
+        max_deliver=RetryMiddleware.get_retry_policy()[0],
+    )
 )
-@broker_router.publisher(notification_events.created, stream=streams.events)
 async def create_notification(
         notification_service: FromDishka[NotificationService],
-        data: NotificationIn,
-) -> NotificationOut:
-    """ Create a new notification. """
-    return await notification_service.create(data)
+        uow: FromDishka[UnitOfWork],
+        message: NatsBatchMessage = Context("message"),
+        broker: NatsBroker = Context("broker"),
+) -> None:
+    """ Create new notifications, fan-out bursts of commands are created in one transaction. """
+    await process_batch(
+        uow,
+        broker,
+        message,
+        NotificationIn,
+        notification_service.create,
+        publisher=notification_created_publisher,
+    )
 
 
 @api_router.get("/{notification_id}", response_model=NotificationOut)
@@ -54,19 +80,24 @@ async def get_notification(
 async def get_notifications_list(
         notification_service: FromDishka[NotificationService],
         data: NotificationsSearch = Depends(),
-) -> list[NotificationOut]:
+) -> Response:
     """Get all notifications by provided fields."""
 
-    return await notification_service.list(
+    notifications = await notification_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(notification_service.dump_json(notifications), Cursor.after(notifications, data.limit))
 
 
 @broker_router.subscriber(
     notification_commands.update,
     stream=streams.cmd,
     queue="notifications-update-workers",
-    config=ConsumerConfig(durable_name="notifications-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="notifications-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(notification_events.updated, stream=streams.events)
 async def update_notification(
@@ -75,21 +106,26 @@ async def update_notification(
 ) -> NotificationOut:
     """ Update specified notifications. """
 
-    notification = await notification_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
-    )
-    if not notification:
-        raise Exception("Failed to update non-existent notification")
+    async with update_locks(update_data.id):
+        notification = await notification_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        if not notification:
+            raise Exception("Failed to update non-existent notification")
 
-    return notification
+        return notification
 
 
 @broker_router.subscriber(
     notification_commands.delete,
     stream=streams.cmd,
     queue="notifications-delete-workers",
-    config=ConsumerConfig(durable_name="notifications-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="notifications-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(notification_events.deleted, stream=streams.events)
 async def delete_notification(
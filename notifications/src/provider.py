@@ -4,7 +4,7 @@ from dishka import provide, Scope, Provider
 
 from notifications.src.adapters.repositories.notifications import NotificationsRepository
 from notifications.src.service.notification import NotificationService
-from notifications.src.service.uow import UnitOfWork
+from notifications.src.service.uow import UnitOfWork, ReplicaUnitOfWork
 
 
 class DependencyProvider(Provider):
@@ -30,3 +30,13 @@ class DependencyProvider(Provider):
     ) -> NotificationService:
         """ Real dependency of NotificationService for production. """
         return NotificationService(repo)
+
+
+class ReadDependencyProvider(DependencyProvider):
+    """ Dependencies of read app, its queries are served by read replica. """
+
+    @provide(scope=Scope.REQUEST)
+    async def get_uow(self) -> AsyncIterable[UnitOfWork]:
+        """ Real dependency of read-only UnitOfWork bound to read replica for production. """
+        async with ReplicaUnitOfWork() as uow:
+            yield uow
@@ -8,7 +8,7 @@ from fastapi import FastAPI
 from notifications.src.config.settings import settings
 from notifications.src.entrypoints.router import router
 from notifications.src.middleware import logging_middleware
-from notifications.src.provider import DependencyProvider
+from notifications.src.provider import ReadDependencyProvider
 
 
 @asynccontextmanager
@@ -27,7 +27,7 @@ def get_read_app():
     app.middleware("http")(logging_middleware)
 
     container = make_async_container(
-        DependencyProvider(),
+        ReadDependencyProvider(),
         FastapiProvider()
     )
     setup_dishka(container=container, app=app)
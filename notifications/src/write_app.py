@@ -2,13 +2,20 @@ from dishka import make_async_container
 from dishka.integrations.faststream import setup_dishka, FastStreamProvider
 from faststream import FastStream
 
+from notifications.src.adapters.db_pool import check_pool_capacity
 from notifications.src.entrypoints.router import broker
 from notifications.src.provider import DependencyProvider
 
 
+def check_db_pool_capacity() -> None:
+    # push subscribers run up to max_workers handlers at once, batch subscribers run one
+    check_pool_capacity(sum(getattr(subscriber, "max_workers", None) or 1 for subscriber in broker.subscribers))
+
+
 def get_write_app():
     app = FastStream(
-        broker
+        broker,
+        on_startup=[check_db_pool_capacity],
     )
     container = make_async_container(
         DependencyProvider(),
@@ -15,7 +15,7 @@ class BaseEvents:
     """
     Base dataclass for C(r)UD events.
 
-    Implements Create, Update, Delete properties with correct command subjects.
+    Implements Create, Update, Delete, BulkCreate, BulkUpdate properties with correct event subjects.
     """
 
     service_name: str
@@ -33,6 +33,14 @@ class BaseEvents:
     def deleted(self) -> str:
         return f"events.{self.service_name}.{self.entity_name}Deleted"
 
+    @property
+    def bulk_created(self) -> str:
+        return f"events.{self.service_name}.{self.entity_name}BulkCreated"
+
+    @property
+    def bulk_updated(self) -> str:
+        return f"events.{self.service_name}.{self.entity_name}BulkUpdated"
+
 
 @dataclass(frozen=True, slots=True)
 class ProjectEvents(Singleton, BaseEvents):
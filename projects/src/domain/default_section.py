@@ -5,6 +5,7 @@ from pydantic import BaseModel, ConfigDict
 
 from projects.src.domain.base import BaseValidationMixin
 from projects.src.enums import ProjectType
+from projects.src.domain.pagination import PaginationParams
 
 
 class DefaultSectionIn(BaseModel):
@@ -21,7 +22,7 @@ class DefaultSectionOut(DefaultSectionIn):
     updated_at: datetime | None
 
 
-class DefaultSectionsSearch(BaseModel):
+class DefaultSectionsSearch(PaginationParams):
     id: UUID | None = None
     project_type: ProjectType | None = None
     name: str | None = None
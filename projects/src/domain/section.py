@@ -4,6 +4,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
 from projects.src.domain.base import BaseValidationMixin
+from projects.src.domain.pagination import PaginationParams
 
 
 class SectionIn(BaseModel):
@@ -23,7 +24,7 @@ class SectionOut(SectionIn):
     updated_at: datetime | None
 
 
-class SectionsSearch(BaseModel):
+class SectionsSearch(PaginationParams):
     id: UUID | None = None
     name: str | None = None
     abbreviation: str | None = None
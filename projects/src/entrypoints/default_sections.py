@@ -2,16 +2,19 @@ from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from faststream.nats import NatsRouter
 from nats.js.api import ConsumerConfig
 
 from projects.src.adapters.broker import streams
 from projects.src.adapters.broker.cmd import DefaultSectionCmd
 from projects.src.adapters.broker.events import DefaultSectionEvents
+from projects.src.adapters.broker.ordering import KeyedLock
+from projects.src.config.settings import settings
 from projects.src.domain.base import EntityDeletedEvent
 from projects.src.domain.default_section import DefaultSectionIn, DefaultSectionOut
 from projects.src.domain.default_section import DefaultSectionsSearch, DefaultSectionUpdateCmd
+from projects.src.domain.pagination import Cursor, page_response
 from projects.src.service.default_section import DefaultSectionService
 
 broker_router = NatsRouter()
@@ -24,12 +27,19 @@ default_section_events = DefaultSectionEvents(
     service_name="projects", entity_name="DefaultSection"
 )
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+
 
 @broker_router.subscriber(
     default_section_commands.create,
     stream=streams.cmd,
     queue="default-sections-create-workers",
-    config=ConsumerConfig(durable_name="default-sections-create")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="default-sections-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(default_section_events.created, stream=streams.events)
 async def create_default_section(
@@ -40,6 +50,25 @@ async def create_default_section(
     return await default_section_service.create(data)
 
 
+@broker_router.subscriber(
+    default_section_commands.bulk_create,
+    stream=streams.cmd,
+    queue="default-sections-bulk-create-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="default-sections-bulk-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
+)
+@broker_router.publisher(default_section_events.bulk_created, stream=streams.events)
+async def bulk_create_default_sections(
+        default_section_service: FromDishka[DefaultSectionService],
+        data: list[DefaultSectionIn],
+) -> list[DefaultSectionOut]:
+    """ Create new default sections by single DB insert, they are published as one event. """
+    return await default_section_service.bulk_create(data)
+
+
 @api_router.get("/{default_section_id}", response_model=DefaultSectionOut)
 async def get_default_section(
         default_section_service: FromDishka[DefaultSectionService],
@@ -58,19 +87,24 @@ async def get_default_section(
 async def get_default_sections_list(
         default_section_service: FromDishka[DefaultSectionService],
         data: DefaultSectionsSearch = Depends(),
-) -> list[DefaultSectionOut]:
+) -> Response:
     """Get all default sections by provided fields."""
 
-    return await default_section_service.list(
+    default_sections = await default_section_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(default_section_service.dump_json(default_sections), Cursor.after(default_sections, data.limit))
 
 
 @broker_router.subscriber(
     default_section_commands.update,
     stream=streams.cmd,
     queue="default-sections-update-workers",
-    config=ConsumerConfig(durable_name="default-sections-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="default-sections-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(default_section_events.updated, stream=streams.events)
 async def update_default_section(
@@ -79,21 +113,50 @@ async def update_default_section(
 ) -> DefaultSectionOut:
     """ Update specified default sections. """
 
-    default_section = await default_section_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
+    async with update_locks(update_data.id):
+        default_section = await default_section_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        if not default_section:
+            raise Exception("Failed to update non-existent default section")
+
+        return default_section
+
+
+@broker_router.subscriber(
+    default_section_commands.bulk_update,
+    stream=streams.cmd,
+    queue="default-sections-bulk-update-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="default-sections-bulk-update",
+        max_ack_pending=settings.nats_max_ack_pending,
     )
-    if not default_section:
-        raise Exception("Failed to update non-existent default section")
+)
+@broker_router.publisher(default_section_events.bulk_updated, stream=streams.events)
+async def bulk_update_default_sections(
+        default_section_service: FromDishka[DefaultSectionService],
+        update_data: list[DefaultSectionUpdateCmd],
+) -> list[DefaultSectionOut]:
+    """ Update specified default sections in single DB transaction, they are published as one event. """
 
-    return default_section
+    async with update_locks(*(entity.id for entity in update_data)):
+        return await default_section_service.bulk_update([
+            (default_section.id, default_section.data.model_dump(exclude_none=True))
+            for default_section in update_data
+        ])
 
 
 @broker_router.subscriber(
     default_section_commands.delete,
     stream=streams.cmd,
     queue="default-sections-delete-workers",
-    config=ConsumerConfig(durable_name="default-sections-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="default-sections-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(default_section_events.deleted, stream=streams.events)
 async def delete_default_section(
@@ -2,15 +2,18 @@ from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from faststream.nats import NatsRouter
 from nats.js.api import ConsumerConfig
 
 from projects.src.adapters.broker import streams
 from projects.src.adapters.broker.cmd import ProjectCmd
 from projects.src.adapters.broker.events import ProjectEvents
+from projects.src.adapters.broker.ordering import KeyedLock
+from projects.src.config.settings import settings
 from projects.src.domain.base import EntityDeletedEvent
 from projects.src.domain.project import ProjectIn, ProjectOut, ProjectsSearchParams, ProjectUpdateCmd
+from projects.src.domain.pagination import Cursor, page_response
 from projects.src.service.project import ProjectService
 
 broker_router = NatsRouter()
@@ -19,12 +22,19 @@ api_router = APIRouter(tags=["Projects"], route_class=DishkaRoute)
 project_commands = ProjectCmd(service_name="projects", entity_name="Project")
 project_events = ProjectEvents(service_name="projects", entity_name="Project")
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+
 
 @broker_router.subscriber(
     project_commands.create,
     stream=streams.cmd,
     queue="projects-create-workers",
-    config=ConsumerConfig(durable_name="projects-create")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="projects-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(project_events.created, stream=streams.events)
 async def create_project(
@@ -35,6 +45,25 @@ async def create_project(
     return await project_service.create(data)
 
 
+@broker_router.subscriber(
+    project_commands.bulk_create,
+    stream=streams.cmd,
+    queue="projects-bulk-create-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="projects-bulk-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
+)
+@broker_router.publisher(project_events.bulk_created, stream=streams.events)
+async def bulk_create_projects(
+        project_service: FromDishka[ProjectService],
+        data: list[ProjectIn],
+) -> list[ProjectOut]:
+    """ Create new projects by single DB insert, they are published as one event. """
+    return await project_service.bulk_create(data)
+
+
 @api_router.get("/{project_id}", response_model=ProjectOut)
 async def get_project(
         project_service: FromDishka[ProjectService],
@@ -53,19 +82,24 @@ async def get_project(
 async def get_projects_list(
         project_service: FromDishka[ProjectService],
         data: ProjectsSearchParams = Depends(),
-) -> list[ProjectOut]:
+) -> Response:
     """Get all projects by provided fields."""
 
-    return await project_service.list(
+    projects = await project_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(project_service.dump_json(projects), Cursor.after(projects, data.limit))
 
 
 @broker_router.subscriber(
     project_commands.update,
     stream=streams.cmd,
     queue="projects-update-workers",
-    config=ConsumerConfig(durable_name="projects-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="projects-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(project_events.updated, stream=streams.events)
 async def update_project(
@@ -74,21 +108,50 @@ async def update_project(
 ) -> ProjectOut:
     """ Update specified projects. """
 
-    project = await project_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
+    async with update_locks(update_data.id):
+        project = await project_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        if not project:
+            raise Exception("Failed to update non-existent project")
+
+        return project
+
+
+@broker_router.subscriber(
+    project_commands.bulk_update,
+    stream=streams.cmd,
+    queue="projects-bulk-update-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="projects-bulk-update",
+        max_ack_pending=settings.nats_max_ack_pending,
     )
-    if not project:
-        raise Exception("Failed to update non-existent project")
+)
+@broker_router.publisher(project_events.bulk_updated, stream=streams.events)
+async def bulk_update_projects(
+        project_service: FromDishka[ProjectService],
+        update_data: list[ProjectUpdateCmd],
+) -> list[ProjectOut]:
+    """ Update specified projects in single DB transaction, they are published as one event. """
 
-    return project
+    async with update_locks(*(entity.id for entity in update_data)):
+        return await project_service.bulk_update([
+            (project.id, project.data.model_dump(exclude_none=True))
+            for project in update_data
+        ])
 
 
 @broker_router.subscriber(
     project_commands.delete,
     stream=streams.cmd,
     queue="projects-delete-workers",
-    config=ConsumerConfig(durable_name="projects-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="projects-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(project_events.deleted, stream=streams.events)
 async def delete_project(
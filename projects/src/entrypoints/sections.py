@@ -2,15 +2,18 @@ from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from faststream.nats import NatsRouter
 from nats.js.api import ConsumerConfig
 
 from projects.src.adapters.broker import streams
 from projects.src.adapters.broker.cmd import SectionCmd
 from projects.src.adapters.broker.events import SectionEvents
+from projects.src.adapters.broker.ordering import KeyedLock
+from projects.src.config.settings import settings
 from projects.src.domain.base import EntityDeletedEvent
 from projects.src.domain.section import SectionIn, SectionOut, SectionsSearch, SectionUpdateCmd
+from projects.src.domain.pagination import Cursor, page_response
 from projects.src.service.section import SectionService
 
 broker_router = NatsRouter()
@@ -19,12 +22,19 @@ api_router = APIRouter(tags=["Sections"], route_class=DishkaRoute)
 section_commands = SectionCmd(service_name="projects", entity_name="Section")
 section_events = SectionEvents(service_name="projects", entity_name="Section")
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+
 
 @broker_router.subscriber(
     section_commands.create,
     stream=streams.cmd,
     queue="sections-create-workers",
-    config=ConsumerConfig(durable_name="sections-create")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="sections-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(section_events.created, stream=streams.events)
 async def create_section(
@@ -35,6 +45,25 @@ async def create_section(
     return await section_service.create(data)
 
 
+@broker_router.subscriber(
+    section_commands.bulk_create,
+    stream=streams.cmd,
+    queue="sections-bulk-create-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="sections-bulk-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
+)
+@broker_router.publisher(section_events.bulk_created, stream=streams.events)
+async def bulk_create_sections(
+        section_service: FromDishka[SectionService],
+        data: list[SectionIn],
+) -> list[SectionOut]:
+    """ Create new sections by single DB insert, they are published as one event. """
+    return await section_service.bulk_create(data)
+
+
 @api_router.get("/{section_id}", response_model=SectionOut)
 async def get_section(
         section_service: FromDishka[SectionService],
@@ -53,19 +82,24 @@ async def get_section(
 async def get_sections_list(
         section_service: FromDishka[SectionService],
         data: SectionsSearch = Depends(),
-) -> list[SectionOut]:
+) -> Response:
     """Get all sections by provided fields."""
 
-    return await section_service.list(
+    sections = await section_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(section_service.dump_json(sections), Cursor.after(sections, data.limit))
 
 
 @broker_router.subscriber(
     section_commands.update,
     stream=streams.cmd,
     queue="sections-update-workers",
-    config=ConsumerConfig(durable_name="sections-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="sections-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(section_events.updated, stream=streams.events)
 async def update_section(
@@ -74,21 +108,50 @@ async def update_section(
 ) -> SectionOut:
     """ Update specified sections. """
 
-    section = await section_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
+    async with update_locks(update_data.id):
+        section = await section_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        if not section:
+            raise Exception("Failed to update non-existent section")
+
+        return section
+
+
+@broker_router.subscriber(
+    section_commands.bulk_update,
+    stream=streams.cmd,
+    queue="sections-bulk-update-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="sections-bulk-update",
+        max_ack_pending=settings.nats_max_ack_pending,
     )
-    if not section:
-        raise Exception("Failed to update non-existent section")
+)
+@broker_router.publisher(section_events.bulk_updated, stream=streams.events)
+async def bulk_update_sections(
+        section_service: FromDishka[SectionService],
+        update_data: list[SectionUpdateCmd],
+) -> list[SectionOut]:
+    """ Update specified sections in single DB transaction, they are published as one event. """
 
-    return section
+    async with update_locks(*(entity.id for entity in update_data)):
+        return await section_service.bulk_update([
+            (section.id, section.data.model_dump(exclude_none=True))
+            for section in update_data
+        ])
 
 
 @broker_router.subscriber(
     section_commands.delete,
     stream=streams.cmd,
     queue="sections-delete-workers",
-    config=ConsumerConfig(durable_name="sections-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="sections-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(section_events.deleted, stream=streams.events)
 async def delete_section(
@@ -1,71 +1,124 @@
-import asyncio
 import time
 import traceback
 import uuid
+from functools import cache
 from types import TracebackType
 from typing import Callable, Any, Sequence, Awaitable
 
 from fastapi import Request
 from faststream import BaseMiddleware, StreamMessage
 from faststream.nats import NatsBroker
+from nats.aio.msg import Msg
+from nats.errors import NotJSMessageError
 
 from projects.src.config.logging import user_ip_var, request_id_var, logger
 from projects.src.config.settings import settings
 
 
 class RetryMiddleware(BaseMiddleware):
-    """ Retry middleware with logging and dlq publishing. """
+    """
+    Retry middleware with logging and dlq publishing.
+
+    Failed message is nak'ed with delay, so it's redelivered by JetStream server later
+    and the consumer moves on to the next messages right away.
+    On the last attempt message is published to DLQ and terminated.
+    Handlers which settle messages of a batch themselves apply the same policy by retry_or_dead_letter.
+    """
 
     max_retries: int = 5
-    delays: Sequence[int] = (5, 15, 30, 60, 120)
+    delays: Sequence[float] = (5, 15, 30, 60, 120)
+
+    @classmethod
+    def get_retry_policy(cls) -> tuple[int, Sequence[float]]:
+        if any([settings.debug, settings.is_test, settings.local]):
+            return 2, (1, 1)
+        return cls.max_retries, cls.delays
+
+    @staticmethod
+    def get_attempt(raw_message: Msg) -> int | None:
+        """ Number of delivery attempt of JetStream message, None for messages which can't be redelivered. """
+        try:
+            return raw_message.metadata.num_delivered
+        except NotJSMessageError:
+            return None
+
+    @staticmethod
+    def get_error_info(raw_message: Msg, exc: Exception, attempt: int | None, message: Any) -> dict[str, Any]:
+        headers = raw_message.headers or {}
+        return {
+            "stream": headers.get("Nats-Expected-Stream"),
+            "subject": raw_message.subject,
+            "message_id": headers.get("message_id"),
+            "correlation_id": headers.get("correlation_id"),
+            "attempts": attempt,
+            "exception_type": type(exc).__name__,
+            "exception_message": str(exc),
+            "exception_traceback": "".join(traceback.format_exception(exc)),
+            "message": message,
+        }
+
+    @staticmethod
+    async def publish_to_dlq(broker: NatsBroker, error_msg_info: dict[str, Any]) -> None:
+        await broker.publish(
+            message=error_msg_info,
+            subject=f"dlq.{error_msg_info['subject']}",
+            stream="dlq"
+        )
+
+    @classmethod
+    async def retry_or_dead_letter(
+            cls,
+            broker: NatsBroker,
+            raw_message: Msg,
+            exc: Exception,
+            message: Any,
+            nack: Callable[[float], Awaitable[None]],
+            reject: Callable[[], Awaitable[None]],
+    ) -> None:
+        """
+        Settle failed message: nack it with delay of its attempt,
+        on the last attempt (or if message can't be redelivered) publish it to DLQ and reject it.
+        """
+
+        max_retries, delays = cls.get_retry_policy()
+        attempt = cls.get_attempt(raw_message) or max_retries
+        error_msg_info = cls.get_error_info(raw_message, exc, attempt, message)
+
+        if attempt >= max_retries:
+            logger.error("Max retries exceeded, sending to DLQ", extra=error_msg_info)
+            await cls.publish_to_dlq(broker, error_msg_info)
+            await reject()
+            return
+
+        delay = delays[attempt - 1]
+        logger.warning(
+            f"Failed to process {raw_message.subject} message "
+            f"(attempt {attempt}/{max_retries}), "
+            f"retrying in {delay}s: {exc}",
+            extra=error_msg_info,
+        )
+        await nack(delay)
 
     async def consume_scope(
             self,
             call_next: Callable[[StreamMessage[Any]], Awaitable[Any]],
             msg: StreamMessage[Any],
     ) -> Any:
-        if any([settings.debug, settings.is_test, settings.local]):
-            max_retries = 2
-            delays = (1, 1)
-        else:
-            max_retries = self.max_retries
-            delays = self.delays
-
-        for attempt in range(max_retries):
-            try:
-                return await call_next(msg)
-            except Exception as exc:
-                error_msg_info = {
-                    "stream": msg.headers.get("Nats-Expected-Stream"),
-                    "subject": msg.raw_message.subject,
-                    "message_id": msg.message_id,
-                    "correlation_id": msg.correlation_id,
-                    "attempts": attempt + 1,
-                    "exception_type": type(exc).__name__,
-                    "exception_message": str(exc),
-                    "exception_traceback": traceback.format_exc(),
-                    "message": await msg.decode()
-                }
-
-                if attempt == max_retries - 1:
-                    logger.error("Max retries exceeded, sending to DLQ")
-                    # Publish to DLQ manually or let broker config handle
-                    broker: NatsBroker = self.context.get("broker")
-                    await broker.publish(
-                        message=error_msg_info,
-                        subject=f"dlq.{msg.raw_message.subject}",
-                        stream="dlq"
-                    )
-                    raise exc
-
-                logger.warning(
-                    f"Failed to process {msg.raw_message.subject} message "
-                    f"(attempt {attempt + 1}/{max_retries}), "
-                    f"retrying in {delays[attempt]}s: {exc}",
-                    extra=error_msg_info,
-                )
-                await asyncio.sleep(delays[attempt])
-        return None
+        try:
+            return await call_next(msg)
+        except Exception as exc:
+            # batch of pull subscriber is retried as a whole, its first message stands for it
+            raw_message = msg.raw_message[0] if isinstance(msg.raw_message, list) else msg.raw_message
+            # nack commits the message, so the raised exception doesn't nak it once more without delay
+            await self.retry_or_dead_letter(
+                self.context.get("broker"),
+                raw_message,
+                exc,
+                await msg.decode(),
+                nack=lambda delay: msg.nack(delay=delay),
+                reject=msg.reject,
+            )
+            raise exc
 
 
 class FSLoggingMiddleware(BaseMiddleware):
@@ -76,7 +129,7 @@ class FSLoggingMiddleware(BaseMiddleware):
             msg: StreamMessage[Any],
     ) -> StreamMessage[Any]:
         request_id_var.set(msg.correlation_id)
-        logger.info("Msg consumed")
+        logger.info("Msg consumed", sample_rate=settings.log_sample_rate)
 
         return await super().on_consume(msg)
 
@@ -86,7 +139,7 @@ class FSLoggingMiddleware(BaseMiddleware):
             exc_val: BaseException | None = None,
             exc_tb: TracebackType | None = None,
     ) -> bool | None:
-        logger.info("Msg processed")
+        logger.info("Msg processed", sample_rate=settings.log_sample_rate)
 
         return await super().after_processed(
             exc_type, exc_val, exc_tb
@@ -108,21 +161,25 @@ async def logging_middleware(
     user_ip_var.set(user_ip)
 
     start_time = time.time()
-    query_params = f"?{request.query_params}" if request.query_params else ""
+
+    # request line and URL are formatted at most once and only if request records are logged
+    @cache
+    def request_line() -> str:
+        query_params = f"?{request.query_params}" if request.query_params else ""
+        return f"{request.method} {request.url.path}{query_params}"
+
+    @cache
+    def url() -> str:
+        return str(request.url)
 
     # Log request start
     logger.info(
-        f"Request {request.method} {request.url.path}{query_params} started",
-        extra={
-            "extra_fields": {
-                "request_id": request_id,
-                "user_ip": user_ip,
-                "method": request.method,
-                "url": str(request.url),
-                "user_agent": request.headers.get("user-agent"),
-                "endpoint": request.url.path,
-            }
-        }
+        lambda: f"Request {request_line()} started",
+        sample_rate=settings.log_sample_rate,
+        method=request.method,
+        url=url,
+        user_agent=lambda: request.headers.get("user-agent"),
+        endpoint=lambda: request.url.path,
     )
 
     try:
@@ -131,18 +188,13 @@ async def logging_middleware(
 
         # Log request completion
         logger.info(
-            f"Request {request.method} {request.url.path}{query_params} completed",
-            extra={
-                "extra_fields": {
-                    "request_id": request_id,
-                    "user_ip": user_ip,
-                    "method": request.method,
-                    "url": str(request.url),
-                    "status_code": response.status_code,
-                    "process_time_ms": round(process_time * 1000, 2),
-                    "response_size": response.headers.get("content-length", 0),
-                }
-            }
+            lambda: f"Request {request_line()} completed",
+            sample_rate=settings.log_sample_rate,
+            method=request.method,
+            url=url,
+            status_code=response.status_code,
+            process_time_ms=round(process_time * 1000, 2),
+            response_size=lambda: response.headers.get("content-length", 0),
         )
 
         # Add request ID to response headers
@@ -153,19 +205,12 @@ async def logging_middleware(
         process_time = time.time() - start_time
         logger.error(
             "Request failed",
-            extra={
-                "extra_fields": {
-                    "request_id": request_id,
-                    "user_ip": user_ip,
-                    "method": request.method,
-                    "url": str(request.url),
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc(),
-                    "process_time_ms": round(process_time * 1000, 2),
-                }
-            },
-            exc_info=True
+            method=request.method,
+            url=url,
+            error_type=type(e).__name__,
+            error_message=str(e),
+            traceback=traceback.format_exc,
+            process_time_ms=round(process_time * 1000, 2),
         )
         raise
 
@@ -8,7 +8,7 @@ from projects.src.adapters.repositories.sections import SectionsRepository
 from projects.src.service.default_section import DefaultSectionService
 from projects.src.service.project import ProjectService
 from projects.src.service.section import SectionService
-from projects.src.service.uow import UnitOfWork
+from projects.src.service.uow import UnitOfWork, ReplicaUnitOfWork
 
 
 class DependencyProvider(Provider):
@@ -66,3 +66,13 @@ class DependencyProvider(Provider):
     ) -> DefaultSectionService:
         """ Real dependency of DefaultSectionService for production. """
         return DefaultSectionService(repo)
+
+
+class ReadDependencyProvider(DependencyProvider):
+    """ Dependencies of read app, its queries are served by read replica. """
+
+    @provide(scope=Scope.REQUEST)
+    async def get_uow(self) -> AsyncIterable[UnitOfWork]:
+        """ Real dependency of read-only UnitOfWork bound to read replica for production. """
+        async with ReplicaUnitOfWork() as uow:
+            yield uow
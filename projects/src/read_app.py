@@ -8,7 +8,7 @@ from fastapi import FastAPI
 from projects.src.config.settings import settings
 from projects.src.entrypoints.router import router
 from projects.src.middleware import logging_middleware
-from projects.src.provider import DependencyProvider
+from projects.src.provider import ReadDependencyProvider
 
 
 @asynccontextmanager
@@ -27,7 +27,7 @@ def get_read_app():
     app.middleware("http")(logging_middleware)
 
     container = make_async_container(
-        DependencyProvider(),
+        ReadDependencyProvider(),
         FastapiProvider()
     )
     setup_dishka(container=container, app=app)
@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import TypeVar, Generic, Type
+from typing import TypeVar, Generic, Type, Sequence
 from uuid import UUID
 
 from pydantic import BaseModel
 
 from projects.src.adapters.repositories.base import IGenericRepository
+from projects.src.domain.base import get_list_adapter
 from projects.src.domain.default_section import DefaultSectionIn, DefaultSectionOut
 from projects.src.domain.project import ProjectIn, ProjectOut
 from projects.src.domain.section import SectionIn, SectionOut
@@ -32,6 +33,10 @@ class IGenericService(ABC, Generic[REPO, IN_SCHEMA, OUT_SCHEMA]):
     async def create(self, entity: IN_SCHEMA, **kwargs) -> IN_SCHEMA:
         ...
 
+    @abstractmethod
+    async def bulk_create(self, entities: Sequence[IN_SCHEMA]) -> Sequence[OUT_SCHEMA]:
+        ...
+
     @abstractmethod
     async def get(self, **kwargs) -> OUT_SCHEMA | None:
         ...
@@ -40,10 +45,18 @@ class IGenericService(ABC, Generic[REPO, IN_SCHEMA, OUT_SCHEMA]):
     async def list(self, **kwargs) -> list[OUT_SCHEMA]:
         ...
 
+    @abstractmethod
+    def dump_json(self, entities: Sequence[OUT_SCHEMA]) -> bytes:
+        ...
+
     @abstractmethod
     async def update(self, entity_id: UUID, **kwargs) -> OUT_SCHEMA | None:
         ...
 
+    @abstractmethod
+    async def bulk_update(self, updates: Sequence[tuple[UUID, dict]]) -> Sequence[OUT_SCHEMA]:
+        ...
+
     @abstractmethod
     async def delete(self, entity_id: UUID, **kwargs) -> None:
         ...
@@ -57,19 +70,31 @@ class GenericService(IGenericService[REPO, IN_SCHEMA, OUT_SCHEMA]):
         created_entity = self.out_schema.model_validate(created_entity)
         return created_entity
 
+    async def bulk_create(self, entities: Sequence[IN_SCHEMA]) -> Sequence[OUT_SCHEMA]:
+        created_entities = await self.repository.bulk_create(entities)
+        return get_list_adapter(self.out_schema).validate_python(created_entities, from_attributes=True)
+
     async def get(self, **kwargs) -> OUT_SCHEMA | None:
         db_entity = await self.repository.get(**kwargs)
         return self.out_schema.model_validate(db_entity) if db_entity else None
 
     async def list(self, **kwargs) -> list[OUT_SCHEMA]:
-        db_entity = await self.repository.list(**kwargs)
-        return [self.out_schema.model_validate(d) for d in db_entity]
+        db_entities = await self.repository.list(**kwargs)
+        return get_list_adapter(self.out_schema).validate_python(db_entities, from_attributes=True)
+
+    def dump_json(self, entities: Sequence[OUT_SCHEMA]) -> bytes:
+        """ Serialize entities to JSON in one pass, without validating them again. """
+        return get_list_adapter(self.out_schema).dump_json(entities)
 
     async def update(self, entity_id: UUID, **kwargs) -> OUT_SCHEMA | None:
         updated_entity = await self.repository.update(entity_id, **kwargs)
         updated_entity = self.out_schema.model_validate(updated_entity) if updated_entity else None
         return updated_entity
 
+    async def bulk_update(self, updates: Sequence[tuple[UUID, dict]]) -> Sequence[OUT_SCHEMA]:
+        updated_entities = await self.repository.bulk_update(updates)
+        return get_list_adapter(self.out_schema).validate_python(updated_entities, from_attributes=True)
+
     async def delete(self, entity_id: UUID, **kwargs) -> datetime:
         await self.repository.delete(entity_id)
         return datetime.now(timezone.utc)
@@ -0,0 +1,81 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from reviewer.src.config.logging import logger
+from reviewer.src.config.settings import settings
+
+
+class MonitoredPool(AsyncAdaptedQueuePool):
+    """
+    Connection pool of async engine which logs its metrics.
+
+    Time of waiting for a free connection is measured on each checkout.
+    Pool state with checkouts stats is logged every db_pool_metrics_interval seconds while pool is used,
+    slow checkouts and pool exhaustion are logged immediately.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reset_stats()
+
+    @property
+    def metrics(self) -> dict:
+        return {
+            "pool": self.logging_name,
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "wait_time_avg": self.wait_time_total / self.checkouts if self.checkouts else 0.0,
+            "wait_time_max": self.wait_time_max,
+        }
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            logger.error("DB connection pool is exhausted", **self.metrics)
+            raise
+
+        wait_time = time.perf_counter() - started_at
+        self.checkouts += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+        if wait_time >= settings.db_pool_slow_checkout:
+            logger.warning("Slow DB connection checkout", wait_time=wait_time, **self.metrics)
+        if (
+                settings.db_pool_metrics_interval
+                and time.monotonic() - self._stats_started_at >= settings.db_pool_metrics_interval
+        ):
+            logger.info("DB connection pool metrics", **self.metrics)
+            self._reset_stats()
+
+        return connection
+
+    def _reset_stats(self) -> None:
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self._stats_started_at = time.monotonic()
+
+
+def check_pool_capacity(handlers: int) -> None:
+    """
+    Warn if write app may run more message handlers at once than its DB pool has connections.
+
+    Every handler holds a connection for its unit of work, handlers over db_pool_size + db_max_overflow
+    wait for a free one up to db_pool_timeout and fail after it, while JetStream counts their messages in flight.
+    """
+
+    connections = settings.db_pool_size + settings.db_max_overflow
+    if handlers > connections:
+        logger.warning(
+            "Subscribers may run more handlers at once than DB pool has connections, "
+            "lower NATS_MAX_WORKERS or raise DB_POOL_SIZE and DB_MAX_OVERFLOW",
+            handlers=handlers,
+            connections=connections,
+        )
@@ -4,6 +4,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
 from reviewer.src.domain.base import BaseValidationMixin
+from reviewer.src.domain.pagination import PaginationParams
 
 
 class RemarkIn(BaseModel):
@@ -25,7 +26,7 @@ class RemarkOut(RemarkIn):
     updated_at: datetime | None
 
 
-class RemarksSearchParams(BaseModel):
+class RemarksSearchParams(PaginationParams):
     number: int | None = None
     section_id: UUID | None = None
     expert_id: UUID | None = None
@@ -4,6 +4,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
 from reviewer.src.domain.base import BaseValidationMixin
+from reviewer.src.domain.pagination import PaginationParams
 
 
 class RemarkDocIn(BaseModel):
@@ -22,7 +23,7 @@ class RemarkDocOut(RemarkDocIn):
     updated_at: datetime | None
 
 
-class RemarkDocsSearchParams(BaseModel):
+class RemarkDocsSearchParams(PaginationParams):
     id: UUID | None = None
     version: int | None = None
     md5: str | None = None
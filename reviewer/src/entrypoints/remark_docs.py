@@ -2,15 +2,19 @@ from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from faststream.nats import NatsRouter
 from nats.js.api import ConsumerConfig
 
 from reviewer.src.adapters.broker import streams
 from reviewer.src.adapters.broker.cmd import RemarkDocCmd
 from reviewer.src.adapters.broker.events import RemarkDocEvents
+from reviewer.src.adapters.broker.ordering import KeyedLock
+from reviewer.src.config.settings import settings
 from reviewer.src.domain.base import EntityDeletedEvent
 from reviewer.src.domain.remark_doc import RemarkDocIn, RemarkDocOut, RemarkDocsSearchParams, RemarkDocUpdateCmd
+from reviewer.src.domain.pagination import Cursor, page_response
+from reviewer.src.entrypoints.streaming import accepts_ndjson, ndjson_response
 from reviewer.src.service.remark_doc import RemarkDocService
 
 broker_router = NatsRouter()
@@ -19,12 +23,19 @@ api_router = APIRouter(tags=["Remark Docs"], route_class=DishkaRoute)
 remark_doc_commands = RemarkDocCmd(service_name="reviewer", entity_name="RemarkDoc")
 remark_doc_events = RemarkDocEvents(service_name="reviewer", entity_name="RemarkDoc")
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+
 
 @broker_router.subscriber(
     remark_doc_commands.create,
     stream=streams.cmd,
     queue="remark-docs-create-workers",
-    config=ConsumerConfig(durable_name="remark-docs-create")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remark-docs-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(remark_doc_events.created, stream=streams.events)
 async def create_remark_doc(
@@ -35,6 +46,25 @@ async def create_remark_doc(
     return await remark_doc_service.create(data)
 
 
+@broker_router.subscriber(
+    remark_doc_commands.bulk_create,
+    stream=streams.cmd,
+    queue="remark-docs-bulk-create-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remark-docs-bulk-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
+)
+@broker_router.publisher(remark_doc_events.bulk_created, stream=streams.events)
+async def bulk_create_remark_docs(
+        remark_doc_service: FromDishka[RemarkDocService],
+        data: list[RemarkDocIn],
+) -> list[RemarkDocOut]:
+    """ Create new remark docs by single DB insert, they are published as one event. """
+    return await remark_doc_service.bulk_create(data)
+
+
 @api_router.get("/{remark_doc_id}", response_model=RemarkDocOut)
 async def get_remark_doc(
         remark_doc_service: FromDishka[RemarkDocService],
@@ -52,20 +82,35 @@ async def get_remark_doc(
 @api_router.get("", response_model=list[RemarkDocOut])
 async def get_remark_docs_list(
         remark_doc_service: FromDishka[RemarkDocService],
+        request: Request,
         data: RemarkDocsSearchParams = Depends(),
-) -> list[RemarkDocOut]:
-    """Get all remark docs by provided fields."""
+) -> Response:
+    """
+    Get all remark docs by provided fields.
+
+    Streams all remark docs as NDJSON (ignoring pagination) if requested with "Accept: application/x-ndjson".
+    """
+
+    if accepts_ndjson(request):
+        return ndjson_response(
+            remark_doc_service.stream(**data.model_dump(exclude_none=True, exclude={"limit", "cursor"}))
+        )
 
-    return await remark_doc_service.list(
+    remark_docs = await remark_doc_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(remark_doc_service.dump_json(remark_docs), Cursor.after(remark_docs, data.limit))
 
 
 @broker_router.subscriber(
     remark_doc_commands.update,
     stream=streams.cmd,
     queue="remark-docs-update-workers",
-    config=ConsumerConfig(durable_name="remark-docs-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remark-docs-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(remark_doc_events.updated, stream=streams.events)
 async def update_remark_doc(
@@ -74,21 +119,50 @@ async def update_remark_doc(
 ) -> RemarkDocOut:
     """ Update specified remark docs. """
 
-    remark_doc = await remark_doc_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
+    async with update_locks(update_data.id):
+        remark_doc = await remark_doc_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        if not remark_doc:
+            raise Exception("Failed to update non-existent remark doc")
+
+        return remark_doc
+
+
+@broker_router.subscriber(
+    remark_doc_commands.bulk_update,
+    stream=streams.cmd,
+    queue="remark-docs-bulk-update-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remark-docs-bulk-update",
+        max_ack_pending=settings.nats_max_ack_pending,
     )
-    if not remark_doc:
-        raise Exception("Failed to update non-existent remark doc")
+)
+@broker_router.publisher(remark_doc_events.bulk_updated, stream=streams.events)
+async def bulk_update_remark_docs(
+        remark_doc_service: FromDishka[RemarkDocService],
+        update_data: list[RemarkDocUpdateCmd],
+) -> list[RemarkDocOut]:
+    """ Update specified remark docs in single DB transaction, they are published as one event. """
 
-    return remark_doc
+    async with update_locks(*(entity.id for entity in update_data)):
+        return await remark_doc_service.bulk_update([
+            (remark_doc.id, remark_doc.data.model_dump(exclude_none=True))
+            for remark_doc in update_data
+        ])
 
 
 @broker_router.subscriber(
     remark_doc_commands.delete,
     stream=streams.cmd,
     queue="remark-docs-delete-workers",
-    config=ConsumerConfig(durable_name="remark-docs-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remark-docs-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(remark_doc_events.deleted, stream=streams.events)
 async def delete_remark_doc(
@@ -2,15 +2,19 @@ from uuid import UUID
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from faststream.nats import NatsRouter
 from nats.js.api import ConsumerConfig
 
 from reviewer.src.adapters.broker import streams
 from reviewer.src.adapters.broker.cmd import RemarkCmd
 from reviewer.src.adapters.broker.events import RemarkEvents
+from reviewer.src.adapters.broker.ordering import KeyedLock
+from reviewer.src.config.settings import settings
 from reviewer.src.domain.base import EntityDeletedEvent
 from reviewer.src.domain.remark import RemarkIn, RemarkOut, RemarksSearchParams, RemarkUpdateCmd
+from reviewer.src.domain.pagination import Cursor, page_response
+from reviewer.src.entrypoints.streaming import accepts_ndjson, ndjson_response
 from reviewer.src.service.remark import RemarkService
 
 broker_router = NatsRouter()
@@ -19,12 +23,19 @@ api_router = APIRouter(tags=["Remarks"], route_class=DishkaRoute)
 remark_commands = RemarkCmd(service_name="reviewer", entity_name="Remark")
 remark_events = RemarkEvents(service_name="reviewer", entity_name="Remark")
 
+# updates of the same entity run one by one within this process, see KeyedLock for guarantees
+update_locks = KeyedLock()
+
 
 @broker_router.subscriber(
     remark_commands.create,
     stream=streams.cmd,
     queue="remarks-create-workers",
-    config=ConsumerConfig(durable_name="remarks-create")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remarks-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(remark_events.created, stream=streams.events)
 async def create_remark(
@@ -35,6 +46,25 @@ async def create_remark(
     return await remark_service.create(data)
 
 
+@broker_router.subscriber(
+    remark_commands.bulk_create,
+    stream=streams.cmd,
+    queue="remarks-bulk-create-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remarks-bulk-create",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
+)
+@broker_router.publisher(remark_events.bulk_created, stream=streams.events)
+async def bulk_create_remarks(
+        remark_service: FromDishka[RemarkService],
+        data: list[RemarkIn],
+) -> list[RemarkOut]:
+    """ Create new remarks by single DB insert, they are published as one event. """
+    return await remark_service.bulk_create(data)
+
+
 @api_router.get("/{remark_id}", response_model=RemarkOut)
 async def get_remark(
         remark_service: FromDishka[RemarkService],
@@ -52,20 +82,35 @@ async def get_remark(
 @api_router.get("", response_model=list[RemarkOut])
 async def get_remarks_list(
         remark_service: FromDishka[RemarkService],
+        request: Request,
         data: RemarksSearchParams = Depends(),
-) -> list[RemarkOut]:
-    """Get all remarks by provided fields."""
+) -> Response:
+    """
+    Get all remarks by provided fields.
+
+    Streams all remarks as NDJSON (ignoring pagination) if requested with "Accept: application/x-ndjson".
+    """
 
-    return await remark_service.list(
+    if accepts_ndjson(request):
+        return ndjson_response(
+            remark_service.stream(**data.model_dump(exclude_none=True, exclude={"limit", "cursor"}))
+        )
+
+    remarks = await remark_service.list(
         **data.model_dump(exclude_none=True)
     )
+    return page_response(remark_service.dump_json(remarks), Cursor.after(remarks, data.limit))
 
 
 @broker_router.subscriber(
     remark_commands.update,
     stream=streams.cmd,
     queue="remarks-update-workers",
-    config=ConsumerConfig(durable_name="remarks-update")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remarks-update",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(remark_events.updated, stream=streams.events)
 async def update_remark(
@@ -74,20 +119,49 @@ async def update_remark(
 ) -> RemarkOut:
     """ Update specified remarks. """
 
-    remark = await remark_service.update(
-        update_data.id,
-        **update_data.data.model_dump(exclude_none=True)
+    async with update_locks(update_data.id):
+        remark = await remark_service.update(
+            update_data.id,
+            **update_data.data.model_dump(exclude_none=True)
+        )
+        if not remark:
+            raise Exception("Failed to update non-existent remark")
+        return remark
+
+
+@broker_router.subscriber(
+    remark_commands.bulk_update,
+    stream=streams.cmd,
+    queue="remarks-bulk-update-workers",
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remarks-bulk-update",
+        max_ack_pending=settings.nats_max_ack_pending,
     )
-    if not remark:
-        raise Exception("Failed to update non-existent remark")
-    return remark
+)
+@broker_router.publisher(remark_events.bulk_updated, stream=streams.events)
+async def bulk_update_remarks(
+        remark_service: FromDishka[RemarkService],
+        update_data: list[RemarkUpdateCmd],
+) -> list[RemarkOut]:
+    """ Update specified remarks in single DB transaction, they are published as one event. """
+
+    async with update_locks(*(entity.id for entity in update_data)):
+        return await remark_service.bulk_update([
+            (remark.id, remark.data.model_dump(exclude_none=True))
+            for remark in update_data
+        ])
 
 
 @broker_router.subscriber(
     remark_commands.delete,
     stream=streams.cmd,
     queue="remarks-delete-workers",
-    config=ConsumerConfig(durable_name="remarks-delete")
+    max_workers=settings.nats_max_workers,
+    config=ConsumerConfig(
+        durable_name="remarks-delete",
+        max_ack_pending=settings.nats_max_ack_pending,
+    )
 )
 @broker_router.publisher(remark_events.deleted, stream=streams.events)
 async def delete_remark(
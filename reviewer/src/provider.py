@@ -6,7 +6,7 @@ from reviewer.src.adapters.repositories.remark_docs import RemarkDocsRepository
 from reviewer.src.adapters.repositories.remarks import RemarksRepository
 from reviewer.src.service.remark import RemarkService
 from reviewer.src.service.remark_doc import RemarkDocService
-from reviewer.src.service.uow import UnitOfWork
+from reviewer.src.service.uow import UnitOfWork, ReplicaUnitOfWork
 
 
 class DependencyProvider(Provider):
@@ -48,3 +48,13 @@ class DependencyProvider(Provider):
     ) -> RemarkDocService:
         """ Real dependency of RemarkDocService for production. """
         return RemarkDocService(repo)
+
+
+class ReadDependencyProvider(DependencyProvider):
+    """ Dependencies of read app, its queries are served by read replica. """
+
+    @provide(scope=Scope.REQUEST)
+    async def get_uow(self) -> AsyncIterable[UnitOfWork]:
+        """ Real dependency of read-only UnitOfWork bound to read replica for production. """
+        async with ReplicaUnitOfWork() as uow:
+            yield uow
@@ -1,14 +1,48 @@
 import abc
+import time
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 
+from reviewer.src.adapters.db_pool import MonitoredPool
+from reviewer.src.config.logging import logger
 from reviewer.src.config.settings import settings
 
 
-async_engine = create_async_engine(
-    settings.async_db_url,
-    future=True,
-)
+def create_engine(url: str, name: str, read_only: bool = False) -> AsyncEngine:
+    """
+    Engine with pool settings of the service.
+
+    Read-only engine doesn't open transactions explicitly (no BEGIN and COMMIT round trips),
+    each statement runs in its own implicit transaction which is READ ONLY by server default.
+    """
+
+    server_settings = {
+        "application_name": settings.db_application_name,
+        "statement_timeout": str(settings.db_statement_timeout),
+    }
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+
+    return create_async_engine(
+        url,
+        future=True,
+        isolation_level="AUTOCOMMIT" if read_only else None,
+        poolclass=MonitoredPool,
+        pool_logging_name=name,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=bool(settings.db_pool_pre_ping),
+        connect_args={
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": server_settings,
+        },
+    )
+
+
+async_engine = create_engine(settings.async_db_url, name="primary")
 
 ASYNC_SESSION_FACTORY = async_sessionmaker(
     bind=async_engine,
@@ -16,13 +50,63 @@ ASYNC_SESSION_FACTORY = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# connections are opened on demand, so this pool is empty in processes without read-only units of work
+read_only_async_engine = create_engine(settings.async_db_url, name="primary-read-only", read_only=True)
+
+READ_ONLY_SESSION_FACTORY = async_sessionmaker(
+    bind=read_only_async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+replica_async_engine = (
+    create_engine(settings.replica_async_db_url, name="replica", read_only=True)
+    if settings.replica_async_db_url else None
+)
+
+REPLICA_SESSION_FACTORY = async_sessionmaker(
+    bind=replica_async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+) if replica_async_engine else None
+
+
+class ReplicaState:
+    """
+    Availability of read replica shared by all units of work of the process.
+
+    Replica which failed to give a connection isn't used for retry_interval seconds.
+    """
+
+    def __init__(self, retry_interval: float):
+        self.retry_interval = retry_interval
+        self._unavailable_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._unavailable_until
+
+    def mark_unavailable(self) -> None:
+        self._unavailable_until = time.monotonic() + self.retry_interval
+
+
+replica_state = ReplicaState(retry_interval=settings.db_replica_retry_interval)
+
 
 class AbstractUnitOfWork(abc.ABC):
+    # read-only unit of work has nothing to commit or roll back, its connection is just released
+    read_only: bool = False
+
     @abc.abstractmethod
     async def __aenter__(self):
         raise NotImplementedError
 
     async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.read_only:
+            await self.close()
+            self.session = None
+            return
+
         # TODO: need to add logging to exception catching
         try:
             if exc_type is None:
@@ -32,6 +116,9 @@ class AbstractUnitOfWork(abc.ABC):
             await self.close()
             self.session = None
 
+    async def ensure_transaction(self):
+        """ Make following statements run in a single DB transaction. """
+
     @abc.abstractmethod
     async def commit(self):
         raise NotImplementedError
@@ -46,9 +133,12 @@ class AbstractUnitOfWork(abc.ABC):
 
 
 class UnitOfWork(AbstractUnitOfWork):
-    def __init__(self, session_factory=ASYNC_SESSION_FACTORY):
+    def __init__(self, session_factory=None, read_only: bool = False):
         # session_factory could be a mocked object that don't touch db
-        self.session_factory = session_factory
+        self.read_only = read_only
+        self.session_factory = session_factory or (
+            READ_ONLY_SESSION_FACTORY if read_only else ASYNC_SESSION_FACTORY
+        )
         self.session = None
 
     async def __aenter__(self):
@@ -56,6 +146,19 @@ class UnitOfWork(AbstractUnitOfWork):
             self.session = self.session_factory()
         return self
 
+    async def ensure_transaction(self):
+        """
+        Make following statements run in a single DB transaction.
+
+        Statements of read-only unit of work run in separate implicit transactions by default,
+        it's not enough for server side cursors which can't live outside of transaction.
+        """
+
+        if self.read_only:
+            # releases connection, there is nothing to roll back in read-only mode
+            await self.session.rollback()
+            await self.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
     async def commit(self):
         await self.session.commit()
 
@@ -64,3 +167,43 @@ class UnitOfWork(AbstractUnitOfWork):
 
     async def close(self):
         await self.session.close()
+
+
+class ReplicaUnitOfWork(UnitOfWork):
+    """
+    Read-only UnitOfWork of read app bound to read replica.
+
+    Falls back to primary DB if replica isn't configured or is unavailable.
+    """
+
+    def __init__(
+            self,
+            session_factory=READ_ONLY_SESSION_FACTORY,
+            replica_session_factory=REPLICA_SESSION_FACTORY,
+            state: ReplicaState = replica_state,
+    ):
+        super().__init__(session_factory, read_only=True)
+        self.replica_session_factory = replica_session_factory
+        self.state = state
+
+    async def __aenter__(self):
+        if not self.session and self.replica_session_factory and self.state.available:
+            self.session = await self._connect_replica()
+        return await super().__aenter__()
+
+    async def _connect_replica(self) -> AsyncSession | None:
+        session = self.replica_session_factory()
+        try:
+            # connection is checked out (and pinged) before any query
+            # so request can still be served by primary if replica is down
+            await session.connection()
+        except (OSError, SQLAlchemyError) as e:
+            await session.close()
+            self.state.mark_unavailable()
+            logger.warning(
+                "DB replica is unavailable, primary DB is used",
+                error=repr(e),
+                retry_interval=self.state.retry_interval,
+            )
+            return None
+        return session
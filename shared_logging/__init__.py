@@ -0,0 +1,9 @@
+"""
+Logging of the services: request context, structured records and writing them by a background thread.
+
+Every service configures it in its config/logging.py with its own settings.
+"""
+from shared_logging.context import ContextFilter, ContextLogger, request_id_var, user_ip_var
+from shared_logging.formatters import ColorizedFormatter, CustomJSONEncoder, JSONFormatter
+from shared_logging.handlers import BoundedQueueHandler, BoundedQueueListener, DropPolicy
+from shared_logging.handlers import create_handlers, setup_logging
@@ -0,0 +1,69 @@
+import logging
+import random
+from contextvars import ContextVar
+from typing import Optional, Any, Callable
+
+request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+user_ip_var: ContextVar[Optional[str]] = ContextVar('user_ip', default=None)
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        record.user_ip = user_ip_var.get()
+        return True
+
+
+class ContextLogger:
+    """
+    Logger adding request context and keyword fields to records.
+
+    Message and field values may be callables, they are called only if the record is logged,
+    so expensive payloads (dumps of entities, formatted URLs) aren't built for discarded records.
+    High-volume events are sampled by sample_rate, it's kept in the fields of logged records.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    @staticmethod
+    def _get_context(**kwargs) -> dict[str, Any]:
+        """Get current context and merge with provided kwargs."""
+        context = {
+            "request_id": request_id_var.get(),
+            "user_ip": user_ip_var.get(),
+        }
+        context.update(kwargs)
+        return {k: v for k, v in context.items() if v is not None}
+
+    def _log(
+            self,
+            level: int,
+            message: str | Callable[[], str],
+            sample_rate: float = 1.0,
+            exc_info: bool = False,
+            **kwargs
+    ):
+        if not self.logger.isEnabledFor(level):
+            return
+        if sample_rate < 1:
+            if random.random() >= sample_rate:
+                return
+            kwargs["sample_rate"] = sample_rate
+
+        if callable(message):
+            message = message()
+        context = self._get_context(**{k: v() if callable(v) else v for k, v in kwargs.items()})
+        self.logger.log(level, message, extra={"extra_fields": context}, stacklevel=3, exc_info=exc_info)
+
+    def info(self, message: str | Callable[[], str], **kwargs):
+        self._log(logging.INFO, message, **kwargs)
+
+    def error(self, message: str | Callable[[], str], **kwargs):
+        self._log(logging.ERROR, message, exc_info=True, **kwargs)
+
+    def warning(self, message: str | Callable[[], str], **kwargs):
+        self._log(logging.WARNING, message, **kwargs)
+
+    def debug(self, message: str | Callable[[], str], **kwargs):
+        self._log(logging.DEBUG, message, **kwargs)
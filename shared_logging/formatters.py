@@ -0,0 +1,108 @@
+import datetime
+import json
+import logging
+import socket
+import time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+import orjson
+
+COLORED_LEVELS = {
+    logging.DEBUG: "\033[36mDEBUG\033[0m",
+    logging.INFO: "\033[32mINFO\033[0m",
+    logging.WARNING: "\033[33mWARNING\033[0m",
+    logging.ERROR: "\033[31mERROR\033[0m",
+    logging.CRITICAL: "\033[91mCRITICAL\033[0m",
+}
+
+
+class CustomJSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, Enum):
+            return obj.value
+        if isinstance(obj, (datetime.datetime, datetime.date)):
+            return obj.isoformat()
+        if isinstance(obj, Decimal):
+            return float(obj)
+        try:
+            return str(obj)
+        except Exception:
+            return super().default(obj)
+
+
+class ColorizedFormatter(logging.Formatter):
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        def expand_log_field(field: str, symbols: int) -> str:
+            return field + (" " * (symbols - len(field)))
+
+        level_name = COLORED_LEVELS.get(record.levelno, record.levelname)
+        level_name = expand_log_field(level_name, symbols=17)
+
+        message = super().formatMessage(record)
+        return message.replace(record.levelname, level_name, 1)
+
+
+def _default(obj: Any) -> Any:
+    """ Types orjson doesn't serialize natively (UUID, datetime, enum are native). """
+
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    JSON lines formatter backed by orjson.
+
+    Static fields of the service are serialized once and prepended to every record,
+    timestamp is formatted once per second.
+    Records orjson can't serialize (e.g. integers over 64 bits) are serialized by json with CustomJSONEncoder.
+    """
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.static_fields = {"service": service, "host": socket.gethostname()}
+        # '{"service":...,"host":...,' - record fields are serialized without opening brace and appended
+        self._prefix = orjson.dumps(self.static_fields)[:-1] + b","
+        self._second = None
+        self._second_time = None
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        if second != self._second:
+            self._second_time = time.strftime(self.default_time_format, self.converter(record.created))
+            self._second = second
+        return self.default_msec_format % (self._second_time, record.msecs)
+
+    def format(self, record):
+        log_entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "request_id": getattr(record, 'request_id', None),
+            "user_ip": getattr(record, 'user_ip', None),
+        }
+
+        # Add extra fields if present
+        extra_fields = getattr(record, 'extra_fields', None)
+        if extra_fields:
+            if extra_fields.keys() & self.static_fields.keys():
+                return self._format_fallback({**self.static_fields, **log_entry, **extra_fields})
+            log_entry.update(extra_fields)
+
+        try:
+            return (self._prefix + orjson.dumps(log_entry, default=_default, option=orjson.OPT_NON_STR_KEYS)[1:]).decode()
+        except orjson.JSONEncodeError:
+            return self._format_fallback({**self.static_fields, **log_entry})
+
+    @staticmethod
+    def _format_fallback(log_entry: dict[str, Any]) -> str:
+        return json.dumps(log_entry, cls=CustomJSONEncoder, ensure_ascii=False)
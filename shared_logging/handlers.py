@@ -0,0 +1,182 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+import sys
+from enum import Enum
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Sequence, TextIO
+
+from shared_logging.context import ContextFilter
+from shared_logging.formatters import ColorizedFormatter, JSONFormatter
+
+_exception_formatter = logging.Formatter()
+
+
+class DropPolicy(str, Enum):
+    NEW = "new"
+    OLD = "old"
+    BLOCK = "block"
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Puts log records to a bounded queue of QueueListener, so handlers doing blocking I/O don't block event loop.
+
+    Records logged while the queue is full are handled by drop policy,
+    a warning with the number of dropped records is logged as soon as the queue has room.
+    """
+
+    def __init__(self, log_queue: queue.Queue, drop_policy: DropPolicy = DropPolicy.NEW):
+        super().__init__(log_queue)
+        self.drop_policy = DropPolicy(drop_policy)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merge message args and format traceback in the logging thread, the rest of formatting is done by listener.
+
+        Unlike default prepare, the record isn't formatted here, so every handler still applies its own formatter.
+        """
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # emit is called under the handler lock, so dropped counter isn't shared between threads
+        if self.drop_policy == DropPolicy.BLOCK:
+            self.queue.put(record)
+            return
+
+        if self.dropped and self._put(self._dropped_record()):
+            self.dropped = 0
+        if self._put(record):
+            return
+
+        if self.drop_policy == DropPolicy.OLD:
+            while not self._put(record):
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    continue
+                self.dropped += 1
+        else:
+            self.dropped += 1
+
+    def _put(self, record: logging.LogRecord) -> bool:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            return False
+        return True
+
+    def _dropped_record(self) -> logging.LogRecord:
+        return logging.makeLogRecord({
+            "name": __name__,
+            "levelno": logging.WARNING,
+            "levelname": logging.getLevelName(logging.WARNING),
+            "msg": f"{self.dropped} log records were dropped, log queue was full",
+            "request_id": None,
+            "user_ip": None,
+            "extra_fields": {"dropped": self.dropped},
+        })
+
+
+class BoundedQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # queue may be full on shutdown, the sentinel waits for room instead of failing
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        # listener is stopped at exit, it may be stopped before that
+        if self._thread is not None:
+            super().stop()
+
+
+def create_handlers(
+        service: str,
+        log_dir: str = "/var/log",
+        stream: TextIO = sys.stdout,
+) -> list[logging.Handler]:
+    """ Console, text file and JSON file handlers of service, they do blocking I/O and are run by QueueListener. """
+
+    # Create logs directory if it doesn't exist
+    os.makedirs(log_dir, exist_ok=True)
+
+    # Console handler (for development)
+    console_handler = logging.StreamHandler(stream)
+    console_handler.setLevel(logging.INFO)
+    console_formatter = ColorizedFormatter(
+        '%(asctime)s - %(request_id)s - %(levelname)s - %(message)s'
+    )
+    console_handler.setFormatter(console_formatter)
+
+    # File handler (for Loki via Promtail)
+    file_handler = RotatingFileHandler(
+        os.path.join(log_dir, f'{service}.log'),
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=5
+    )
+    file_handler.setLevel(logging.INFO)
+    file_formatter = ColorizedFormatter(
+        '%(asctime)s - %(request_id)s - %(levelname)s - %(message)s'
+    )
+    file_handler.setFormatter(file_formatter)
+
+    # JSON file handler (structured logging)
+    json_file_handler = RotatingFileHandler(
+        os.path.join(log_dir, f'{service}-json.log'),
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=5
+    )
+    json_file_handler.setLevel(logging.INFO)
+    json_formatter = JSONFormatter(service)
+    json_file_handler.setFormatter(json_formatter)
+
+    return [console_handler, file_handler, json_file_handler]
+
+
+def setup_logging(
+        service: str,
+        handlers: Sequence[logging.Handler] | None = None,
+        level: int | str = logging.INFO,
+        queue_size: int = 10_000,
+        drop_policy: str = DropPolicy.NEW,
+) -> QueueListener:
+    """
+    Route log records of root logger through bounded queue to handlers run by a background thread.
+
+    Returns started listener, it's stopped (and remaining records are written) at exit.
+    """
+
+    # Root logger configuration
+    logger = logging.getLogger()
+    logger.setLevel(level)
+
+    # Clear any existing handlers
+    logger.handlers.clear()
+
+    queue_handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size), drop_policy)
+    # context is taken in the logging thread, listener thread doesn't see its context vars
+    queue_handler.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+
+    listener = BoundedQueueListener(
+        queue_handler.queue,
+        *(handlers if handlers is not None else create_handlers(service)),
+        respect_handler_level=True,
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # Suppress noisy loggers
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+    return listener